@@ -0,0 +1,41 @@
+"""login search
+
+Revision ID: 04_b7e21c6f93d0
+Revises: 03_5c0f3e9d2a41
+Create Date: 2026-10-18 19:41:27.093185
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "04_b7e21c6f93d0"
+down_revision: Union[str, None] = "03_5c0f3e9d2a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_user_login_trgm",
+        "user",
+        ["login"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"login": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_user_login_lower_pattern",
+        "user",
+        [sa.text("lower(login) text_pattern_ops")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_login_lower_pattern", table_name="user")
+    op.drop_index("ix_user_login_trgm", table_name="user")
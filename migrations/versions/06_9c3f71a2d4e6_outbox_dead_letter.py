@@ -0,0 +1,38 @@
+"""outbox dead letter
+
+Revision ID: 06_9c3f71a2d4e6
+Revises: 05_e4a9d2c7b158
+Create Date: 2026-10-18 23:52:14.610382
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "06_9c3f71a2d4e6"
+down_revision: Union[str, None] = "05_e4a9d2c7b158"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "outbox", sa.Column("failed_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.drop_index("ix_outbox_available_at", table_name="outbox")
+    op.create_index(
+        "ix_outbox_available_at",
+        "outbox",
+        ["available_at"],
+        unique=False,
+        postgresql_where=sa.text("failed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_available_at", table_name="outbox")
+    op.create_index("ix_outbox_available_at", "outbox", ["available_at"], unique=False)
+    op.drop_column("outbox", "failed_at")
@@ -1,8 +1,18 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Final
+
 from nats.aio.client import Client as NatsClient
 from nats.js import JetStreamContext
+from nats.js.api import PubAck
 from src.api.common.broker.nats.message import NatsJetStreamMessage, NatsMessage
 from src.api.common.events.nats import NatsEvent, NatsJetStreamEvent
-from src.api.common.interfaces.broker import Broker
+from src.api.common.interfaces.broker import Broker, PublishFailures
+
+DEFAULT_PUBLISH_WINDOW: Final[int] = 256
+DEFAULT_ACK_TIMEOUT: Final[float] = 5.0
+
+type _Inflight = dict[asyncio.Future[PubAck], tuple[int, float]]
 
 
 class NatsBroker(Broker[NatsEvent, NatsMessage]):
@@ -17,6 +27,27 @@ class NatsBroker(Broker[NatsEvent, NatsMessage]):
             headers=message.headers,
         )
 
+    async def publish_many(self, messages: Sequence[NatsMessage]) -> PublishFailures:
+        failures: PublishFailures = {}
+        for index, message in enumerate(messages):
+            try:
+                await self.nats.publish(
+                    subject=message.subject,
+                    payload=message.payload,
+                    reply=message.reply,
+                    headers=message.headers,
+                )
+            except Exception as e:
+                failures[index] = e
+
+        try:
+            await self.nats.flush()
+        except Exception as e:
+            for index in range(len(messages)):
+                failures.setdefault(index, e)
+
+        return failures
+
     def _build_message(self, event: NatsEvent) -> NatsMessage:
         return NatsMessage(
             subject=event.subject,
@@ -33,8 +64,11 @@ class NatsBroker(Broker[NatsEvent, NatsMessage]):
 
 
 class NatsJetStreamBroker(Broker[NatsJetStreamEvent, NatsJetStreamMessage]):
-    def __init__(self, jetstream: JetStreamContext) -> None:
+    def __init__(
+        self, jetstream: JetStreamContext, window: int = DEFAULT_PUBLISH_WINDOW
+    ) -> None:
         self.js = jetstream
+        self.window = window
 
     async def publish(self, message: NatsJetStreamMessage) -> None:
         await self.js.publish(
@@ -45,6 +79,64 @@ class NatsJetStreamBroker(Broker[NatsJetStreamEvent, NatsJetStreamMessage]):
             headers=message.headers,
         )
 
+    async def publish_many(
+        self, messages: Sequence[NatsJetStreamMessage]
+    ) -> PublishFailures:
+        loop = asyncio.get_running_loop()
+        failures: PublishFailures = {}
+        inflight: _Inflight = {}
+        try:
+            for index, message in enumerate(messages):
+                if len(inflight) >= self.window:
+                    await self._collect(inflight, failures, wait_all=False)
+                try:
+                    future = await self.js.publish_async(
+                        subject=message.subject,
+                        payload=message.payload,
+                        stream=message.stream,
+                        headers=message.headers,
+                    )
+                except Exception as e:
+                    failures[index] = e
+                    continue
+
+                deadline = loop.time() + (message.timeout or DEFAULT_ACK_TIMEOUT)
+                inflight[future] = (index, deadline)
+
+            await self._collect(inflight, failures, wait_all=True)
+        finally:
+            for future in inflight:
+                future.cancel()
+
+        return failures
+
+    async def _collect(
+        self, inflight: _Inflight, failures: PublishFailures, wait_all: bool
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while inflight:
+            timeout = min(deadline for _, deadline in inflight.values()) - loop.time()
+            done, _ = await asyncio.wait(
+                inflight, timeout=max(0.0, timeout), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                index, _ = inflight.pop(future)
+                if future.cancelled():
+                    failures[index] = ConnectionError("JetStream publish was cancelled")
+                elif isinstance(error := future.exception(), Exception):
+                    failures[index] = error
+
+            now, expired = loop.time(), 0
+            for future, (index, deadline) in list(inflight.items()):
+                if deadline <= now:
+                    del inflight[future]
+                    future.cancel()
+                    failures[index] = TimeoutError("JetStream publish ack timeout")
+                    expired += 1
+
+            if not wait_all and (done or expired):
+                return
+
     def _build_message(self, event: NatsJetStreamEvent) -> NatsJetStreamMessage:
         return NatsJetStreamMessage(
             subject=event.subject,
@@ -59,5 +151,6 @@ class NatsJetStreamBroker(Broker[NatsJetStreamEvent, NatsJetStreamMessage]):
             ),
             stream=event._stream,
             timeout=event._timeout,
-            headers=event._headers or {},
+            # lets the stream drop a redelivered copy within its duplicate window
+            headers={"Nats-Msg-Id": str(event.event_id), **(event._headers or {})},
         )
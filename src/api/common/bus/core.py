@@ -1,21 +1,79 @@
-from typing import Self, cast, get_args
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any, Final, Self, cast, get_args
+
+import msgspec
 
 from src.api.common.events.base import Event
-from src.api.common.interfaces.broker import BrokerType
+from src.api.common.interfaces.broker import BrokerType, PublishFailures
 from src.common.tools.types import is_typevar
 
+_encoder: Final[msgspec.msgpack.Encoder] = msgspec.msgpack.Encoder()
+
 
 class EventBusImpl:
-    __slots__ = ("_brokers_registry", "_brokers")
+    __slots__ = ("_brokers_registry", "_brokers", "_brokers_by_name", "_resolved")
 
     def __init__(self) -> None:
         self._brokers_registry: dict[type[Event], BrokerType] = {}
         self._brokers: set[BrokerType] = set()
+        self._brokers_by_name: dict[str, BrokerType] = {}
+        self._resolved: dict[type[Event], BrokerType] = {}
 
     async def publish(self, event: Event) -> None:
         broker = self._resolve_broker(event)
         await broker.publish(broker._build_message(event))
 
+    async def publish_many(self, events: Iterable[Event]) -> PublishFailures:
+        batches: defaultdict[BrokerType, tuple[list[int], list[Any]]] = defaultdict(
+            lambda: ([], [])
+        )
+        for index, event in enumerate(events):
+            broker = self._resolve_broker(event)
+            indexes, messages = batches[broker]
+            indexes.append(index)
+            messages.append(broker._build_message(event))
+
+        failures: PublishFailures = {}
+        for broker, (indexes, messages) in batches.items():
+            for position, error in (await broker.publish_many(messages)).items():
+                failures[indexes[position]] = error
+
+        return failures
+
+    def encode(self, event: Event) -> tuple[str, bytes]:
+        broker = self._resolve_broker(event)
+        return type(broker).__name__, _encoder.encode(broker._build_message(event))
+
+    async def publish_encoded(
+        self, records: Iterable[tuple[str, bytes]]
+    ) -> PublishFailures:
+        failures: PublishFailures = {}
+        batches: defaultdict[BrokerType, tuple[list[int], list[Any]]] = defaultdict(
+            lambda: ([], [])
+        )
+        for index, (name, raw) in enumerate(records):
+            if (broker := self._brokers_by_name.get(name)) is None:
+                failures[index] = LookupError(f"Broker {name} not found")
+                continue
+            try:
+                message = msgspec.msgpack.decode(
+                    raw, type=self._resolve_message(broker)
+                )
+            except msgspec.DecodeError as e:
+                failures[index] = e
+                continue
+
+            indexes, messages = batches[broker]
+            indexes.append(index)
+            messages.append(message)
+
+        for broker, (indexes, messages) in batches.items():
+            for position, error in (await broker.publish_many(messages)).items():
+                failures[indexes[position]] = error
+
+        return failures
+
     def middleware(self) -> Self:
         return self
 
@@ -28,18 +86,24 @@ class EventBusImpl:
         return self
 
     def build(self) -> Self:
+        self._resolved.clear()
         for broker in self._brokers:
             self._brokers_registry[self._resolve_event(broker)] = broker
+            self._brokers_by_name[type(broker).__name__] = broker
 
         return self
 
     def _resolve_broker(self, event: Event) -> BrokerType:
-        event_subclasses = Event.__subclasses__()
-        for event_subclass in event_subclasses:
-            if issubclass(type(event), event_subclass):
-                return self._brokers_registry[event_subclass]
+        event_type = type(event)
+        if (broker := self._resolved.get(event_type)) is None:
+            for base in event_type.__mro__:
+                if (broker := self._brokers_registry.get(base)) is not None:
+                    self._resolved[event_type] = broker
+                    break
+            else:
+                raise ValueError(f"Broker for event {event} not found")
 
-        raise ValueError(f"Broker for event {event} not found")
+        return broker
 
     def _resolve_event(self, broker: BrokerType) -> type[Event]:
         event = get_args(broker.__orig_bases__[0])[0]  # type: ignore
@@ -47,3 +111,6 @@ class EventBusImpl:
             raise TypeError(f"Event type {event} is a TypeVar")
 
         return cast(type[Event], event)
+
+    def _resolve_message(self, broker: BrokerType) -> type[Any]:
+        return cast(type[Any], get_args(broker.__orig_bases__[0])[1])  # type: ignore
@@ -0,0 +1,153 @@
+import asyncio
+from collections.abc import Callable, Collection
+from contextlib import suppress
+from datetime import timedelta
+from typing import Final, Optional
+
+import msgspec
+import uuid_utils.compat as uuid
+
+from src.api.common.events.base import Event
+from src.api.common.interfaces.event_bus import EventBus
+from src.common.logger import log
+from src.database import DBGateway
+from src.database.repositories.outbox import DEFAULT_CLAIM_LEASE, DEFAULT_RETRY_DELAY
+
+DEFAULT_OUTBOX_BATCH_SIZE: Final[int] = 256
+DEFAULT_OUTBOX_INTERVAL: Final[float] = 1.0
+DEFAULT_OUTBOX_MAX_ATTEMPTS: Final[int] = 10
+# retrying these can never succeed, the record goes straight to dead letter
+PERMANENT_ERRORS: Final[tuple[type[Exception], ...]] = (
+    LookupError,
+    msgspec.DecodeError,
+)
+
+
+class OutboxRelay:
+    __slots__ = (
+        "batch_size",
+        "interval",
+        "retry_delay",
+        "max_attempts",
+        "lease",
+        "brokers",
+        "_database",
+        "_event_bus",
+        "_wakeup",
+        "_task",
+    )
+
+    def __init__(
+        self,
+        database: Callable[[], DBGateway],
+        event_bus: EventBus,
+        batch_size: int = DEFAULT_OUTBOX_BATCH_SIZE,
+        interval: float = DEFAULT_OUTBOX_INTERVAL,
+        retry_delay: timedelta = DEFAULT_RETRY_DELAY,
+        max_attempts: int = DEFAULT_OUTBOX_MAX_ATTEMPTS,
+        lease: timedelta = DEFAULT_CLAIM_LEASE,
+        brokers: Collection[str] = (),
+    ) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        # must outlast a publish, unacknowledged records reappear after it
+        self.lease = lease
+        # brokers confirming each message, a record is deleted only after that
+        self.brokers = frozenset(brokers)
+        self._database = database
+        self._event_bus = event_bus
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        if (task := self._task) is None:
+            return
+
+        self._task = None
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def encode(self, event: Event) -> tuple[str, bytes]:
+        broker, message = self._event_bus.encode(event)
+        if broker not in self.brokers:
+            raise TypeError(
+                f"Event {type(event).__name__} is routed to {broker}, "
+                "which does not acknowledge delivery"
+            )
+
+        return broker, message
+
+    async def drain_once(self) -> int:
+        # claim and settle in short transactions, nothing is held while publishing
+        database = self._database()
+        async with database:
+            records = await database.outbox.claim(self.batch_size, self.lease)
+        if not records:
+            return 0
+
+        pending = [
+            index
+            for index, record in enumerate(records)
+            if record.broker in self.brokers
+        ]
+        failures: dict[int, Exception] = {
+            index: LookupError(f"Broker {record.broker} does not acknowledge")
+            for index, record in enumerate(records)
+            if record.broker not in self.brokers
+        }
+        for position, error in (
+            await self._event_bus.publish_encoded(
+                (records[index].broker, records[index].message) for index in pending
+            )
+        ).items():
+            failures[pending[position]] = error
+
+        retries: dict[uuid.UUID, tuple[int, str]] = {}
+        dead: dict[uuid.UUID, str] = {}
+        for index, error in failures.items():
+            record = records[index]
+            if (
+                isinstance(error, PERMANENT_ERRORS)
+                or record.attempts + 1 >= self.max_attempts
+            ):
+                dead[record.uuid] = repr(error)
+            else:
+                retries[record.uuid] = (record.attempts, repr(error))
+
+        async with database:
+            await database.outbox.delete(
+                *(
+                    record.uuid
+                    for index, record in enumerate(records)
+                    if index not in failures
+                )
+            )
+            await database.outbox.retry(retries, self.retry_delay)
+            await database.outbox.fail(dead)
+
+        for record_uuid, reason in dead.items():
+            log.error("Outbox record %s moved to dead letter: %s", record_uuid, reason)
+
+        return len(records)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.drain_once() >= self.batch_size:
+                    continue
+            except Exception as e:
+                log.error("Error draining outbox: %s", e)
+
+            self._wakeup.clear()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
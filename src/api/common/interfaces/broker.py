@@ -1,8 +1,12 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any, Protocol, runtime_checkable
 
 from src.api.common.events.base import Event
 
+# failed message index -> error, empty when every message was delivered
+type PublishFailures = dict[int, Exception]
+
 
 @dataclass
 class BrokerMessage: ...
@@ -12,6 +16,8 @@ class BrokerMessage: ...
 class Broker[E: Event, M: BrokerMessage](Protocol):
     async def publish(self, message: M) -> None: ...
 
+    async def publish_many(self, messages: Sequence[M]) -> PublishFailures: ...
+
     def _build_message(self, event: E) -> M: ...
 
 
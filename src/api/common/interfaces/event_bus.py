@@ -1,8 +1,18 @@
+from collections.abc import Iterable
 from typing import Protocol, runtime_checkable
 
 from src.api.common.events.base import Event
+from src.api.common.interfaces.broker import PublishFailures
 
 
 @runtime_checkable
 class EventBus(Protocol):
     async def publish(self, event: Event) -> None: ...
+
+    async def publish_many(self, events: Iterable[Event]) -> PublishFailures: ...
+
+    def encode(self, event: Event) -> tuple[str, bytes]: ...
+
+    async def publish_encoded(
+        self, records: Iterable[tuple[str, bytes]]
+    ) -> PublishFailures: ...
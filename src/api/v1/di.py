@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from dishka import Provider, Scope
 from dishka.integrations.litestar import LitestarProvider
 from litestar.datastructures import State
@@ -6,24 +8,40 @@ from nats.aio.client import Client as NatsClient
 from src.api.common import tools
 from src.api.common.broker.nats.core import NatsBroker, NatsJetStreamBroker
 from src.api.common.bus.core import EventBusImpl
+from src.api.common.bus.outbox import OutboxRelay
 from src.api.common.interfaces.event_bus import EventBus
 from src.api.common.interfaces.mediator import Mediator
 from src.api.common.mediator import MediatorImpl
 from src.api.common.serializers.msgspec import msgspec_decoder, msgspec_encoder
+from src.api.v1 import dtos
+from src.api.v1.events.role import RolesChanged
 from src.api.v1.handlers import setup_handlers
 from src.common.di import container
+from src.common.tools.executor import BoundedExecutor
 from src.common.tools.singleton import singleton
-from src.database import DBGateway, create_database_factory
+from src.database import DBGateway, RoleCatalog, create_database_factory
 from src.database.connection import create_sa_engine, create_sa_session_factory
 from src.database.manager import TransactionManager
 from src.services import ServiceFactory
+from src.services.cache.ratelimit import RedisRateLimiter
 from src.services.cache.redis import RedisCache, get_redis
+from src.services.cache.tiered import TieredCache
 from src.services.external import ExternalServiceGateway
-from src.services.interfaces.hasher import AbstractHasher
+from src.services.interfaces.hasher import AbstractAsyncHasher
 from src.services.internal import InternalServiceGateway
 from src.services.provider.aiohttp import AiohttpProvider
 from src.services.provider.base import AsyncProvider
-from src.services.security.argon2 import get_argon2_hasher
+from src.services.provider.middleware.cache import (
+    MemoryResponseCache,
+    RedisResponseCache,
+    RequestCacheMiddleware,
+    ResponseCacheBackend,
+)
+from src.services.provider.middleware.ratelimit import (
+    RateLimit,
+    RequestRateLimitMiddleware,
+)
+from src.services.security.argon2 import AsyncArgon2, get_async_argon2_hasher
 from src.services.security.jwt import JWT
 from src.settings.core import Settings
 
@@ -40,19 +58,74 @@ def setup_dependencies(settings: Settings) -> State:
         json_deserializer=msgspec_decoder,
     )
 
+    user_cache = TieredCache[dtos.User](
+        redis,
+        namespace="user",
+        encoder=dtos.User.as_bytes,
+        decoder=dtos.User.from_bytes,
+    )
+
     session_factory = create_sa_session_factory(engine)
-    database_factory = create_database_factory(TransactionManager, session_factory)
+    role_catalog = RoleCatalog(session_factory)
+    database_factory = create_database_factory(
+        TransactionManager,
+        session_factory,
+        user_cache=user_cache,
+        catalog=role_catalog,
+    )
 
-    hasher = get_argon2_hasher()
+    hasher = get_async_argon2_hasher(
+        settings.hasher.profile,
+        max_workers=settings.hasher.max_workers,
+        max_pending=settings.hasher.max_pending,
+    )
     jwt = JWT(settings.ciphers)
 
-    aiohttp_provider = AiohttpProvider()
+    aiohttp_provider = AiohttpProvider(
+        limit=settings.http.limit,
+        limit_per_host=settings.http.limit_per_host,
+        keepalive_timeout=settings.http.keepalive_timeout,
+        ttl_dns_cache=settings.http.dns_cache_ttl,
+        close_grace=settings.http.close_grace,
+    )
+    if settings.http.cache != "none":
+        response_cache: ResponseCacheBackend = (
+            RedisResponseCache(redis)
+            if settings.http.cache == "redis"
+            else MemoryResponseCache(settings.http.cache_size)
+        )
+        aiohttp_provider.manager.register(
+            RequestCacheMiddleware(
+                response_cache,
+                stale_ttl=settings.http.cache_stale_ttl,
+                identity=aiohttp_provider.session_identity,
+            )
+        )
+    if settings.http.rate_limits:
+        aiohttp_provider.manager.register(
+            RequestRateLimitMiddleware(
+                RedisRateLimiter(redis),
+                limits={
+                    key: RateLimit(limit.rate, limit.capacity, limit.prefetch)
+                    for key, limit in settings.http.rate_limits.items()
+                    if key != "*"
+                },
+                default=(
+                    RateLimit(default.rate, default.capacity, default.prefetch)
+                    if (default := settings.http.rate_limits.get("*"))
+                    else None
+                ),
+                max_wait=settings.http.rate_limit_max_wait,
+                base_url=aiohttp_provider.url,
+            )
+        )
     service_factory = ServiceFactory(
         provider=aiohttp_provider,
         settings=settings,
         jwt=jwt,
         redis=redis,
     )
+    internal_gateway = service_factory.internal()
 
     nats_broker = NatsBroker(NatsClient())
     jetstream_broker = NatsJetStreamBroker(nats_broker.nats.jetstream())
@@ -64,6 +137,19 @@ def setup_dependencies(settings: Settings) -> State:
         .build()
     )
 
+    outbox_relay = OutboxRelay(
+        database_factory,
+        event_bus,
+        batch_size=settings.nats.outbox_batch_size,
+        interval=settings.nats.outbox_interval,
+        retry_delay=timedelta(seconds=settings.nats.outbox_retry_delay),
+        max_attempts=settings.nats.outbox_max_attempts,
+        lease=timedelta(seconds=settings.nats.outbox_lease),
+        brokers=(type(jetstream_broker).__name__,),
+    )
+
+    role_catalog.on_change(lambda: event_bus.publish(RolesChanged()))
+
     mediator = (
         MediatorImpl.builder()
         .dependencies(
@@ -72,9 +158,10 @@ def setup_dependencies(settings: Settings) -> State:
             jwt=jwt,
             settings=settings,
             event_bus=event_bus,
+            outbox=outbox_relay,
             database=database_factory,
             external_gateway=service_factory.external(),
-            internal_gateway=service_factory.internal(),
+            internal_gateway=internal_gateway,
         )
         .handlers(setup_handlers)
         .middleware()
@@ -85,12 +172,18 @@ def setup_dependencies(settings: Settings) -> State:
     provider.provide(singleton(nats_broker), provides=NatsBroker)
     provider.provide(singleton(jetstream_broker), provides=NatsJetStreamBroker)
     provider.provide(singleton(event_bus), provides=EventBus)
+    provider.provide(singleton(outbox_relay), provides=OutboxRelay)
     provider.provide(singleton(mediator), provides=Mediator)
     provider.provide(singleton(settings), provides=Settings)
     provider.provide(singleton(redis), provides=RedisCache)
+    provider.provide(singleton(user_cache), provides=TieredCache[dtos.User])
+    provider.provide(singleton(role_catalog), provides=RoleCatalog)
     provider.provide(singleton(aiohttp_provider), provides=AsyncProvider)
+    provider.provide(singleton(aiohttp_provider), provides=AiohttpProvider)
     provider.provide(singleton(jwt), provides=JWT)
-    provider.provide(singleton(hasher), provides=AbstractHasher)
+    provider.provide(singleton(hasher), provides=AbstractAsyncHasher)
+    provider.provide(singleton(hasher), provides=AsyncArgon2)
+    provider.provide(singleton(hasher.executor), provides=BoundedExecutor)
     provider.provide(database_factory, provides=DBGateway, scope=Scope.REQUEST)
     provider.provide(service_factory.internal, provides=InternalServiceGateway)
     provider.provide(service_factory.external, provides=ExternalServiceGateway)
@@ -99,12 +192,17 @@ def setup_dependencies(settings: Settings) -> State:
 
     return State(
         {
+            "outbox_relay": tools.ClosableProxy(outbox_relay, outbox_relay.stop),
             "container": tools.ClosableProxy(
                 container.get_container(), container.get_container().close
             ),
             "nats": tools.ClosableProxy(nats_broker.nats, nats_broker.nats.drain),
             "engine": tools.ClosableProxy(engine, engine.dispose),
             "redis": tools.ClosableProxy(redis, redis.close),
+            "hasher": tools.ClosableProxy(hasher, hasher.close),
+            "internal_gateway": tools.ClosableProxy(
+                internal_gateway, internal_gateway.close
+            ),
             "aiohttp_provider": tools.ClosableProxy(
                 aiohttp_provider, aiohttp_provider.close_session
             ),
@@ -1,11 +1,15 @@
 from .auth import Fingerprint, Login, Register, VerificationCode
 from .base import DTO
+from .executor import ExecutorStats
+from .provider import PoolStats
 from .role import Role
 from .status import Status
 from .user import UpdateUser, User
 
 __all__ = (
     "DTO",
+    "ExecutorStats",
+    "PoolStats",
     "User",
     "Register",
     "Fingerprint",
@@ -21,4 +25,11 @@ class OffsetResult[T](DTO):
     data: list[T]
     offset: int
     limit: int
-    total: int
+    total: int | None = None
+
+
+class CursorResult[T](DTO):
+    data: list[T]
+    limit: int
+    next_cursor: str | None = None
+    total: int | None = None
@@ -0,0 +1,12 @@
+from src.api.v1.dtos.base import DTO
+
+
+class ExecutorStats(DTO):
+    submitted: int
+    completed: int
+    rejected: int
+    in_flight: int
+    wait_avg: float
+    wait_max: float
+    exec_avg: float
+    exec_max: float
@@ -0,0 +1,9 @@
+from src.api.v1.dtos.base import DTO
+
+
+class PoolStats(DTO):
+    acquired: int
+    idle: int
+    waiting: int
+    limit: int
+    limit_per_host: int
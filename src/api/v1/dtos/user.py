@@ -12,6 +12,7 @@ class User(DTO):
     uuid: UUID
     login: str
     active: bool
+    role_uuid: UUID | None = None
 
     # relations
     role: Role | None = None
@@ -1,9 +1,13 @@
 from src.api.v1.integration.dishka import DishkaRouter
 
+from .executor import ExecutorController
+from .provider import ProviderController
 from .user import UserController
 
 
 def setup_admin_controllers() -> DishkaRouter:
     router = DishkaRouter("/admin", route_handlers=[])
     router.register(UserController)
+    router.register(ExecutorController)
+    router.register(ProviderController)
     return router
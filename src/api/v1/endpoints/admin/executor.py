@@ -0,0 +1,19 @@
+from litestar import Controller, get, status_codes
+
+from src.api.v1 import dtos
+from src.api.v1.permission import Permission
+from src.common.di import Depends
+from src.common.tools.executor import BoundedExecutor
+
+
+class ExecutorController(Controller):
+    path = "/executors"
+    tags = ["Admin | Executors"]
+    guards = [Permission("Admin")]
+    security = [{"BearerToken": []}]
+
+    @get("/hasher", status_code=status_codes.HTTP_200_OK)
+    async def hasher_executor_endpoint(
+        self, executor: Depends[BoundedExecutor]
+    ) -> dtos.ExecutorStats:
+        return dtos.ExecutorStats.from_attributes(executor.stats())
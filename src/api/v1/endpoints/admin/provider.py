@@ -0,0 +1,22 @@
+from litestar import Controller, get, status_codes
+
+from src.api.v1 import dtos
+from src.api.v1.permission import Permission
+from src.common.di import Depends
+from src.services.provider.aiohttp import AiohttpProvider
+
+
+class ProviderController(Controller):
+    path = "/providers"
+    tags = ["Admin | Providers"]
+    guards = [Permission("Admin")]
+    security = [{"BearerToken": []}]
+
+    @get("/pools", status_code=status_codes.HTTP_200_OK)
+    async def provider_pools_endpoint(
+        self, provider: Depends[AiohttpProvider]
+    ) -> dict[str, dtos.PoolStats]:
+        return {
+            label: dtos.PoolStats.from_attributes(stats)
+            for label, stats in provider.pool_stats().items()
+        }
@@ -10,7 +10,7 @@ from src.api.v1.constants import MAX_PAGINATION_LIMIT, MIN_PAGINATION_LIMIT
 from src.api.v1.permission import Permission
 from src.common.di import Depends
 from src.database.repositories.types.user import UserLoads
-from src.database.types import OrderBy
+from src.database.types import CountMode, LoginMatch, OrderBy
 
 
 class UserController(Controller):
@@ -72,6 +72,18 @@ class UserController(Controller):
             ),
         ],
         login: Annotated[str | None, Parameter(default=None, required=False)],
+        login_match: Annotated[
+            LoginMatch,
+            Parameter(
+                default="auto",
+                required=False,
+                description=(
+                    "`auto` and `contains` match a substring of the login, "
+                    "`prefix` matches its start case-insensitively and is "
+                    "cheaper for terms shorter than three characters"
+                ),
+            ),
+        ],
         role_uuid: Annotated[uuid.UUID | None, Parameter(default=None, required=False)],
         order_by: Annotated[OrderBy, Parameter(default="desc", required=False)],
         offset: Annotated[int, Parameter(default=0)],
@@ -84,15 +96,36 @@ class UserController(Controller):
                 required=False,
             ),
         ],
+        pagination: Annotated[
+            handlers.user.Pagination,
+            Parameter(
+                default="offset",
+                required=False,
+                description="`cursor` switches to keyset pagination",
+            ),
+        ],
+        cursor: Annotated[
+            str | None,
+            Parameter(
+                default=None,
+                required=False,
+                description="Opaque `next_cursor` from the previous page",
+            ),
+        ],
+        count: Annotated[CountMode, Parameter(default="exact", required=False)],
         mediator: Depends[Mediator],
-    ) -> dtos.OffsetResult[dtos.User]:
+    ) -> dtos.OffsetResult[dtos.User] | dtos.CursorResult[dtos.User]:
         return await mediator.send(
             handlers.user.SelectManyUserQuery(
                 loads=s,
                 login=login,
+                login_match=login_match,
                 role_uuid=role_uuid,
                 order_by=order_by,
                 offset=offset,
                 limit=limit,
+                pagination=pagination,
+                cursor=cursor,
+                count=count,
             )
         )
@@ -1,10 +1,10 @@
 import msgspec
 
-from src.api.common.events.nats import NatsEvent, rebuild_nats_event
+from src.api.common.events.nats import NatsJetStreamEvent, rebuild_jetstream_event
 
 
-@rebuild_nats_event(subject="email.send")
-class SendEmail[T](NatsEvent, kw_only=True):
+@rebuild_jetstream_event(subject="email.send", stream="EMAIL")
+class SendEmail[T](NatsJetStreamEvent, kw_only=True):
     from_: str = msgspec.field(name="from")
     to: str
     title: str
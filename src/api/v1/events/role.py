@@ -0,0 +1,9 @@
+from typing import Final
+
+from src.api.common.events.nats import NatsEvent
+
+ROLES_CHANGED_SUBJECT: Final[str] = "roles.changed"
+
+
+class RolesChanged(NatsEvent, kw_only=True):
+    subject: str = ROLES_CHANGED_SUBJECT
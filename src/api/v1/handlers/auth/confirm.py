@@ -8,7 +8,7 @@ from src.common.tools.cache import default_key_builder
 from src.database import DBGateway
 from src.services import InternalServiceGateway
 from src.services.cache.redis import RedisCache
-from src.services.interfaces.hasher import AbstractHasher
+from src.services.interfaces.hasher import AbstractAsyncHasher
 from src.services.internal.auth import TokensExpire
 
 
@@ -20,17 +20,19 @@ class ConfirmRegisterQuery(DTO):
 class ConfirmRegisterHandler(Handler[ConfirmRegisterQuery, TokensExpire]):
     internal_gateway: InternalServiceGateway
     database: DBGateway
-    hasher: AbstractHasher
+    hasher: AbstractAsyncHasher
     redis: RedisCache
 
     async def __call__(self, query: ConfirmRegisterQuery) -> TokensExpire:
         key = default_key_builder(code=query.code)
 
-        cached_data = await self.redis.get(key)
-        if not cached_data:
+        async with self.redis.pipeline() as tx:
+            cached = tx.get(key)
+            tx.delete(key)
+
+        if not (cached_data := cached.result()):
             raise NotFoundError("Code has expire or invalid")
 
-        await self.redis.delete(key)
         cache_user = dtos.Register.from_string(cached_data)
 
         async with self.database:
@@ -38,7 +40,7 @@ class ConfirmRegisterHandler(Handler[ConfirmRegisterQuery, TokensExpire]):
             user = (
                 await self.database.user.create(
                     login=cache_user.login,
-                    password=self.hasher.hash_password(cache_user.password),
+                    password=await self.hasher.hash_password(cache_user.password),
                     role_uuid=role.uuid,
                 )
             ).result()
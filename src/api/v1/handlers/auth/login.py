@@ -1,6 +1,8 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Annotated
+from typing import Annotated, Final
 
+import uuid_utils.compat as uuid
 from msgspec import Meta
 
 from src.api.common.interfaces.handler import Handler
@@ -13,13 +15,18 @@ from src.api.v1.dtos.base import DTO
 from src.api.v1.tools.validate import validate_email
 from src.common.exceptions import (
     ForbiddenError,
+    ServiceUnavailableError,
     UnAuthorizedError,
 )
+from src.common.logger import log
 from src.database import DBGateway
 from src.services import InternalServiceGateway
-from src.services.interfaces.hasher import AbstractHasher
+from src.services.interfaces.hasher import AbstractAsyncHasher
 from src.services.internal.auth import TokensExpire
 
+# rehashing takes as long as the login itself, it runs after the response
+_rehash_tasks: Final[set[asyncio.Task[None]]] = set()
+
 
 class LoginQuery(DTO):
     login: Annotated[
@@ -50,7 +57,7 @@ class LoginQuery(DTO):
 class LoginHandler(Handler[LoginQuery, TokensExpire]):
     internal_gateway: InternalServiceGateway
     database: DBGateway
-    hasher: AbstractHasher
+    hasher: AbstractAsyncHasher
 
     async def __call__(self, query: LoginQuery) -> TokensExpire:
         async with self.database.manager.session:
@@ -58,7 +65,25 @@ class LoginHandler(Handler[LoginQuery, TokensExpire]):
 
         if not user.active:
             raise ForbiddenError("You have been blocked")
-        if not self.hasher.verify_password(user.password, query.password):
+        if not await self.hasher.verify_password(user.password, query.password):
             raise UnAuthorizedError("Incorrect password or login")
+        if self.hasher.needs_rehash(user.password):
+            task = asyncio.get_running_loop().create_task(
+                self._rehash(user.uuid, query.password)
+            )
+            _rehash_tasks.add(task)
+            task.add_done_callback(_rehash_tasks.discard)
 
         return await self.internal_gateway.auth.login(query.fingerprint, user.uuid)
+
+    async def _rehash(self, user_uuid: uuid.UUID, password: str) -> None:
+        try:
+            hashed = await self.hasher.hash_password(password)
+        except ServiceUnavailableError:
+            return
+
+        try:
+            async with self.database:
+                await self.database.user.update(user_uuid, password=hashed)
+        except Exception as e:
+            log.error("Error rehashing password of user %s: %s", user_uuid, e)
@@ -5,7 +5,7 @@ from typing import Annotated
 
 from msgspec import Meta
 
-from src.api.common.interfaces.event_bus import EventBus
+from src.api.common.bus.outbox import OutboxRelay
 from src.api.common.interfaces.handler import Handler
 from src.api.v1 import dtos
 from src.api.v1.constants import (
@@ -54,7 +54,7 @@ class RegisterQuery(DTO):
 class RegisterHandler(Handler[RegisterQuery, dtos.Status]):
     internal_gateway: InternalServiceGateway
     database: DBGateway
-    event_bus: EventBus
+    outbox: OutboxRelay
     redis: RedisCache
 
     async def __call__(self, query: RegisterQuery) -> dtos.Status:
@@ -72,14 +72,20 @@ class RegisterHandler(Handler[RegisterQuery, dtos.Status]):
             expire=timedelta(minutes=10),
         )
 
-        await self.event_bus.publish(
-            SendEmail[dtos.VerificationCode](
-                from_="your-email@example.com",
-                to=query.login,
-                title="OcbUnknown Template",
-                template="verify_email",
-                props=dtos.VerificationCode(code=code),
+        # no business row to commit alongside, the outbox only keeps the email
+        # durable once the code is issued and retries it until JetStream acks
+        async with self.database:
+            await self.database.outbox.add(
+                self.outbox.encode(
+                    SendEmail[dtos.VerificationCode](
+                        from_="your-email@example.com",
+                        to=query.login,
+                        title="OcbUnknown Template",
+                        template="verify_email",
+                        props=dtos.VerificationCode(code=code),
+                    )
+                )
             )
-        )
+        self.outbox.notify()
 
         return dtos.Status(status=True)
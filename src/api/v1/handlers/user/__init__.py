@@ -1,15 +1,22 @@
 from .create import CreateUserHandler, CreateUserQuery
 from .select import SelectUserHandler, SelectUserQuery
-from .select_many import SelectManyUserHandler, SelectManyUserQuery
+from .select_many import (
+    Pagination,
+    SelectManyUserHandler,
+    SelectManyUserQuery,
+    UsersResult,
+)
 from .update import UpdateUserHandler, UpdateUserQuery
 
 __all__ = (
     "CreateUserHandler",
     "CreateUserQuery",
+    "Pagination",
     "SelectManyUserHandler",
     "SelectManyUserQuery",
     "SelectUserHandler",
     "SelectUserQuery",
     "UpdateUserHandler",
     "UpdateUserQuery",
+    "UsersResult",
 )
@@ -13,7 +13,7 @@ from src.api.v1.constants import (
 )
 from src.api.v1.tools.validate import validate_email
 from src.database import DBGateway
-from src.services.interfaces.hasher import AbstractHasher
+from src.services.interfaces.hasher import AbstractAsyncHasher
 
 
 class CreateUserQuery(dtos.DTO):
@@ -44,13 +44,13 @@ class CreateUserQuery(dtos.DTO):
 @dataclass(slots=True)
 class CreateUserHandler(Handler[CreateUserQuery, dtos.User]):
     database: DBGateway
-    hasher: AbstractHasher
+    hasher: AbstractAsyncHasher
 
     async def __call__(self, query: CreateUserQuery) -> dtos.User:
         async with self.database:
             user = await self.database.user.create(
                 login=query.login,
-                password=self.hasher.hash_password(query.password),
+                password=await self.hasher.hash_password(query.password),
                 role_uuid=query.role_uuid,
             )
 
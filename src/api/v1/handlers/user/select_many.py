@@ -1,36 +1,46 @@
 from dataclasses import dataclass
+from typing import Literal
 
 import uuid_utils.compat as uuid
 
 from src.api.common.interfaces.handler import Handler
 from src.api.v1 import dtos
 from src.api.v1.dtos.base import DTO
+from src.api.v1.tools.cursor import decode_cursor, encode_cursor
 from src.database import DBGateway
 from src.database.repositories.types.user import UserLoads
-from src.database.types import OrderBy
+from src.database.types import CountMode, LoginMatch, OrderBy
+
+type Pagination = Literal["offset", "cursor"]
+type UsersResult = dtos.OffsetResult[dtos.User] | dtos.CursorResult[dtos.User]
 
 
 class SelectManyUserQuery(DTO):
     loads: tuple[UserLoads, ...]
     login: str | None = None
+    login_match: LoginMatch = "auto"
     role_uuid: uuid.UUID | None = None
     order_by: OrderBy = "desc"
     offset: int = 0
     limit: int = 10
+    pagination: Pagination = "offset"
+    cursor: str | None = None
+    count: CountMode = "exact"
 
 
 @dataclass(slots=True)
-class SelectManyUserHandler(Handler[SelectManyUserQuery, dtos.OffsetResult[dtos.User]]):
+class SelectManyUserHandler(Handler[SelectManyUserQuery, UsersResult]):
     database: DBGateway
 
-    async def __call__(
-        self, query: SelectManyUserQuery
-    ) -> dtos.OffsetResult[dtos.User]:
+    async def __call__(self, query: SelectManyUserQuery) -> UsersResult:
+        if query.pagination == "cursor" or query.cursor is not None:
+            return await self._select_after(query)
+
         async with self.database.manager.session:
             total, users = (
                 await self.database.user.select_many(
                     *query.loads,
-                    **query.as_mapping(exclude={"loads"}),
+                    **query.as_mapping(exclude={"loads", "pagination", "cursor"}),
                 )
             ).result()
 
@@ -40,3 +50,29 @@ class SelectManyUserHandler(Handler[SelectManyUserQuery, dtos.OffsetResult[dtos.
                 limit=query.limit,
                 total=total,
             )
+
+    async def _select_after(
+        self, query: SelectManyUserQuery
+    ) -> dtos.CursorResult[dtos.User]:
+        after = decode_cursor(query.cursor) if query.cursor else None
+
+        async with self.database.manager.session:
+            page = (
+                await self.database.user.select_after(
+                    *query.loads,
+                    login=query.login,
+                    login_match=query.login_match,
+                    role_uuid=query.role_uuid,
+                    order_by=query.order_by,
+                    after=after,
+                    limit=query.limit,
+                    count=query.count,
+                )
+            ).result()
+
+            return dtos.CursorResult[dtos.User](
+                data=[dtos.User.from_mapping(user.as_dict()) for user in page.items],
+                limit=query.limit,
+                next_cursor=encode_cursor(page.next) if page.next else None,
+                total=page.total,
+            )
@@ -6,7 +6,7 @@ from src.api.common.interfaces.handler import Handler
 from src.api.v1 import dtos
 from src.api.v1.dtos.base import DTO
 from src.database import DBGateway
-from src.services.interfaces.hasher import AbstractHasher
+from src.services.interfaces.hasher import AbstractAsyncHasher
 
 
 class UpdateUserQuery(DTO):
@@ -17,12 +17,12 @@ class UpdateUserQuery(DTO):
 @dataclass(slots=True)
 class UpdateUserHandler(Handler[UpdateUserQuery, dtos.User]):
     database: DBGateway
-    hasher: AbstractHasher
+    hasher: AbstractAsyncHasher
 
     async def __call__(self, query: UpdateUserQuery) -> dtos.User:
         async with self.database:
             if query.password:
-                query.password = self.hasher.hash_password(query.password)
+                query.password = await self.hasher.hash_password(query.password)
 
             user = await self.database.user.update(
                 query.user_uuid,
@@ -19,6 +19,7 @@ from src.common.exceptions import (
     UnAuthorizedError,
 )
 from src.database import DBGateway
+from src.services.cache.tiered import TieredCache
 from src.services.internal import InternalServiceGateway
 
 
@@ -64,14 +65,22 @@ class AuthenticationMiddleware(AbstractAuthenticationMiddleware):
     async def _authenticate_user(
         self,
         user_uuid: uuid.UUID,
+        user_cache: Depends[TieredCache[dtos.User]] = FromDepends(),
         database: Depends[DBGateway] = FromDepends(),
     ) -> dtos.User:
-        async with database.manager.session:
-            user = (await database.user.select("role", user_uuid=user_uuid)).result()
+        user = await user_cache.get(user_uuid)
+        if user is None:
+            async with database.manager.session:
+                model = (
+                    await database.user.select("role", user_uuid=user_uuid)
+                ).result()
+
+            user = dtos.User.from_mapping(model.as_dict())
+            await user_cache.set(user_uuid, user)
 
         if not user.active:
             raise ForbiddenError("You have been blocked")
         if not user.role:
             raise ServiceNotImplementedError("Role not found")
 
-        return dtos.User.from_mapping(user.as_dict())
+        return user
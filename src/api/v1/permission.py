@@ -3,7 +3,9 @@ from litestar.datastructures.state import State
 from litestar.handlers.base import BaseRouteHandler
 
 from src.api.v1 import dtos
+from src.common.di import Depends, FromDepends, inject
 from src.common.exceptions import UnAuthorizedError
+from src.database import RoleCatalog
 from src.database.models.types import Roles
 
 
@@ -18,12 +20,24 @@ class Permission:
         connection: ASGIConnection[BaseRouteHandler, dtos.User, None, State],
         _: BaseRouteHandler,
     ) -> None:
-        valid_roles = self._ensure_valid_roles(connection.user)
+        valid_roles = await self._ensure_valid_roles(connection.user)
         if not valid_roles:
             raise UnAuthorizedError("Not allowed")
 
         return
 
-    def _ensure_valid_roles(self, user: dtos.User) -> bool:
+    @inject
+    async def _ensure_valid_roles(
+        self,
+        user: dtos.User,
+        catalog: Depends[RoleCatalog] = FromDepends(),
+    ) -> bool:
+        role = catalog.get(user.role_uuid) if user.role_uuid else None
+        if role is not None:
+            return self._matches(role.name)
+
         assert user.role is not None
-        return any(role in user.role.name for role in self.roles)
+        return self._matches(user.role.name)
+
+    def _matches(self, name: str) -> bool:
+        return any(role in name for role in self.roles)
@@ -5,6 +5,7 @@ from src.api.v1.di import setup_dependencies
 from src.api.v1.endpoints import setup_controllers
 from src.api.v1.integration.dishka import DishkaRouter
 from src.api.v1.middlewares import setup_middlewares
+from src.api.v1.subscribers import setup_subscribers
 from src.settings.core import Settings
 
 
@@ -17,4 +18,4 @@ def init_v1_router(
     setup_middlewares(router)
     state = setup_dependencies(settings)
 
-    return tools.RouterState(router=router, state=state)
+    return tools.RouterState(router=router, state=state, on_startup=setup_subscribers())
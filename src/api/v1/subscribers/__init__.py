@@ -0,0 +1,14 @@
+from litestar.types import LifespanHook
+
+from .hasher import calibrate_hasher
+from .outbox import start_outbox_relay
+from .role import load_role_catalog, subscribe_role_changes
+
+
+def setup_subscribers() -> list[LifespanHook]:
+    return [
+        calibrate_hasher,
+        load_role_catalog,
+        subscribe_role_changes,
+        start_outbox_relay,
+    ]
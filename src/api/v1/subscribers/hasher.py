@@ -0,0 +1,24 @@
+from src.common.di import Depends, FromDepends, inject
+from src.common.tools.executor import DEFAULT_MAX_WORKERS
+from src.services.cache.redis import RedisCache
+from src.services.security.argon2 import AsyncArgon2, shared_calibrate_argon2
+from src.settings.core import Settings
+
+
+@inject
+async def calibrate_hasher(
+    hasher: Depends[AsyncArgon2] = FromDepends(),
+    redis: Depends[RedisCache] = FromDepends(),
+    settings: Depends[Settings] = FromDepends(),
+) -> None:
+    if not settings.hasher.calibrate:
+        return
+
+    hasher.configure(
+        await shared_calibrate_argon2(
+            redis,
+            settings.hasher.target_ms,
+            settings.hasher.memory_budget_mib * 1024,
+            concurrency=settings.hasher.max_workers or DEFAULT_MAX_WORKERS,
+        )
+    )
@@ -0,0 +1,7 @@
+from src.api.common.bus.outbox import OutboxRelay
+from src.common.di import Depends, FromDepends, inject
+
+
+@inject
+async def start_outbox_relay(relay: Depends[OutboxRelay] = FromDepends()) -> None:
+    relay.start()
@@ -0,0 +1,25 @@
+from nats.aio.msg import Msg
+from src.api.common.broker.nats.core import NatsBroker
+from src.api.v1.events.role import ROLES_CHANGED_SUBJECT
+from src.common.di import Depends, FromDepends, inject
+from src.common.logger import log
+from src.database import RoleCatalog
+
+
+@inject
+async def load_role_catalog(catalog: Depends[RoleCatalog] = FromDepends()) -> None:
+    await catalog.refresh()
+
+
+@inject
+async def subscribe_role_changes(
+    broker: Depends[NatsBroker] = FromDepends(),
+    catalog: Depends[RoleCatalog] = FromDepends(),
+) -> None:
+    async def _refresh(_: Msg) -> None:
+        try:
+            await catalog.refresh()
+        except Exception as e:
+            log.error("Error refreshing role catalog: %s", e)
+
+    await broker.nats.subscribe(ROLES_CHANGED_SUBJECT, cb=_refresh)
@@ -0,0 +1,26 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+import msgspec
+
+from src.api.common.serializers.msgspec import msgpack_decoder, msgpack_encoder
+from src.common.exceptions import BadRequestError
+from src.database.types import Keyset
+
+
+def encode_cursor(keyset: Keyset) -> str:
+    created_at, key = keyset
+    raw = msgpack_encoder((created_at, key))
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, key = msgpack_decoder(raw, type=tuple[datetime, uuid.UUID])
+    except (binascii.Error, ValueError, msgspec.DecodeError) as e:
+        raise BadRequestError("Invalid cursor") from e
+
+    return created_at, key
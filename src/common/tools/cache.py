@@ -1,4 +1,6 @@
-from typing import Any
+import time
+from collections import OrderedDict
+from typing import Any, Callable
 
 
 def default_key_builder(
@@ -13,3 +15,65 @@ def default_key_builder(
 
     parts.extend(f"{k}{separator}{v}" for k, v in kwargs.items())
     return separator.join(parts)
+
+
+class LRUCache[K, V]:
+    __slots__ = ("_data", "_maxsize", "_ttl", "_timer", "hits", "misses")
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+
+        self._data: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._timer():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self._ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (None if ttl is None else self._timer() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[0] is None or entry[0] > self._timer())
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Final, Optional
+
+from src.common.exceptions import ServiceUnavailableError
+
+DEFAULT_MAX_WORKERS: Final[int] = min(4, os.cpu_count() or 1)
+DEFAULT_QUEUE_FACTOR: Final[int] = 16
+DEFAULT_RETRY_AFTER: Final[int] = 1
+
+
+@dataclass(slots=True)
+class ExecutorStats:
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    exec_total: float = 0.0
+    exec_max: float = 0.0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.completed if self.completed else 0.0
+
+    @property
+    def exec_avg(self) -> float:
+        return self.exec_total / self.completed if self.completed else 0.0
+
+
+class BoundedExecutor:
+    __slots__ = ("_executor", "_max_pending", "_pending", "_stats", "_lock")
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: Optional[int] = None,
+        thread_name_prefix: str = "",
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._max_pending = max_pending or max_workers * DEFAULT_QUEUE_FACTOR
+        self._pending = 0
+        self._stats = ExecutorStats()
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                submitted=self._stats.submitted,
+                completed=self._stats.completed,
+                rejected=self._stats.rejected,
+                in_flight=self._pending,
+                wait_total=self._stats.wait_total,
+                wait_max=self._stats.wait_max,
+                exec_total=self._stats.exec_total,
+                exec_max=self._stats.exec_max,
+            )
+
+    async def run[**P, T](
+        self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        if self._pending >= self._max_pending:
+            with self._lock:
+                self._stats.rejected += 1
+            raise ServiceUnavailableError(
+                "Server is busy, try again later",
+                headers={"Retry-After": str(DEFAULT_RETRY_AFTER)},
+            )
+
+        self._pending += 1
+        with self._lock:
+            self._stats.submitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                self._timed,
+                time.perf_counter(),
+                functools.partial(fn, *args, **kwargs),
+            )
+        finally:
+            self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _timed[T](self, submitted: float, fn: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            finished = time.perf_counter()
+            self._record(started - submitted, finished - started)
+
+    def _record(self, wait: float, execution: float) -> None:
+        with self._lock:
+            stats = self._stats
+            stats.completed += 1
+            stats.wait_total += wait
+            stats.exec_total += execution
+            stats.wait_max = max(stats.wait_max, wait)
+            stats.exec_max = max(stats.exec_max, execution)
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Optional
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_timer", "_lock")
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be a positive number")
+
+        self.rate = rate
+        self.capacity = max(1.0, rate if capacity is None else capacity)
+        self._tokens = self.capacity
+        self._timer = timer
+        self._updated = timer()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        self._refill()
+        if self._tokens < tokens:
+            return False
+
+        self._tokens -= tokens
+        return True
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+
+        # the lock keeps waiters in FIFO order
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = self._timer()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
@@ -1,28 +1,80 @@
-from typing import Any, Callable
+from typing import Any, Callable, Final, Optional
 
+import uuid_utils.compat as uuid
+
+from src.common.tools.cache import LRUCache
 from src.database import models
+from src.database.catalog import RoleCatalog
 from src.database.connection import SessionFactoryType
+from src.database.interfaces.cache import CacheInvalidator
 from src.database.interfaces.gateway import BaseGateway
+from src.database.loader import DataLoader
 from src.database.manager import TransactionManager
+from src.database.repositories.outbox import OutboxRepository
 from src.database.repositories.role import RoleRepository
 from src.database.repositories.user import UserRepository
+from src.database.types import Row
+
+DEFAULT_SHARED_ROLES_SIZE: Final[int] = 256
+DEFAULT_SHARED_ROLES_TTL: Final[float] = 60.0
+
+type RoleCache = LRUCache[uuid.UUID, Row]
 
 
 class DBGateway(BaseGateway):
-    __slots__ = ("manager", "_cache")
+    __slots__ = (
+        "manager",
+        "_cache",
+        "_user_cache",
+        "_role_cache",
+        "_role_loader",
+        "_catalog",
+    )
 
-    def __init__(self, manager: TransactionManager) -> None:
+    def __init__(
+        self,
+        manager: TransactionManager,
+        user_cache: Optional[CacheInvalidator] = None,
+        role_cache: Optional[RoleCache] = None,
+        catalog: Optional[RoleCatalog] = None,
+    ) -> None:
         super().__init__(manager)
         self.manager = manager
         self._cache: dict[str, Any] = {}
+        self._user_cache = user_cache
+        self._role_cache = role_cache
+        self._catalog = catalog
+        self._role_loader: Optional[DataLoader[uuid.UUID, Row]] = None
 
     @property
     def user(self) -> UserRepository:
-        return self._from_cache("user", UserRepository, model=models.User)
+        return self._from_cache(
+            "user",
+            UserRepository,
+            model=models.User,
+            cache=self._user_cache,
+            roles=self.role_loader,
+            catalog=self._catalog,
+        )
+
+    @property
+    def role_loader(self) -> DataLoader[uuid.UUID, Row]:
+        if self._role_loader is None:
+            self._role_loader = DataLoader(
+                self.role.select_rows_by_uuids, shared=self._role_cache
+            )
+
+        return self._role_loader
 
     @property
     def role(self) -> RoleRepository:
-        return self._from_cache("role", RoleRepository, model=models.Role)
+        return self._from_cache(
+            "role", RoleRepository, model=models.Role, catalog=self._catalog
+        )
+
+    @property
+    def outbox(self) -> OutboxRepository:
+        return self._from_cache("outbox", OutboxRepository, model=models.Outbox)
 
     def _from_cache[S](self, key: str, factory: Callable[..., S], **kwargs: Any) -> S:
         if not (cached := self._cache.get(key)):
@@ -33,12 +85,24 @@ class DBGateway(BaseGateway):
 
 
 def create_database_factory(
-    manager: type[TransactionManager], session_factory: SessionFactoryType
+    manager: type[TransactionManager],
+    session_factory: SessionFactoryType,
+    user_cache: Optional[CacheInvalidator] = None,
+    role_cache: Optional[RoleCache] = None,
+    catalog: Optional[RoleCatalog] = None,
 ) -> Callable[[], DBGateway]:
+    if role_cache is None:
+        role_cache = LRUCache(DEFAULT_SHARED_ROLES_SIZE, ttl=DEFAULT_SHARED_ROLES_TTL)
+
     def _create() -> DBGateway:
-        return DBGateway(manager(session_factory()))
+        return DBGateway(
+            manager(session_factory()),
+            user_cache=user_cache,
+            role_cache=role_cache,
+            catalog=catalog,
+        )
 
     return _create
 
 
-__all__ = ("DBGateway", "create_database_factory")
+__all__ = ("DBGateway", "RoleCatalog", "create_database_factory")
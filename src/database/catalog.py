@@ -0,0 +1,74 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from typing import Optional
+
+import uuid_utils.compat as uuid
+from sqlalchemy import select
+
+import src.database.models as models
+from src.common.logger import log
+from src.database._utils import frozendict
+from src.database.connection import SessionFactoryType
+
+type ChangeCallback = Callable[[], Awaitable[None]]
+
+
+class RoleCatalog:
+    __slots__ = (
+        "_session_factory",
+        "_by_uuid",
+        "_by_name",
+        "_lock",
+        "_on_change",
+        "_tasks",
+    )
+
+    def __init__(self, session_factory: SessionFactoryType) -> None:
+        self._session_factory = session_factory
+        self._by_uuid: frozendict[uuid.UUID, models.Role] = frozendict()
+        self._by_name: frozendict[str, models.Role] = frozendict()
+        self._lock = asyncio.Lock()
+        self._on_change: Optional[ChangeCallback] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._by_uuid)
+
+    def get(self, role_uuid: uuid.UUID) -> Optional[models.Role]:
+        return self._by_uuid.get(role_uuid)
+
+    def by_name(self, name: str) -> Optional[models.Role]:
+        return self._by_name.get(name)
+
+    def __iter__(self) -> Iterator[models.Role]:
+        return iter(self._by_uuid.values())
+
+    def __len__(self) -> int:
+        return len(self._by_uuid)
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            async with self._session_factory() as session:
+                roles: Sequence[models.Role] = (
+                    await session.scalars(select(models.Role))
+                ).all()
+
+            self._by_uuid = frozendict({role.uuid: role for role in roles})
+            self._by_name = frozendict({role.name: role for role in roles})
+
+    def on_change(self, callback: ChangeCallback) -> None:
+        self._on_change = callback
+
+    def changed(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._changed())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _changed(self) -> None:
+        try:
+            await self.refresh()
+            if self._on_change is not None:
+                await self._on_change()
+        except Exception as e:
+            log.error("Error propagating role catalog change: %s", e)
@@ -0,0 +1,7 @@
+from collections.abc import Hashable
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class CacheInvalidator(Protocol):
+    async def invalidate(self, *keys: Hashable) -> None: ...
@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from typing import Final, Optional
+
+from src.common.tools.cache import LRUCache
+
+DEFAULT_MAX_BATCH_SIZE: Final[int] = 500
+
+type BatchLoadFn[K, V] = Callable[[Sequence[K]], Awaitable[Mapping[K, V]]]
+
+
+class DataLoader[K: Hashable, V]:
+    __slots__ = (
+        "_load_fn",
+        "_shared",
+        "_max_batch_size",
+        "_futures",
+        "_queue",
+        "_task",
+    )
+
+    def __init__(
+        self,
+        load_fn: BatchLoadFn[K, V],
+        shared: Optional[LRUCache[K, V]] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        self._load_fn = load_fn
+        self._shared = shared
+        self._max_batch_size = max_batch_size
+        self._futures: dict[K, asyncio.Future[Optional[V]]] = {}
+        self._queue: list[K] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def load(self, key: K) -> Optional[V]:
+        return await self._future(key)
+
+    async def load_many(self, *keys: K) -> list[Optional[V]]:
+        if not keys:
+            return []
+
+        return list(await asyncio.gather(*(self._future(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        future = self._futures.get(key)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+        future.set_result(value)
+
+    def clear(self, *keys: K) -> None:
+        for key in keys:
+            self._futures.pop(key, None)
+            if self._shared is not None:
+                self._shared.pop(key)
+
+    def _future(self, key: K) -> asyncio.Future[Optional[V]]:
+        if (future := self._futures.get(key)) is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+
+        if self._shared is not None and (value := self._shared.get(key)) is not None:
+            future.set_result(value)
+            return future
+
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append(key)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        previous = self._task
+        self._task = asyncio.get_running_loop().create_task(self._run(keys, previous))
+
+    async def _run(self, keys: list[K], previous: Optional[asyncio.Task[None]]) -> None:
+        if previous is not None and not previous.done():
+            await asyncio.wait((previous,))
+
+        try:
+            for start in range(0, len(keys), self._max_batch_size):
+                await self._load_batch(keys[start : start + self._max_batch_size])
+        except asyncio.CancelledError:
+            self._abort(keys, None)
+            raise
+
+    async def _load_batch(self, keys: list[K]) -> None:
+        try:
+            values = await self._load_fn(keys)
+        except Exception as e:
+            self._abort(keys, e)
+            return
+
+        for key in keys:
+            value = values.get(key)
+            if value is not None and self._shared is not None:
+                self._shared.set(key, value)
+
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(value)
+
+    def _abort(self, keys: list[K], error: Optional[Exception]) -> None:
+        for key in keys:
+            future = self._futures.pop(key, None)
+            if future is None or future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
@@ -3,10 +3,11 @@ from sqlalchemy.orm import RelationshipProperty
 from src.database._utils import frozendict
 
 from .base import Base
+from .outbox import Outbox
 from .role import Role
 from .user import User
 
-__all__ = ("Base", "User", "Role")
+__all__ = ("Base", "User", "Role", "Outbox")
 
 
 def _retrieve_relationships() -> dict[
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+
+from src.database.models import Base
+from src.database.models.base import mixins
+
+
+class Outbox(mixins.UUIDMixin, Base):
+    __table_args__ = (
+        sa.Index(
+            "ix_outbox_available_at",
+            "available_at",
+            postgresql_where=sa.text("failed_at IS NULL"),
+        ),
+    )
+
+    broker: orm.Mapped[str] = orm.mapped_column(sa.String(64), nullable=False)
+    message: orm.Mapped[bytes] = orm.mapped_column(sa.LargeBinary, nullable=False)
+    attempts: orm.Mapped[int] = orm.mapped_column(
+        sa.Integer, nullable=False, default=0, server_default="0"
+    )
+    last_error: orm.Mapped[Optional[str]] = orm.mapped_column(sa.Text, nullable=True)
+    created_at: orm.Mapped[datetime] = orm.mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+    )
+    available_at: orm.Mapped[datetime] = orm.mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+    )
+    # dead-lettered records are kept for inspection and never claimed again
+    failed_at: orm.Mapped[Optional[datetime]] = orm.mapped_column(
+        sa.DateTime(timezone=True), nullable=True
+    )
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 
 
 class Role(mixins.UUIDMixin, mixins.TimeMixin, Base):
+    __table_args__ = (sa.Index("ix_role_created_at_uuid", "created_at", "uuid"),)
+
     name: orm.Mapped[types.RoleTypeEnum] = orm.mapped_column(
         sa.Enum(
             types.RoleTypeEnum,
@@ -14,6 +14,19 @@ if TYPE_CHECKING:
 
 
 class User(mixins.UUIDMixin, mixins.TimeMixin, Base):
+    __table_args__ = (
+        sa.Index("ix_user_created_at_uuid", "created_at", "uuid"),
+        sa.Index(
+            "ix_user_login_trgm",
+            "login",
+            postgresql_using="gin",
+            postgresql_ops={"login": "gin_trgm_ops"},
+        ),
+        sa.Index(
+            "ix_user_login_lower_pattern", sa.text("lower(login) text_pattern_ops")
+        ),
+    )
+
     login: orm.Mapped[str] = orm.mapped_column(
         sa.String, index=True, unique=True, nullable=False
     )
@@ -1,7 +1,17 @@
+from collections.abc import Mapping
+from typing import Any, Optional, cast
+
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models.base import Base
 from src.database.repositories.crud import CRUDRepository
+from src.database.tools import (
+    DEFAULT_COUNT_CAP,
+    ESTIMATED_COUNT_STATEMENT,
+    capped_count,
+)
+from src.database.types import CountMode
 
 
 class BaseRepository[M: Base]:
@@ -11,3 +21,29 @@ class BaseRepository[M: Base]:
         self._session = session
         self.model = model
         self._crud = CRUDRepository(session, model)
+
+    async def _total(
+        self,
+        count: Select[tuple[int]],
+        params: Mapping[str, Any],
+        mode: CountMode,
+        filtered: bool,
+    ) -> Optional[int]:
+        if mode == "none":
+            return None
+        if mode == "estimated":
+            if filtered:
+                return cast(
+                    int,
+                    await self._session.scalar(
+                        capped_count(count), {**params, "count_cap": DEFAULT_COUNT_CAP}
+                    ),
+                )
+
+            estimate = await self._session.scalar(
+                ESTIMATED_COUNT_STATEMENT, {"table": self.model.__tablename__}
+            )
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+
+        return cast(int, await self._session.scalar(count, params))
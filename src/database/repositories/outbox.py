@@ -0,0 +1,145 @@
+from collections.abc import Mapping, Sequence
+from datetime import timedelta
+from typing import Final
+
+import uuid_utils.compat as uuid
+from sqlalchemy import (
+    Delete,
+    Insert,
+    Interval,
+    Update,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.dml import ReturningUpdate
+
+import src.database.models as models
+from src.database.repositories.base import BaseRepository
+from src.database.tools import cached_statement
+
+DEFAULT_RETRY_DELAY: Final[timedelta] = timedelta(seconds=1)
+MAX_RETRY_DELAY: Final[timedelta] = timedelta(minutes=5)
+DEFAULT_CLAIM_LEASE: Final[timedelta] = timedelta(seconds=30)
+
+
+@cached_statement
+def _insert(model: type[models.Outbox]) -> Insert:
+    return insert(model.__table__)  # type: ignore[arg-type]
+
+
+@cached_statement
+def _claim(model: type[models.Outbox]) -> ReturningUpdate[tuple[models.Outbox]]:
+    # the lease hides claimed records from other relays without holding locks
+    claimable = (
+        select(model.uuid)
+        .where(model.failed_at.is_(None), model.available_at <= func.now())
+        .order_by(model.available_at)
+        .limit(bindparam("limit"))
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(model)
+        .where(model.uuid.in_(claimable.scalar_subquery()))
+        .values(available_at=func.now() + bindparam("lease", type_=Interval))
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@cached_statement
+def _delete(model: type[models.Outbox]) -> Delete:
+    return delete(model).where(
+        model.uuid == any_(bindparam("uuids", type_=ARRAY(model.uuid.type)))
+    )
+
+
+@cached_statement
+def _retry(model: type[models.Outbox]) -> Update:
+    table = model.__table__
+    return (
+        update(table)  # type: ignore[arg-type]
+        .where(table.c.uuid == bindparam("b_uuid"))
+        .values(
+            attempts=table.c.attempts + 1,
+            available_at=func.now() + bindparam("b_delay", type_=Interval),
+            last_error=bindparam("b_error"),
+        )
+    )
+
+
+@cached_statement
+def _fail(model: type[models.Outbox]) -> Update:
+    table = model.__table__
+    return (
+        update(table)  # type: ignore[arg-type]
+        .where(table.c.uuid == bindparam("b_uuid"))
+        .values(
+            attempts=table.c.attempts + 1,
+            failed_at=func.now(),
+            last_error=bindparam("b_error"),
+        )
+    )
+
+
+class OutboxRepository(BaseRepository[models.Outbox]):
+    __slots__ = ()
+
+    async def add(self, *records: tuple[str, bytes]) -> None:
+        if not records:
+            return
+
+        await self._session.execute(
+            _insert(self.model),
+            [{"broker": broker, "message": message} for broker, message in records],
+        )
+
+    async def claim(
+        self, limit: int, lease: timedelta = DEFAULT_CLAIM_LEASE
+    ) -> Sequence[models.Outbox]:
+        return (
+            await self._session.scalars(
+                _claim(self.model), {"limit": limit, "lease": lease}
+            )
+        ).all()
+
+    async def delete(self, *uuids: uuid.UUID) -> None:
+        if uuids:
+            await self._session.execute(_delete(self.model), {"uuids": list(uuids)})
+
+    async def retry(
+        self,
+        errors: Mapping[uuid.UUID, tuple[int, str]],
+        delay: timedelta = DEFAULT_RETRY_DELAY,
+    ) -> None:
+        if not errors:
+            return
+
+        await self._session.execute(
+            _retry(self.model),
+            [
+                {
+                    "b_uuid": record_uuid,
+                    "b_delay": min(MAX_RETRY_DELAY, delay * 2**attempts),
+                    "b_error": error,
+                }
+                for record_uuid, (attempts, error) in errors.items()
+            ],
+        )
+
+    async def fail(self, errors: Mapping[uuid.UUID, str]) -> None:
+        if not errors:
+            return
+
+        await self._session.execute(
+            _fail(self.model),
+            [
+                {"b_uuid": record_uuid, "b_error": error}
+                for record_uuid, error in errors.items()
+            ],
+        )
@@ -1,10 +1,22 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from typing import Any, Optional, Unpack
 
 import uuid_utils.compat as uuid
-from sqlalchemy import ColumnExpressionArgument, UnaryExpression
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Select,
+    any_,
+    bindparam,
+    func,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import src.database.models as models
+from src.database._utils import frozendict
+from src.database.catalog import RoleCatalog
 from src.database.exceptions import InvalidParamsError
 from src.database.models.types import Roles
 from src.database.repositories import Result
@@ -13,16 +25,108 @@ from src.database.repositories.types.role import (
     CreateRoleType,
     RoleLoads,
 )
-from src.database.tools import on_integrity, select_with_relationships
-from src.database.types import OrderBy
+from src.database.tools import (
+    LIKE_ESCAPE,
+    cached_statement,
+    escape_like,
+    on_commit,
+    on_integrity,
+    select_with_relationships,
+)
+from src.database.types import CountMode, Keyset, OrderBy, Page, Row
+
+
+def _filters(
+    model: type[models.Role], by_name: bool
+) -> list[ColumnExpressionArgument[bool]]:
+    return [model.name.ilike(bindparam("name"), escape=LIKE_ESCAPE)] if by_name else []
+
+
+@cached_statement
+def _select_one(
+    model: type[models.Role], loads: tuple[RoleLoads, ...], by_uuid: bool, by_name: bool
+) -> Select[tuple[models.Role]]:
+    where_clauses: list[ColumnExpressionArgument[bool]] = []
+
+    if by_uuid:
+        where_clauses.append(model.uuid == bindparam("role_uuid"))
+    if by_name:
+        where_clauses.append(model.name == bindparam("name"))
+
+    return select_with_relationships(*loads, model=model).where(*where_clauses)
+
+
+@cached_statement
+def _select_page(
+    model: type[models.Role],
+    loads: tuple[RoleLoads, ...],
+    by_name: bool,
+    order_by: OrderBy,
+) -> Select[tuple[models.Role]]:
+    return (
+        select_with_relationships(*loads, model=model)
+        .where(*_filters(model, by_name))
+        .order_by(getattr(model.created_at, order_by)())
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+
+
+@cached_statement
+def _select_after(
+    model: type[models.Role],
+    loads: tuple[RoleLoads, ...],
+    by_name: bool,
+    order_by: OrderBy,
+    after: bool,
+) -> Select[tuple[models.Role]]:
+    stmt = select_with_relationships(*loads, model=model).where(
+        *_filters(model, by_name)
+    )
+    if after:
+        keyset = tuple_(model.created_at, model.uuid)
+        bound = tuple_(
+            bindparam("created_at", type_=model.created_at.type),
+            bindparam("uuid", type_=model.uuid.type),
+        )
+        stmt = stmt.where(keyset < bound if order_by == "desc" else keyset > bound)
+
+    return stmt.order_by(
+        getattr(model.created_at, order_by)(), getattr(model.uuid, order_by)()
+    ).limit(bindparam("limit"))
+
+
+@cached_statement
+def _select_by_uuids(model: type[models.Role]) -> Select[Any]:
+    return select(*model.__table__.columns).where(
+        model.uuid == any_(bindparam("uuids", type_=ARRAY(model.uuid.type)))
+    )
+
+
+@cached_statement
+def _count(model: type[models.Role], by_name: bool) -> Select[tuple[int]]:
+    return select(func.count()).where(*_filters(model, by_name)).select_from(model)
 
 
 class RoleRepository(BaseRepository[models.Role]):
-    __slots__ = ()
+    __slots__ = ("_catalog",)
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: type[models.Role],
+        catalog: Optional[RoleCatalog] = None,
+    ) -> None:
+        super().__init__(session, model)
+        self._catalog = catalog
 
     @on_integrity("name")
     async def create(self, **data: Unpack[CreateRoleType]) -> Result[models.Role]:
-        return Result("create", await self._crud.insert(**data))
+        role = await self._crud.insert(**data)
+        if role is not None and self._catalog is not None:
+            on_commit(self._session, self._catalog.changed)
+
+        return Result("create", role)
 
     async def select(
         self,
@@ -33,15 +137,31 @@ class RoleRepository(BaseRepository[models.Role]):
         if not any([role_uuid, name]):
             raise InvalidParamsError("at least one identifier must be provided")
 
-        where_clauses: list[ColumnExpressionArgument[bool]] = []
+        if not loads and (cached := self._from_catalog(role_uuid, name)) is not None:
+            return Result("select", await self._session.merge(cached, load=False))
+
+        params: dict[str, Any] = {}
 
         if role_uuid:
-            where_clauses.append(self.model.uuid == role_uuid)
+            params["role_uuid"] = role_uuid
         if name:
-            where_clauses.append(self.model.name == name)
+            params["name"] = name
 
-        stmt = select_with_relationships(*loads, model=self.model).where(*where_clauses)
-        return Result("select", (await self._session.scalars(stmt)).unique().first())
+        stmt = _select_one(self.model, loads, bool(role_uuid), bool(name))
+        return Result(
+            "select", (await self._session.scalars(stmt, params)).unique().first()
+        )
+
+    async def select_rows_by_uuids(
+        self, uuids: Sequence[uuid.UUID]
+    ) -> Mapping[uuid.UUID, Row]:
+        if not uuids:
+            return {}
+
+        rows = await self._session.execute(
+            _select_by_uuids(self.model), {"uuids": list(uuids)}
+        )
+        return {row.uuid: frozendict(row._mapping) for row in rows}
 
     async def select_many(
         self,
@@ -50,29 +170,72 @@ class RoleRepository(BaseRepository[models.Role]):
         order_by: OrderBy = "desc",
         offset: int = 0,
         limit: int = 10,
-    ) -> tuple[int, Sequence[models.Role]]:
-        where_clauses: list[ColumnExpressionArgument[bool]] = []
-        order_by_clauses: list[UnaryExpression[Any]] = []
+        count: CountMode = "exact",
+    ) -> tuple[Optional[int], Sequence[models.Role]]:
+        params: dict[str, Any] = {}
 
         if name:
-            where_clauses.append(self.model.name.ilike(f"%{name}%"))
-        if order_by:
-            order_by_clauses.append(getattr(self.model.created_at, order_by)())
-
-        total = await self._crud.count(*where_clauses)
-        if total <= 0:
-            return total, []
-
-        stmt = (
-            select_with_relationships(*loads, model=self.model)
-            .where(*where_clauses)
-            .order_by(*order_by_clauses)
-            .limit(limit)
-            .offset(offset)
+            params["name"] = f"%{escape_like(name)}%"
+
+        total = await self._total(
+            _count(self.model, bool(name)), params, count, filtered=bool(name)
         )
+        if total is not None and total <= 0:
+            return 0, []
 
-        results = (await self._session.scalars(stmt)).unique().all()
+        stmt = _select_page(self.model, loads, bool(name), order_by)
+        params.update(limit=limit, offset=offset)
+        results = (await self._session.scalars(stmt, params)).unique().all()
         return total, results
 
+    async def select_after(
+        self,
+        *loads: RoleLoads,
+        name: Optional[str] = None,
+        order_by: OrderBy = "desc",
+        after: Optional[Keyset] = None,
+        limit: int = 10,
+        count: CountMode = "none",
+    ) -> Page[models.Role]:
+        params: dict[str, Any] = {}
+
+        if name:
+            params["name"] = f"%{escape_like(name)}%"
+
+        total = await self._total(
+            _count(self.model, bool(name)), params, count, filtered=bool(name)
+        )
+
+        stmt = _select_after(self.model, loads, bool(name), order_by, after is not None)
+        if after is not None:
+            params["created_at"], params["uuid"] = after
+        params["limit"] = limit + 1
+
+        results = (await self._session.scalars(stmt, params)).unique().all()
+        items, rest = results[:limit], results[limit:]
+        last = items[-1] if rest else None
+        return Page(total, items, (last.created_at, last.uuid) if last else None)
+
     async def exists(self, name: str) -> Result[bool]:
+        if self._catalog is not None and self._catalog.by_name(name) is not None:
+            return Result("exists", True)
+
         return Result("exists", await self._crud.exists(self.model.name == name))
+
+    def _from_catalog(
+        self, role_uuid: Optional[uuid.UUID], name: Optional[str]
+    ) -> Optional[models.Role]:
+        if self._catalog is None:
+            return None
+
+        if role_uuid:
+            role = self._catalog.get(role_uuid)
+        elif name:
+            role = self._catalog.by_name(name)
+        else:
+            return None
+
+        if role is None or (name and role.name != name):
+            return None
+
+        return role
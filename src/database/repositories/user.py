@@ -2,10 +2,23 @@ from collections.abc import Sequence
 from typing import Any, Optional, Unpack
 
 import uuid_utils.compat as uuid
-from sqlalchemy import ColumnExpressionArgument, UnaryExpression
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Select,
+    bindparam,
+    func,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
 import src.database.models as models
+from src.database.catalog import RoleCatalog
 from src.database.exceptions import InvalidParamsError
+from src.database.interfaces.cache import CacheInvalidator
+from src.database.loader import DataLoader
 from src.database.repositories import Result
 from src.database.repositories.base import BaseRepository
 from src.database.repositories.types.user import (
@@ -13,12 +26,133 @@ from src.database.repositories.types.user import (
     UpdateUserType,
     UserLoads,
 )
-from src.database.tools import on_integrity, select_with_relationships
-from src.database.types import OrderBy
+from src.database.tools import (
+    LIKE_ESCAPE,
+    cached_statement,
+    escape_like,
+    on_commit,
+    on_integrity,
+    select_with_relationships,
+)
+from src.database.types import CountMode, Keyset, LoginMatch, OrderBy, Page, Row
+
+
+def _login_search(login: str, match: LoginMatch) -> tuple[LoginMatch, str]:
+    # auto keeps substring semantics, the trigram index serves terms of three
+    # or more characters and shorter ones fall back to a scan; prefix is opt-in
+    if match == "auto":
+        match = "contains"
+
+    if match == "prefix":
+        return match, f"{escape_like(login.lower())}%"
+    if match == "contains":
+        return match, f"%{escape_like(login)}%"
+
+    return match, login
+
+
+def _filters(
+    model: type[models.User], login: Optional[LoginMatch], by_role: bool
+) -> list[ColumnExpressionArgument[bool]]:
+    where_clauses: list[ColumnExpressionArgument[bool]] = []
+
+    if login == "exact":
+        where_clauses.append(model.login == bindparam("login"))
+    elif login == "prefix":
+        where_clauses.append(
+            func.lower(model.login).like(bindparam("login"), escape=LIKE_ESCAPE)
+        )
+    elif login == "contains":
+        where_clauses.append(model.login.ilike(bindparam("login"), escape=LIKE_ESCAPE))
+    if by_role:
+        where_clauses.append(model.role_uuid == bindparam("role_uuid"))
+
+    return where_clauses
+
+
+@cached_statement
+def _select_one(
+    model: type[models.User],
+    loads: tuple[UserLoads, ...],
+    by_uuid: bool,
+    by_login: bool,
+) -> Select[tuple[models.User]]:
+    where_clauses: list[ColumnExpressionArgument[bool]] = []
+
+    if by_uuid:
+        where_clauses.append(model.uuid == bindparam("user_uuid"))
+    if by_login:
+        where_clauses.append(model.login == bindparam("login"))
+
+    return select_with_relationships(*loads, model=model).where(*where_clauses)
+
+
+@cached_statement
+def _select_page(
+    model: type[models.User],
+    loads: tuple[UserLoads, ...],
+    login: Optional[LoginMatch],
+    by_role: bool,
+    order_by: OrderBy,
+) -> Select[tuple[models.User]]:
+    return (
+        select_with_relationships(*loads, model=model)
+        .where(*_filters(model, login, by_role))
+        .order_by(getattr(model.created_at, order_by)())
+        .limit(bindparam("limit"))
+        .offset(bindparam("offset"))
+    )
+
+
+@cached_statement
+def _select_after(
+    model: type[models.User],
+    loads: tuple[UserLoads, ...],
+    login: Optional[LoginMatch],
+    by_role: bool,
+    order_by: OrderBy,
+    after: bool,
+) -> Select[tuple[models.User]]:
+    stmt = select_with_relationships(*loads, model=model).where(
+        *_filters(model, login, by_role)
+    )
+    if after:
+        keyset = tuple_(model.created_at, model.uuid)
+        bound = tuple_(
+            bindparam("created_at", type_=model.created_at.type),
+            bindparam("uuid", type_=model.uuid.type),
+        )
+        stmt = stmt.where(keyset < bound if order_by == "desc" else keyset > bound)
+
+    return stmt.order_by(
+        getattr(model.created_at, order_by)(), getattr(model.uuid, order_by)()
+    ).limit(bindparam("limit"))
+
+
+@cached_statement
+def _count(
+    model: type[models.User], login: Optional[LoginMatch], by_role: bool
+) -> Select[tuple[int]]:
+    return (
+        select(func.count()).where(*_filters(model, login, by_role)).select_from(model)
+    )
 
 
 class UserRepository(BaseRepository[models.User]):
-    __slots__ = ()
+    __slots__ = ("_cache", "_roles", "_catalog")
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: type[models.User],
+        cache: Optional[CacheInvalidator] = None,
+        roles: Optional[DataLoader[uuid.UUID, Row]] = None,
+        catalog: Optional[RoleCatalog] = None,
+    ) -> None:
+        super().__init__(session, model)
+        self._cache = cache
+        self._roles = roles
+        self._catalog = catalog
 
     @on_integrity("login")
     async def create(self, **data: Unpack[CreateUserType]) -> Result[models.User]:
@@ -33,15 +167,20 @@ class UserRepository(BaseRepository[models.User]):
         if not any([user_uuid, login]):
             raise InvalidParamsError("at least one identifier must be provided")
 
-        where_clauses: list[ColumnExpressionArgument[bool]] = []
+        params: dict[str, Any] = {}
 
         if user_uuid:
-            where_clauses.append(self.model.uuid == user_uuid)
+            params["user_uuid"] = user_uuid
         if login:
-            where_clauses.append(self.model.login == login)
+            params["login"] = login
+
+        loads, with_role = self._split_loads(loads)
+        stmt = _select_one(self.model, loads, bool(user_uuid), bool(login))
+        user = (await self._session.scalars(stmt, params)).unique().first()
+        if user is not None and with_role:
+            await self._attach_roles((user,))
 
-        stmt = select_with_relationships(*loads, model=self.model).where(*where_clauses)
-        return Result("select", (await self._session.scalars(stmt)).unique().first())
+        return Result("select", user)
 
     @on_integrity("login")
     async def update(
@@ -54,6 +193,9 @@ class UserRepository(BaseRepository[models.User]):
             raise InvalidParamsError("at least one identifier must be provided")
 
         result = await self._crud.update(self.model.uuid == uuid, **data)
+        if result:
+            self._invalidate(uuid)
+
         return Result("update", result[0] if result else None)
 
     async def delete(
@@ -70,41 +212,134 @@ class UserRepository(BaseRepository[models.User]):
             where_clauses.append(self.model.login == login)
 
         result = await self._crud.delete(*where_clauses)
+        if result:
+            self._invalidate(*(user.uuid for user in result))
+
         return Result("delete", result[0] if result else None)
 
     async def select_many(
         self,
         *loads: UserLoads,
         login: Optional[str] = None,
+        login_match: LoginMatch = "auto",
         role_uuid: Optional[uuid.UUID] = None,
         order_by: OrderBy = "desc",
         offset: int = 0,
         limit: int = 10,
-    ) -> Result[tuple[int, Sequence[models.User]]]:
-        where_clauses: list[ColumnExpressionArgument[bool]] = []
-        order_by_clauses: list[UnaryExpression[Any]] = []
+        count: CountMode = "exact",
+    ) -> Result[tuple[Optional[int], Sequence[models.User]]]:
+        params: dict[str, Any] = {}
+        search: Optional[LoginMatch] = None
 
         if login:
-            where_clauses.append(self.model.login.ilike(f"%{login}%"))
+            search, params["login"] = _login_search(login, login_match)
         if role_uuid:
-            where_clauses.append(self.model.role_uuid == role_uuid)
-        if order_by:
-            order_by_clauses.append(getattr(self.model.created_at, order_by)())
-
-        total = await self._crud.count(*where_clauses)
-        if total <= 0:
-            return Result("select", (total, []))
-
-        stmt = (
-            select_with_relationships(*loads, model=self.model)
-            .where(*where_clauses)
-            .order_by(*order_by_clauses)
-            .limit(limit)
-            .offset(offset)
+            params["role_uuid"] = role_uuid
+
+        by_role = bool(role_uuid)
+        total = await self._total(
+            _count(self.model, search, by_role),
+            params,
+            count,
+            filtered=bool(params),
         )
+        if total is not None and total <= 0:
+            return Result("select", (0, []))
 
-        results = (await self._session.scalars(stmt)).unique().all()
+        loads, with_role = self._split_loads(loads)
+        stmt = _select_page(self.model, loads, search, by_role, order_by)
+        params.update(limit=limit, offset=offset)
+        results = (await self._session.scalars(stmt, params)).unique().all()
+        if with_role:
+            await self._attach_roles(results)
         return Result("select", (total, results))
 
+    async def select_after(
+        self,
+        *loads: UserLoads,
+        login: Optional[str] = None,
+        login_match: LoginMatch = "auto",
+        role_uuid: Optional[uuid.UUID] = None,
+        order_by: OrderBy = "desc",
+        after: Optional[Keyset] = None,
+        limit: int = 10,
+        count: CountMode = "none",
+    ) -> Result[Page[models.User]]:
+        params: dict[str, Any] = {}
+        search: Optional[LoginMatch] = None
+
+        if login:
+            search, params["login"] = _login_search(login, login_match)
+        if role_uuid:
+            params["role_uuid"] = role_uuid
+
+        by_role = bool(role_uuid)
+        total = await self._total(
+            _count(self.model, search, by_role),
+            params,
+            count,
+            filtered=bool(params),
+        )
+
+        loads, with_role = self._split_loads(loads)
+        stmt = _select_after(
+            self.model, loads, search, by_role, order_by, after is not None
+        )
+        if after is not None:
+            params["created_at"], params["uuid"] = after
+        params["limit"] = limit + 1
+
+        results = (await self._session.scalars(stmt, params)).unique().all()
+        items, rest = results[:limit], results[limit:]
+        if with_role:
+            await self._attach_roles(items)
+
+        last = items[-1] if rest else None
+        return Result(
+            "select",
+            Page(total, items, (last.created_at, last.uuid) if last else None),
+        )
+
     async def exists(self, login: str) -> Result[bool]:
         return Result("exists", await self._crud.exists(self.model.login == login))
+
+    def _split_loads(
+        self, loads: tuple[UserLoads, ...]
+    ) -> tuple[tuple[UserLoads, ...], bool]:
+        if (self._roles is None and self._catalog is None) or "role" not in loads:
+            return loads, False
+
+        return tuple(load for load in loads if load != "role"), True
+
+    async def _attach_roles(self, users: Sequence[models.User]) -> None:
+        if not users:
+            return
+
+        found: list[models.Role] = []
+        missing: list[uuid.UUID] = []
+        for role_uuid in {user.role_uuid for user in users}:
+            role = self._catalog.get(role_uuid) if self._catalog is not None else None
+            if role is None:
+                missing.append(role_uuid)
+            else:
+                found.append(role)
+
+        if missing and self._roles is not None:
+            # the shared loader cache holds column rows, never another session's instances
+            for row in await self._roles.load_many(*missing):
+                if row is not None:
+                    role = models.Role(**row)
+                    make_transient_to_detached(role)
+                    found.append(role)
+
+        roles: dict[uuid.UUID, models.Role] = {}
+        for role in found:
+            roles[role.uuid] = await self._session.merge(role, load=False)
+
+        for user in users:
+            set_committed_value(user, "role", roles.get(user.role_uuid))
+
+    def _invalidate(self, *user_uuids: uuid.UUID) -> None:
+        # invalidating before the commit lets a concurrent miss cache the old row
+        if (cache := self._cache) is not None:
+            on_commit(self._session, lambda: cache.invalidate(*user_uuids))
@@ -1,21 +1,45 @@
 from __future__ import annotations
 
+import inspect
 from collections import deque
 from collections.abc import Awaitable, Callable
-from functools import lru_cache, wraps
+from functools import _CacheInfo, lru_cache, wraps
 from typing import (
     TYPE_CHECKING,
     Any,
     Final,
     Optional,
     Union,
+    cast,
 )
 
-from sqlalchemy import ColumnExpressionArgument, Select, select, true
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Executable,
+    Select,
+    TextClause,
+    bindparam,
+    event,
+    func,
+    literal_column,
+    select,
+    text,
+    true,
+)
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import RelationshipProperty, aliased, contains_eager, subqueryload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    RelationshipProperty,
+    Session,
+    SessionTransaction,
+    aliased,
+    contains_eager,
+    subqueryload,
+)
+from sqlalchemy.util import await_only
 
 from src.common.exceptions import AppException, ConflictError
+from src.common.logger import log
 from src.database._utils import frozendict
 from src.database.models import MODELS_RELATIONSHIPS_NODE
 from src.database.models.base import Base
@@ -25,6 +49,16 @@ if TYPE_CHECKING:
 
 
 DEFAULT_RELATIONSHIP_LOAD_LIMIT: Final[int] = 100
+DEFAULT_STATEMENT_CACHE_SIZE: Final[int] = 512
+DEFAULT_COUNT_CAP: Final[int] = 10_000
+LIKE_ESCAPE: Final[str] = "/"
+ON_COMMIT_KEY: Final[str] = "on_commit"
+
+ESTIMATED_COUNT_STATEMENT: Final[TextClause] = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(quote_ident(:table))"
+)
+
+_STATEMENT_CACHES: dict[str, Any] = {}
 
 
 def _bfs_search[E: Base](
@@ -147,6 +181,14 @@ def _construct_loads[E: Base](
     return query, load
 
 
+def escape_like(value: str, escape: str = LIKE_ESCAPE) -> str:
+    return (
+        value.replace(escape, escape * 2)
+        .replace("%", f"{escape}%")
+        .replace("_", f"{escape}_")
+    )
+
+
 def add_conditions[E: Base](
     *conditions: ColumnExpressionArgument[bool],
 ) -> Callable[[Select[tuple[E]]], Select[tuple[E]]]:
@@ -203,6 +245,36 @@ def select_with_relationships[E: Base](
     return query
 
 
+_STATEMENT_CACHES[select_with_relationships.__qualname__] = select_with_relationships
+
+
+def cached_statement[**P, S: Executable](
+    builder: Callable[P, S],
+) -> Callable[P, S]:
+    cached = lru_cache(maxsize=DEFAULT_STATEMENT_CACHE_SIZE, typed=True)(builder)
+    _STATEMENT_CACHES[f"{builder.__module__}.{builder.__qualname__}"] = cached
+    return cast(Callable[P, S], cached)
+
+
+@cached_statement
+def capped_count(count: Select[tuple[int]]) -> Select[tuple[int]]:
+    limited = (
+        count.with_only_columns(literal_column("1"))
+        .limit(bindparam("count_cap"))
+        .subquery()
+    )
+    return select(func.count()).select_from(limited)
+
+
+def statement_cache_info() -> dict[str, _CacheInfo]:
+    return {name: cached.cache_info() for name, cached in _STATEMENT_CACHES.items()}
+
+
+def clear_statement_cache() -> None:
+    for cached in _STATEMENT_CACHES.values():
+        cached.cache_clear()
+
+
 def on_integrity[R, **P](
     *uniques: str,
     should_raise: Union[type[AppException], AppException] = ConflictError,
@@ -227,3 +299,29 @@ def on_integrity[R, **P](
         return _inner_wrapper
 
     return _wrapper
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    sync_session = session.sync_session
+    if (pending := sync_session.info.get(ON_COMMIT_KEY)) is None:
+        pending = sync_session.info[ON_COMMIT_KEY] = []
+        event.listen(sync_session, "after_commit", _run_on_commit)
+        event.listen(sync_session, "after_transaction_end", _drop_on_commit)
+
+    pending.append(callback)
+
+
+def _run_on_commit(session: Session) -> None:
+    callbacks, session.info[ON_COMMIT_KEY] = session.info[ON_COMMIT_KEY], []
+    for callback in callbacks:
+        try:
+            # commit runs inside the AsyncSession greenlet, so it can be awaited
+            if inspect.isawaitable(result := callback()):
+                await_only(result)
+        except Exception as e:
+            log.error("Error running on commit callback: %s", e)
+
+
+def _drop_on_commit(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info[ON_COMMIT_KEY] = []
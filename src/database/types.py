@@ -1,3 +1,17 @@
-from typing import Literal
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Literal, NamedTuple, Optional
+
+import uuid_utils.compat as uuid
 
 type OrderBy = Literal["asc", "desc"]
+type LoginMatch = Literal["auto", "exact", "prefix", "contains"]
+type CountMode = Literal["exact", "estimated", "none"]
+type Keyset = tuple[datetime, uuid.UUID]
+type Row = Mapping[str, Any]
+
+
+class Page[M](NamedTuple):
+    total: Optional[int]
+    items: Sequence[M]
+    next: Optional[Keyset]
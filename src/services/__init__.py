@@ -24,6 +24,7 @@ class ServiceFactory:
             InternalServiceGateway,
             jwt=self.jwt,
             redis=self.redis,
+            settings=self.settings.ciphers,
         )
 
     def external(self) -> ExternalServiceGateway:
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from types import TracebackType
+from typing import Any, Callable, Optional, Self
+
+from redis.asyncio.client import Pipeline
+
+
+class Deferred[T]:
+    __slots__ = ("_value", "_ready")
+
+    def __init__(self) -> None:
+        self._value: Any = None
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def result(self) -> T:
+        if not self._ready:
+            raise RuntimeError("Batch has not been executed yet")
+
+        return self._value  # type: ignore[no-any-return]
+
+    def _resolve(self, value: Any) -> None:
+        self._value = value
+        self._ready = True
+
+
+type _Pending = tuple[Deferred[Any], Callable[[Any], Any]]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _as_timedelta(expire: float | timedelta) -> timedelta:
+    return expire if isinstance(expire, timedelta) else timedelta(seconds=expire)
+
+
+class RedisBatch:
+    __slots__ = ("_pipeline", "_pending")
+
+    def __init__(self, pipeline: Pipeline) -> None:  # type: ignore[type-arg]
+        self._pipeline = pipeline
+        self._pending: list[_Pending] = []
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc_type is None and self._pending:
+                await self.execute()
+        finally:
+            await self._pipeline.reset()
+
+    def get(self, key: str) -> Deferred[str | None]:
+        self._pipeline.get(key)
+        return self._defer()
+
+    def mget(self, *keys: str) -> Deferred[list[str | None]]:
+        self._pipeline.mget(keys)
+        return self._defer()
+
+    def set(
+        self, key: str, value: Any, expire: float | timedelta | None = None, **kw: Any
+    ) -> Deferred[bool]:
+        self._pipeline.set(
+            key, value, ex=None if expire is None else _as_timedelta(expire), **kw
+        )
+        return self._defer(bool)
+
+    def delete(self, *keys: str) -> Deferred[int]:
+        self._pipeline.unlink(*keys)
+        return self._defer()
+
+    def exists(self, *keys: str) -> Deferred[bool]:
+        self._pipeline.exists(*keys)
+        return self._defer(bool)
+
+    def set_list(
+        self, key: str, *values: Any, expire: float | timedelta | None = None
+    ) -> Deferred[int]:
+        self._pipeline.lpush(key, *values)
+        deferred: Deferred[int] = self._defer()
+        if expire:
+            self.expire(key, expire)
+
+        return deferred
+
+    def get_list(self, key: str, start: int = 0, end: int = -1) -> Deferred[list[str]]:
+        self._pipeline.lrange(key, start, end)
+        return self._defer()
+
+    def discard(self, key: str, value: Any, count: int = 0) -> Deferred[int]:
+        self._pipeline.lrem(key, count, value)
+        return self._defer()
+
+    def expire(self, key: str, expire: float | timedelta) -> Deferred[bool]:
+        self._pipeline.expire(key, _as_timedelta(expire))
+        return self._defer(bool)
+
+    async def execute(self) -> list[Any]:
+        pending, self._pending = self._pending, []
+        results: list[Any] = await self._pipeline.execute()
+
+        for (deferred, transform), value in zip(pending, results, strict=True):
+            deferred._resolve(transform(value))
+
+        return results
+
+    def _defer[T](self, transform: Callable[[Any], T] = _identity) -> Deferred[T]:
+        deferred: Deferred[T] = Deferred()
+        self._pending.append((deferred, transform))
+        return deferred
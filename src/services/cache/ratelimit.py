@@ -0,0 +1,70 @@
+from typing import Final, NamedTuple
+
+from src.common.tools.cache import default_key_builder
+from src.services.cache.redis import RedisCache
+
+# KEYS: bucket hash (tokens, ts)
+# ARGV: rate per second, capacity, requested tokens
+TAKE_SCRIPT: Final[str] = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(requested, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+local wait = 0
+if granted == 0 then
+    wait = (1 - tokens) / rate
+end
+return {granted, tostring(wait)}
+"""
+
+
+# KEYS: bucket hash (tokens, ts)
+# ARGV: capacity, returned tokens
+GIVE_BACK_SCRIPT: Final[str] = """
+local capacity = tonumber(ARGV[1])
+local returned = tonumber(ARGV[2])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens == nil then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(capacity, tokens + returned)))
+return 1
+"""
+
+
+class Grant(NamedTuple):
+    granted: int
+    retry_after: float
+
+
+class RedisRateLimiter:
+    __slots__ = ("_namespace", "_take", "_give_back")
+
+    def __init__(self, redis: RedisCache, namespace: str = "ratelimit") -> None:
+        self._namespace = namespace
+        self._take = redis.register_script(TAKE_SCRIPT)
+        self._give_back = redis.register_script(GIVE_BACK_SCRIPT)
+
+    async def take(
+        self, key: str, rate: float, capacity: float, count: int = 1
+    ) -> Grant:
+        granted, retry_after = await self._take(
+            keys=[default_key_builder(self._namespace, key)],
+            args=[rate, capacity, count],
+        )
+        return Grant(int(granted), float(retry_after))
+
+    async def give_back(self, key: str, capacity: float, count: int) -> None:
+        # an expired bucket is already full again, nothing to return then
+        await self._give_back(
+            keys=[default_key_builder(self._namespace, key)], args=[capacity, count]
+        )
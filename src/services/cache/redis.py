@@ -1,10 +1,16 @@
+from collections.abc import Mapping
 from datetime import timedelta
-from typing import Any
+from typing import Any, Final
 
 import redis.asyncio as aioredis
+from redis.client import NEVER_DECODE
+from redis.commands.core import AsyncScript
 
+from src.services.cache.batch import RedisBatch
 from src.settings.core import RedisSettings
 
+DEFAULT_SCAN_BATCH_SIZE: Final[int] = 500
+
 
 class RedisCache:
     __slots__ = ("_redis",)
@@ -18,29 +24,72 @@ class RedisCache:
     ) -> str | None:
         return await self._redis.get(key)
 
+    async def get_bytes(self, key: str) -> bytes | None:
+        result: bytes | None = await self._redis.execute_command(  # type: ignore[no-untyped-call]
+            "GET", key, **{NEVER_DECODE: []}
+        )
+        return result
+
     async def set(
         self, key: str, value: Any, expire: float | timedelta | None = None, **kw: Any
+    ) -> bool:
+        return bool(await self._redis.set(key, value, ex=expire, **kw))
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+
+        return await self._redis.unlink(*keys)
+
+    async def delete_pattern(
+        self, pattern: str, batch_size: int = DEFAULT_SCAN_BATCH_SIZE
+    ) -> int:
+        deleted = 0
+        cursor, keys = await self._redis.scan(0, match=pattern, count=batch_size)
+        while True:
+            if not keys:
+                if not cursor:
+                    return deleted
+                cursor, keys = await self._redis.scan(
+                    cursor, match=pattern, count=batch_size
+                )
+                continue
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.unlink(*keys)
+                if cursor:
+                    pipe.scan(cursor, match=pattern, count=batch_size)
+                results = await pipe.execute()
+
+            deleted += int(results[0])
+            if not cursor:
+                return deleted
+            cursor, keys = results[1]
+
+    async def mget(self, *keys: str) -> list[str | None]:
+        if not keys:
+            return []
+
+        return await self._redis.mget(keys)
+
+    async def mset(
+        self, mapping: Mapping[str, Any], expire: float | timedelta | None = None
     ) -> None:
-        await self._redis.set(key, value, ex=expire, **kw)
+        if not mapping:
+            return
+        if expire is None:
+            await self._redis.mset(mapping)  # type: ignore[arg-type]
+            return
 
-    async def delete(self, *keys: str) -> None:
-        found_keys = [
-            found for key in keys async for found in self._redis.scan_iter(key)
-        ]
-        if found_keys:
-            await self._redis.delete(*found_keys)
+        async with self.pipeline() as tx:
+            for key, value in mapping.items():
+                tx.set(key, value, expire=expire)
 
     async def set_list(
-        self, key: str, *values: Any, expire: float | timedelta | None = None, **kw: Any
+        self, key: str, *values: Any, expire: float | timedelta | None = None
     ) -> None:
-        await self._redis.lpush(key, *(v for v in values))
-
-        if expire:
-            await self._redis.expire(
-                key,
-                expire if isinstance(expire, timedelta) else timedelta(seconds=expire),
-                **kw,
-            )
+        async with self.pipeline() as tx:
+            tx.set_list(key, *values, expire=expire)
 
     async def get_list(
         self,
@@ -59,11 +108,20 @@ class RedisCache:
         count = kw.pop("count", 0)
         await self._redis.lrem(key, count, value)
 
+    def batch(self) -> RedisBatch:
+        return RedisBatch(self._redis.pipeline(transaction=False))
+
+    def pipeline(self) -> RedisBatch:
+        return RedisBatch(self._redis.pipeline(transaction=True))
+
+    def register_script(self, script: str) -> AsyncScript:
+        return self._redis.register_script(script)
+
     async def clear(self) -> None:
         await self._redis.flushall(asynchronous=True)
 
-    async def exists(self, key: str) -> bool:
-        return bool(await self._redis.keys(key))
+    async def exists(self, *keys: str) -> bool:
+        return bool(await self._redis.exists(*keys))
 
     async def keys(self) -> list[str]:
         return await self._redis.keys("*")
@@ -0,0 +1,112 @@
+import time
+from datetime import datetime
+from typing import Final
+
+import uuid_utils.compat as uuid
+
+from src.common.tools.cache import default_key_builder
+from src.services.cache.redis import RedisCache
+from src.services.interfaces.session import AbstractSessionStore
+
+# KEYS: sessions hash (fingerprint -> token), order zset (fingerprint -> issued ms)
+# ARGV: fingerprint, token, issued_at_ms, expire_at, max_sessions
+ISSUE_SCRIPT: Final[str] = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+local overflow = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[5])
+if overflow > 0 then
+    local evicted = redis.call('ZPOPMIN', KEYS[2], overflow)
+    for i = 1, #evicted, 2 do
+        redis.call('HDEL', KEYS[1], evicted[i])
+    end
+end
+redis.call('EXPIREAT', KEYS[1], ARGV[4])
+redis.call('EXPIREAT', KEYS[2], ARGV[4])
+return 1
+"""
+
+# ARGV: fingerprint, token, new_token, issued_at_ms, expire_at
+ROTATE_SCRIPT: Final[str] = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+redis.call('EXPIREAT', KEYS[1], ARGV[5])
+redis.call('EXPIREAT', KEYS[2], ARGV[5])
+return 1
+"""
+
+# ARGV: token
+REVOKE_SCRIPT: Final[str] = """
+local sessions = redis.call('HGETALL', KEYS[1])
+for i = 1, #sessions, 2 do
+    if sessions[i + 1] == ARGV[1] then
+        redis.call('HDEL', KEYS[1], sessions[i])
+        redis.call('ZREM', KEYS[2], sessions[i])
+        return 1
+    end
+end
+return 0
+"""
+
+
+class RedisSessionStore(AbstractSessionStore):
+    __slots__ = ("_redis", "_max_sessions", "_issue", "_rotate", "_revoke")
+
+    def __init__(self, redis: RedisCache, max_sessions: int) -> None:
+        self._redis = redis
+        self._max_sessions = max_sessions
+        self._issue = redis.register_script(ISSUE_SCRIPT)
+        self._rotate = redis.register_script(ROTATE_SCRIPT)
+        self._revoke = redis.register_script(REVOKE_SCRIPT)
+
+    async def issue(
+        self,
+        user_uuid: uuid.UUID,
+        fingerprint: str,
+        token: str,
+        expire: datetime,
+    ) -> None:
+        await self._issue(
+            keys=self._keys(user_uuid),
+            args=[
+                fingerprint,
+                token,
+                time.time_ns() // 1_000_000,
+                int(expire.timestamp()),
+                self._max_sessions,
+            ],
+        )
+
+    async def rotate(
+        self,
+        user_uuid: uuid.UUID,
+        fingerprint: str,
+        token: str,
+        new_token: str,
+        expire: datetime,
+    ) -> bool:
+        return bool(
+            await self._rotate(
+                keys=self._keys(user_uuid),
+                args=[
+                    fingerprint,
+                    token,
+                    new_token,
+                    time.time_ns() // 1_000_000,
+                    int(expire.timestamp()),
+                ],
+            )
+        )
+
+    async def revoke(self, user_uuid: uuid.UUID, token: str) -> bool:
+        return bool(await self._revoke(keys=self._keys(user_uuid), args=[token]))
+
+    async def revoke_all(self, user_uuid: uuid.UUID) -> None:
+        await self._redis.delete(*self._keys(user_uuid))
+
+    def _keys(self, user_uuid: uuid.UUID) -> list[str]:
+        key = default_key_builder("session", str(user_uuid))
+        return [key, default_key_builder(key, "order")]
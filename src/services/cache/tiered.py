@@ -0,0 +1,61 @@
+from collections.abc import Callable, Hashable
+from datetime import timedelta
+from typing import Final
+
+from src.common.tools.cache import LRUCache, default_key_builder
+from src.services.cache.redis import RedisCache
+
+DEFAULT_LOCAL_MAXSIZE: Final[int] = 4096
+DEFAULT_LOCAL_TTL: Final[float] = 15.0
+DEFAULT_REMOTE_TTL: Final[timedelta] = timedelta(minutes=5)
+
+
+class TieredCache[V]:
+    __slots__ = ("_redis", "_local", "_namespace", "_encoder", "_decoder", "_expire")
+
+    def __init__(
+        self,
+        redis: RedisCache,
+        namespace: str,
+        encoder: Callable[[V], bytes],
+        decoder: Callable[[bytes], V],
+        local_maxsize: int = DEFAULT_LOCAL_MAXSIZE,
+        local_ttl: float = DEFAULT_LOCAL_TTL,
+        remote_ttl: timedelta = DEFAULT_REMOTE_TTL,
+    ) -> None:
+        self._redis = redis
+        self._local: LRUCache[Hashable, V] = LRUCache(local_maxsize, ttl=local_ttl)
+        self._namespace = namespace
+        self._encoder = encoder
+        self._decoder = decoder
+        self._expire = remote_ttl
+
+    @property
+    def local(self) -> LRUCache[Hashable, V]:
+        return self._local
+
+    async def get(self, key: Hashable) -> V | None:
+        if (value := self._local.get(key)) is not None:
+            return value
+
+        raw = await self._redis.get_bytes(self._key(key))
+        if raw is None:
+            return None
+
+        value = self._decoder(raw)
+        self._local.set(key, value)
+        return value
+
+    async def set(self, key: Hashable, value: V) -> None:
+        self._local.set(key, value)
+        await self._redis.set(self._key(key), self._encoder(value), expire=self._expire)
+
+    async def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._local.pop(key)
+
+        if keys:
+            await self._redis.delete(*(self._key(key) for key in keys))
+
+    def _key(self, key: Hashable) -> str:
+        return default_key_builder(self._namespace, str(key))
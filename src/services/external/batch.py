@@ -0,0 +1,38 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+from src.services.external.request import Request
+from src.services.provider.errors import BaseError
+
+
+@dataclass(slots=True, frozen=True)
+class Outcome[R]:
+    index: int
+    request: Request[R]
+    result: Optional[R] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchError[R](BaseError):
+    def __init__(self, outcomes: Sequence[Outcome[R]]) -> None:
+        self.outcomes = outcomes
+
+    @property
+    def failed(self) -> list[Outcome[R]]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def succeeded(self) -> list[Outcome[R]]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    def __str__(self) -> str:
+        failed = self.failed
+        return (
+            f"{len(failed)} of {len(self.outcomes)} requests failed, "
+            f"first error: {failed[0].error!r}"
+        )
@@ -1,11 +1,19 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
 from types import TracebackType
-from typing import Any, Optional, Self, Unpack
-from urllib.parse import urljoin
+from typing import Any, Final, Optional, Self, Unpack
+from urllib.parse import urljoin, urlsplit
 
+from src.common.tools.ratelimit import TokenBucket
+from src.services.external.batch import BatchError, Outcome
 from src.services.external.request import Request
 from src.services.provider.aiohttp import AiohttpProvider, ParamsType
 from src.services.provider.base import AsyncProvider
 
+DEFAULT_CONCURRENCY: Final[int] = 10
+DEFAULT_SCHEDULE_FACTOR: Final[int] = 4
+
 
 class Client:
     __slots__ = ("_provider", "_url")
@@ -31,6 +39,86 @@ class Client:
     async def send[R](self, request: Request[R], /, **kwargs: Any) -> R:
         return await request(self._provider, **kwargs)
 
+    async def send_many[R](
+        self,
+        requests: Iterable[Request[R]],
+        /,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host: Optional[int] = None,
+        rate: TokenBucket | float | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Outcome[R]]:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be a positive number")
+        if per_host is not None and per_host <= 0:
+            raise ValueError("per_host must be a positive number")
+        if isinstance(rate, int | float):
+            rate = TokenBucket(rate)
+
+        slots = asyncio.Semaphore(concurrency)
+        hosts: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host or concurrency)
+        )
+        default_host = urlsplit(self.url).netloc
+
+        async def run(index: int, request: Request[R]) -> Outcome[R]:
+            async with hosts[request.host or default_host], slots:
+                try:
+                    if rate is not None:
+                        await rate.acquire()
+                    return Outcome(index, request, await self.send(request, **kwargs))
+                except Exception as e:
+                    return Outcome(index, request, error=e)
+
+        pending: set[asyncio.Task[Outcome[R]]] = set()
+        scheduled = enumerate(requests)
+        window = concurrency * DEFAULT_SCHEDULE_FACTOR
+        try:
+            while True:
+                for index, request in scheduled:
+                    pending.add(asyncio.ensure_future(run(index, request)))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def map[R](
+        self,
+        requests: Iterable[Request[R]],
+        /,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host: Optional[int] = None,
+        rate: TokenBucket | float | None = None,
+        **kwargs: Any,
+    ) -> list[R]:
+        outcomes = [
+            outcome
+            async for outcome in self.send_many(
+                requests,
+                concurrency=concurrency,
+                per_host=per_host,
+                rate=rate,
+                **kwargs,
+            )
+        ]
+        outcomes.sort(key=lambda outcome: outcome.index)
+        if any(not outcome.ok for outcome in outcomes):
+            raise BatchError(outcomes)
+
+        return [outcome.result for outcome in outcomes]  # type: ignore[misc]
+
     async def __call__[R](self, request: Request[R], /, **kwargs: Any) -> R:
         return await self.send(request, **kwargs)
 
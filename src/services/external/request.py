@@ -5,6 +5,11 @@ from src.services.provider.base import AsyncProvider
 
 
 class Request[ResultType]:
+    @property
+    def host(self) -> str:
+        # upstream host used for per-host concurrency caps, empty means the client url
+        return ""
+
     async def __call__(self, provider: AsyncProvider, **kwargs: Any) -> ResultType:
         return await self.handle(provider, **kwargs)
 
@@ -5,3 +5,13 @@ class AbstractHasher(Protocol):
     def hash_password(self, plain: str) -> str: ...
 
     def verify_password(self, hashed: str, plain: str) -> bool: ...
+
+    def needs_rehash(self, hashed: str) -> bool: ...
+
+
+class AbstractAsyncHasher(Protocol):
+    async def hash_password(self, plain: str) -> str: ...
+
+    async def verify_password(self, hashed: str, plain: str) -> bool: ...
+
+    def needs_rehash(self, hashed: str) -> bool: ...
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Protocol
+
+import uuid_utils.compat as uuid
+
+
+class AbstractSessionStore(Protocol):
+    async def issue(
+        self,
+        user_uuid: uuid.UUID,
+        fingerprint: str,
+        token: str,
+        expire: datetime,
+    ) -> None: ...
+
+    async def rotate(
+        self,
+        user_uuid: uuid.UUID,
+        fingerprint: str,
+        token: str,
+        new_token: str,
+        expire: datetime,
+    ) -> bool: ...
+
+    async def revoke(self, user_uuid: uuid.UUID, token: str) -> bool: ...
+
+    async def revoke_all(self, user_uuid: uuid.UUID) -> None: ...
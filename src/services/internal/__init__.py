@@ -1,22 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 from src.services.cache.redis import RedisCache
+from src.services.cache.session import RedisSessionStore
 from src.services.security.jwt import JWT
+from src.settings.core import CipherSettings
 
-from .auth import AuthService
+from .auth import DEFAULT_TOKENS_COUNT, AuthService
 
 
 class InternalServiceGateway:
-    __slots__ = ("_cache", "_jwt", "_redis")
+    __slots__ = ("_cache", "_jwt", "_redis", "_sessions", "_settings", "_executor")
 
-    def __init__(self, jwt: JWT, redis: RedisCache) -> None:
+    def __init__(self, jwt: JWT, redis: RedisCache, settings: CipherSettings) -> None:
         self._redis = redis
         self._jwt = jwt
+        self._settings = settings
+        self._sessions = RedisSessionStore(redis, max_sessions=DEFAULT_TOKENS_COUNT)
+        self._executor = ThreadPoolExecutor(settings.workers, thread_name_prefix="jwt")
         self._cache: dict[str, Any] = {}
 
     @property
     def auth(self) -> AuthService:
-        return self._from_cache("auth", AuthService, jwt=self._jwt, cache=self._redis)
+        return self._from_cache(
+            "auth",
+            AuthService,
+            jwt=self._jwt,
+            sessions=self._sessions,
+            executor=self._executor,
+            offload=self._settings.offload,
+            inline_threshold_us=self._settings.inline_threshold_us,
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     def _from_cache[S](self, key: str, factory: Callable[..., S], **kwargs: Any) -> S:
         if not (cached := self._cache.get(key)):
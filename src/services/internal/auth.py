@@ -1,17 +1,29 @@
+import asyncio
+import hashlib
+import statistics
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Final, Literal
+from typing import Any, Final, Literal, Optional
 
 import uuid_utils.compat as uuid
-from litestar.concurrency import sync_to_thread
 
 from src.common.exceptions import ForbiddenError
-from src.services.cache.redis import RedisCache
+from src.common.tools.cache import LRUCache
+from src.services.interfaces.session import AbstractSessionStore
 from src.services.security.jwt import JWT
 
 DEFAULT_TOKENS_COUNT: Final[int] = 5
+DEFAULT_VERIFIED_TOKENS_COUNT: Final[int] = 10_000
+DEFAULT_INLINE_THRESHOLD_US: Final[int] = 200
+CALIBRATION_SAMPLES: Final[int] = 5
 
 TokenType = Literal["access", "refresh"]
+OffloadMode = Literal["auto", "thread", "inline"]
+# signing and verifying cost differ a lot for asymmetric algorithms
+Operation = Literal["sign", "verify"]
 
 
 @dataclass(slots=True)
@@ -32,25 +44,44 @@ class TokensExpire:
 
 
 class AuthService:
-    __slots__ = ("_jwt", "_cache")
-
-    def __init__(self, jwt: JWT, cache: RedisCache) -> None:
+    __slots__ = (
+        "_jwt",
+        "_sessions",
+        "_verified",
+        "_executor",
+        "_offload",
+        "_inline_threshold",
+        "_inline",
+        "_samples",
+    )
+
+    def __init__(
+        self,
+        jwt: JWT,
+        sessions: AbstractSessionStore,
+        executor: Executor,
+        offload: OffloadMode = "auto",
+        inline_threshold_us: int = DEFAULT_INLINE_THRESHOLD_US,
+        verified_maxsize: int = DEFAULT_VERIFIED_TOKENS_COUNT,
+    ) -> None:
         self._jwt = jwt
-        self._cache = cache
+        self._sessions = sessions
+        self._verified: LRUCache[bytes, dict[str, Any]] = LRUCache(verified_maxsize)
+        self._executor = executor
+        self._offload = offload
+        self._inline_threshold = inline_threshold_us / 1_000_000
+        inline = None if offload == "auto" else offload == "inline"
+        self._inline: dict[Operation, Optional[bool]] = {
+            "sign": inline,
+            "verify": inline,
+        }
+        self._samples: dict[Operation, list[float]] = {"sign": [], "verify": []}
 
     async def login(self, fingerprint: str, user_uuid: uuid.UUID) -> TokensExpire:
-        _, access = await sync_to_thread(
-            self._jwt.create, typ="access", sub=str(user_uuid)
-        )
-        expire, refresh = await sync_to_thread(
-            self._jwt.create, typ="refresh", sub=str(user_uuid)
+        (_, access), (expire, refresh) = await self._run(
+            "sign", self._jwt.create_pair, str(user_uuid)
         )
-        tokens = await self._cache.get_list(str(user_uuid))
-
-        if len(tokens) > DEFAULT_TOKENS_COUNT:
-            await self._cache.delete(str(user_uuid))
-
-        await self._cache.set_list(str(user_uuid), f"{fingerprint}::{refresh}")
+        await self._sessions.issue(user_uuid, fingerprint, refresh, expire)
 
         return TokensExpire(
             refresh_expire=expire,
@@ -63,32 +94,14 @@ class AuthService:
         refresh_token: str,
     ) -> TokensExpire:
         user_uuid = await self.verify_token(refresh_token, "refresh")
-        token_pairs = await self._cache.get_list(str(user_uuid))
-        verified = None
-        for pair in token_pairs:
-            data = pair.split("::")
-            if len(data) < 2:
-                await self._cache.delete(str(user_uuid))
-                raise ForbiddenError(
-                    "Broken separator, try to login again. Token is not valid anymore"
-                )
-            fp, cached_token, *_ = data
-            if fp == fingerprint and cached_token == refresh_token:
-                verified = pair
-                break
-
-        if not verified:
-            await self._cache.delete(str(user_uuid))
-            raise ForbiddenError("Token is not valid anymore")
-
-        await self._cache.discard(str(user_uuid), verified)
-        _, access = await sync_to_thread(
-            self._jwt.create, typ="access", sub=str(user_uuid)
+        (_, access), (expire, refresh) = await self._run(
+            "sign", self._jwt.create_pair, str(user_uuid)
         )
-        expire, refresh = await sync_to_thread(
-            self._jwt.create, typ="refresh", sub=str(user_uuid)
+        rotated = await self._sessions.rotate(
+            user_uuid, fingerprint, refresh_token, refresh, expire
         )
-        await self._cache.set_list(str(user_uuid), f"{fingerprint}::{refresh}")
+        if not rotated:
+            raise ForbiddenError("Token is not valid anymore")
 
         return TokensExpire(
             refresh_expire=expire,
@@ -101,16 +114,7 @@ class AuthService:
         user_uuid: uuid.UUID,
     ) -> bool:
         await self.verify_token(refresh_token, "refresh")
-        token_pairs = await self._cache.get_list(str(user_uuid))
-        for pair in token_pairs:
-            data = pair.split("::")
-            if len(data) < 2:
-                await self._cache.delete(str(user_uuid))
-                break
-            _, cached_token, *_ = data
-            if cached_token == refresh_token:
-                await self._cache.discard(str(user_uuid), pair)
-                break
+        await self._sessions.revoke(user_uuid, refresh_token)
 
         return True
 
@@ -119,7 +123,7 @@ class AuthService:
         token: str,
         token_type: TokenType,
     ) -> uuid.UUID:
-        payload = await sync_to_thread(self._jwt.verify_token, token)
+        payload = await self._verify_cached(token)
         actual_token_type = payload.get("type")
         user_id = payload.get("sub")
 
@@ -127,3 +131,42 @@ class AuthService:
             raise ForbiddenError("Invalid token")
 
         return uuid.UUID(user_id)
+
+    async def _verify_cached(self, token: str) -> dict[str, Any]:
+        digest = hashlib.blake2b(token.encode(), digest_size=32).digest()
+        if (payload := self._verified.get(digest)) is not None:
+            return payload
+
+        payload = await self._run("verify", self._jwt.verify_token, token)
+        if isinstance(exp := payload.get("exp"), int | float):
+            self._verified.set(digest, payload, ttl=exp - time.time())
+
+        return payload
+
+    async def _run[T](
+        self, operation: Operation, fn: Callable[..., T], *args: Any
+    ) -> T:
+        inline = self._inline[operation]
+        if inline:
+            return fn(*args)
+
+        loop = asyncio.get_running_loop()
+        if inline is None:
+            return await loop.run_in_executor(
+                self._executor, self._sample, operation, fn, *args
+            )
+
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _sample[T](self, operation: Operation, fn: Callable[..., T], *args: Any) -> T:
+        # "auto" times real calls on the thread path, failures are not sampled
+        started = time.perf_counter()
+        result = fn(*args)
+        samples = self._samples[operation]
+        samples.append(time.perf_counter() - started)
+        if self._inline[operation] is None and len(samples) >= CALIBRATION_SAMPLES:
+            self._inline[operation] = (
+                statistics.median(samples) <= self._inline_threshold
+            )
+
+        return result
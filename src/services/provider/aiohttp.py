@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import ssl
 import urllib.parse as parse
-from collections.abc import AsyncIterator, Iterable, Mapping
+from collections.abc import AsyncIterator, Hashable, Iterable, Mapping
+from dataclasses import dataclass
 from typing import (
     Any,
     Callable,
     Dict,
+    Final,
     List,
     Optional,
     Tuple,
@@ -20,6 +22,7 @@ from typing import (
 )
 
 import certifi
+import msgspec
 from aiohttp import (
     BasicAuth,
     ClientError,
@@ -31,15 +34,64 @@ from aiohttp import (
 from src.services.provider import errors as err
 from src.services.provider.base import DEFAULT_CHUNK_SIZE, AsyncProvider
 from src.services.provider.middleware.base import RequestMiddlewareType
+from src.services.provider.middleware.cache import AUTH_HEADERS
 from src.services.provider.middleware.error import RequestErrorMiddleware
-from src.services.provider.response import Response
+from src.services.provider.response import Response, StreamingResponse
 from src.services.provider.types import RequestMethodType
 
+DEFAULT_POOL_LIMIT: Final[int] = 100
+DEFAULT_POOL_LIMIT_PER_HOST: Final[int] = 0
+DEFAULT_KEEPALIVE_TIMEOUT: Final[float] = 15.0
+DEFAULT_DNS_CACHE_TTL: Final[int] = 300
+DIRECT_POOL: Final[str] = "direct"
+
 _ProxyBasic = Union[str, Tuple[str, BasicAuth]]
 _ProxyChain = Iterable[_ProxyBasic]
 _ProxyType = Union[_ProxyChain, _ProxyBasic]
 
 
+@dataclass(slots=True, frozen=True)
+class PoolStats:
+    acquired: int
+    idle: int
+    waiting: int
+    limit: int
+    limit_per_host: int
+
+
+def _proxy_key(proxy: Optional[_ProxyType]) -> Hashable:
+    if proxy is None or isinstance(proxy, str):
+        return proxy
+    return tuple(proxy)
+
+
+def _proxy_label(key: Hashable) -> str:
+    if key is None:
+        return DIRECT_POOL
+    if isinstance(key, str):
+        url = parse.urlsplit(key)
+        return f"{url.scheme}://{url.hostname}:{url.port}"
+
+    basics = cast(Tuple[Any, ...], key)
+    if len(basics) == 2 and isinstance(basics[1], BasicAuth):
+        return _proxy_label(basics[0])
+    return " -> ".join(_proxy_label(_proxy_key(basic)) for basic in basics)
+
+
+def _connector_stats(connector: TCPConnector) -> PoolStats:
+    # aiohttp exposes no public pool counters, read the internals defensively
+    acquired = getattr(connector, "_acquired", ())
+    conns = getattr(connector, "_conns", {})
+    waiters = getattr(connector, "_waiters", {})
+    return PoolStats(
+        acquired=len(acquired),
+        idle=sum(len(value) for value in conns.values()),
+        waiting=sum(len(value) for value in waiters.values()),
+        limit=connector.limit,
+        limit_per_host=connector.limit_per_host,
+    )
+
+
 def _retrieve_basic(basic: _ProxyBasic) -> Dict[str, Any]:
     from aiohttp_socks.utils import parse_proxy_url  # type: ignore
 
@@ -88,40 +140,57 @@ def _prepare_connector(
     return ChainProxyConnector, {"proxy_infos": infos}
 
 
-class ClientResponseAdapter(Response):
-    __slots__ = (
-        "_raw_content",
-        "_origin_response",
-    )
+def _decode_json(content: bytes, **kwargs: Any) -> Any:
+    encoding = kwargs.pop("encoding", "utf-8")
+    if encoding.lower().replace("-", "") != "utf8":
+        content = content.decode(encoding).encode()
+    try:
+        return msgspec.json.decode(content, type=kwargs.pop("type", Any), **kwargs)
+    except msgspec.DecodeError as e:
+        raise err.ClientDecodeError("Cannot decode response json", e, content) from e
 
-    def __init__(self, origin_response: ClientResponse, raw_content: bytes) -> None:
+
+def _check_size(
+    response: ClientResponse, received: int, max_body_size: Optional[int]
+) -> None:
+    if max_body_size is not None and received > max_body_size:
+        raise err.ResponseTooLargeError(max_body_size, str(response.url))
+
+
+async def _read_body(response: ClientResponse, max_body_size: Optional[int]) -> bytes:
+    if max_body_size is None:
+        return await response.read()
+
+    _check_size(response, response.content_length or 0, max_body_size)
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(DEFAULT_CHUNK_SIZE):
+        body += chunk
+        _check_size(response, len(body), max_body_size)
+
+    return bytes(body)
+
+
+class _ResponseAdapter(Response):
+    __slots__ = ("_origin_response",)
+
+    def __init__(self, origin_response: ClientResponse) -> None:
         self._origin_response = origin_response
-        self._raw_content = raw_content
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(url={self.url!r}, status={self.status!r})"
 
-    async def __aenter__(self) -> ClientResponseAdapter:
-        return self
-
     async def __aexit__(self, *args: Any) -> None:
         await self._origin_response.__aexit__(*args)
 
     async def json(self, **kwargs: Any) -> Any:
-        encoding = kwargs.pop("encoding", "utf-8")
-        stripped = self._raw_content.strip()
-        return json.loads(stripped.decode(encoding), **kwargs)
-
-    async def read(self) -> bytes:
-        # returns it unchanged
-        return self._raw_content
+        return _decode_json(await self.read(), **kwargs)
 
     async def text(self, **kwargs: Any) -> str:
         encoding, errors = (
             kwargs.get("encoding", "utf-8"),
             kwargs.get("errors", "strict"),
         )
-        return self._raw_content.decode(encoding=encoding, errors=errors)
+        return (await self.read()).decode(encoding=encoding, errors=errors)
 
     @property
     def status(self) -> int:
@@ -140,9 +209,65 @@ class ClientResponseAdapter(Response):
         return self._origin_response.cookies
 
 
-async def _to_response(response: ClientResponse) -> Response:
-    content = await response.read()
-    return ClientResponseAdapter(response, content)
+class ClientResponseAdapter(_ResponseAdapter):
+    __slots__ = ("_raw_content",)
+
+    def __init__(self, origin_response: ClientResponse, raw_content: bytes) -> None:
+        super().__init__(origin_response)
+        self._raw_content = raw_content
+
+    async def __aenter__(self) -> ClientResponseAdapter:
+        return self
+
+    async def read(self) -> bytes:
+        # returns it unchanged
+        return self._raw_content
+
+
+class StreamingResponseAdapter(_ResponseAdapter, StreamingResponse):
+    __slots__ = ("_max_body_size", "_content")
+
+    def __init__(
+        self, origin_response: ClientResponse, max_body_size: Optional[int] = None
+    ) -> None:
+        super().__init__(origin_response)
+        self._max_body_size = max_body_size
+        self._content: Optional[bytes] = None
+
+    async def __aenter__(self) -> StreamingResponseAdapter:
+        return self
+
+    async def read(self) -> bytes:
+        if self._content is None:
+            try:
+                self._content = await _read_body(
+                    self._origin_response, self._max_body_size
+                )
+            except TimeoutError as e:
+                raise err.NetworkError("Response read timeout error") from e
+            except ClientError as e:
+                raise err.NetworkError(f"{type(e).__name__} occurred") from e
+            finally:
+                self._origin_response.release()
+
+        return self._content
+
+    async def iter_chunks(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        response, received = self._origin_response, 0
+        try:
+            _check_size(response, response.content_length or 0, self._max_body_size)
+            async for chunk in response.content.iter_chunked(chunk_size):
+                received += len(chunk)
+                _check_size(response, received, self._max_body_size)
+                yield chunk
+        except TimeoutError as e:
+            raise err.NetworkError("Response read timeout error") from e
+        except ClientError as e:
+            raise err.NetworkError(f"{type(e).__name__} occurred") from e
+        finally:
+            response.release()
 
 
 class ParamsType(TypedDict, total=False):
@@ -158,11 +283,13 @@ class ParamsType(TypedDict, total=False):
 
 class AiohttpProvider(AsyncProvider):
     __slots__ = (
-        "_session",
-        "_connector_type",
-        "_connector_init",
-        "_should_reset_connector",
+        "_sessions",
+        "_connectors",
         "_proxy",
+        "_proxy_key",
+        "_pool",
+        "_close_grace",
+        "_max_body_size",
         "_kw",
     )
 
@@ -171,16 +298,34 @@ class AiohttpProvider(AsyncProvider):
         url: Optional[str] = None,
         proxy: Optional[_ProxyType] = None,
         middlewares: Tuple[RequestMiddlewareType, ...] = (RequestErrorMiddleware(),),
+        *,
+        limit: int = DEFAULT_POOL_LIMIT,
+        limit_per_host: int = DEFAULT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache: Optional[int] = DEFAULT_DNS_CACHE_TTL,
+        close_grace: float = 0.0,
+        max_body_size: Optional[int] = None,
         **kw: Unpack[ParamsType],
     ) -> None:
         super().__init__(url=url, middlewares=middlewares)
-        self._session: Optional[ClientSession] = None
-        self._connector_type: Type[TCPConnector] = TCPConnector
-        self._connector_init: Dict[str, Any] = {
-            "ssl": ssl.create_default_context(cafile=certifi.where())
+        self._sessions: Dict[Hashable, ClientSession] = {}
+        self._connectors: Dict[Hashable, Tuple[Type[TCPConnector], Dict[str, Any]]] = {
+            None: (
+                TCPConnector,
+                {"ssl": ssl.create_default_context(cafile=certifi.where())},
+            )
+        }
+        self._pool: Dict[str, Any] = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+            "use_dns_cache": ttl_dns_cache is not None,
         }
-        self._should_reset_connector = True
-        self._proxy = proxy
+        self._close_grace = close_grace
+        self._max_body_size = max_body_size
+        self._proxy: Optional[_ProxyType] = None
+        self._proxy_key: Hashable = None
         self._kw = kw
         if proxy is not None:
             try:
@@ -200,36 +345,64 @@ class AiohttpProvider(AsyncProvider):
         return self._proxy
 
     @proxy.setter
-    def proxy(self, value: _ProxyType) -> None:
+    def proxy(self, value: Optional[_ProxyType]) -> None:
         self._setup_proxy_connector(value)
-        self._should_reset_connector = True
 
     async def create_session(self) -> ClientSession:
-        if self._should_reset_connector:
-            await self.close_session()
-
-        if self._session is None or self._session.closed:
-            self._session = ClientSession(
-                connector=self._connector_type(**self._connector_init), **self._kw
+        session = self._sessions.get(self._proxy_key)
+        if session is None or session.closed:
+            connector_type, connector_init = self._connectors[self._proxy_key]
+            session = self._sessions[self._proxy_key] = ClientSession(
+                connector=connector_type(**connector_init, **self._pool), **self._kw
             )
-            self._should_reset_connector = False
 
-        return self._session
+        return session
 
     async def close_session(self) -> None:
-        if self._session is not None and not self._session.closed:
-            await self._session.close()
-            await asyncio.sleep(0.25)
+        sessions = [s for s in self._sessions.values() if not s.closed]
+        self._sessions.clear()
+        if not sessions:
+            return
+
+        await asyncio.gather(*(session.close() for session in sessions))
+        if self._close_grace > 0:
+            await asyncio.sleep(self._close_grace)
+
+    async def drop_proxy(self, proxy: _ProxyType) -> None:
+        key = _proxy_key(proxy)
+        if key == self._proxy_key:
+            raise ValueError("Cannot drop the proxy currently in use")
+
+        self._connectors.pop(key, None)
+        if (session := self._sessions.pop(key, None)) is not None:
+            await session.close()
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        return {
+            _proxy_label(key): _connector_stats(cast(TCPConnector, session.connector))
+            for key, session in self._sessions.items()
+            if not session.closed and session.connector is not None
+        }
 
     async def make_request(
         self, method: RequestMethodType, url_or_endpoint: str = "", **kw: Any
     ) -> Response:
+        stream = kw.pop("stream", False)
+        max_body_size = kw.pop("max_body_size", self._max_body_size)
         session = await self.create_session()
         try:
+            if stream:
+                response = await session.request(
+                    method=method, url=self._resolve_url(url_or_endpoint), **kw
+                )
+                return StreamingResponseAdapter(response, max_body_size)
+
             async with session.request(
                 method=method, url=self._resolve_url(url_or_endpoint), **kw
             ) as response:
-                return await _to_response(response)
+                return ClientResponseAdapter(
+                    response, await _read_body(response, max_body_size)
+                )
         except TimeoutError as e:
             raise err.NetworkError("Request timeout error") from e
         except ClientError as e:
@@ -250,18 +423,42 @@ class AiohttpProvider(AsyncProvider):
                 yield chunk
 
     def update_cookies(self, values: Mapping[str, Any]) -> None:
-        if not self._session:
-            raise TypeError("Cannot update headers while session is not connected")
-        elif self._session and self._session.closed:
-            raise TypeError("Cannot update headers while session disconnected")
-        self._session.cookie_jar.update_cookies(values)
+        for session in self._connected_sessions():
+            session.cookie_jar.update_cookies(values)
 
     def update_headers(self, values: Mapping[str, Any]) -> None:
-        if not self._session:
-            raise TypeError("Cannot update headers while session is not connected")
-        elif self._session and self._session.closed:
-            raise TypeError("Cannot update headers while session disconnected")
-        self._session.headers.update(values)
+        for session in self._connected_sessions():
+            session.headers.update(values)
+
+    def session_identity(self) -> str:
+        session = self._sessions.get(self._proxy_key)
+        headers: Mapping[str, Any]
+        cookies: List[Tuple[str, ...]]
+        if session is None or session.closed:
+            # the session is created lazily with these on the first request
+            headers = self._kw.get("headers") or {}
+            cookies = sorted(
+                (name, str(value))
+                for name, value in (self._kw.get("cookies") or {}).items()
+            )
+        else:
+            headers = session.headers
+            cookies = sorted(
+                (morsel.key, morsel.value, str(morsel["domain"]))
+                for morsel in session.cookie_jar
+            )
+
+        credentials = sorted(
+            (str(name).lower(), str(value))
+            for name, value in headers.items()
+            if str(name).lower() in AUTH_HEADERS
+        )
+        if not credentials and not cookies:
+            return ""
+
+        return hashlib.blake2b(
+            msgspec.json.encode([credentials, cookies], enc_hook=str), digest_size=16
+        ).hexdigest()
 
     def _resolve_url(self, url_or_endpoint: str) -> str:
         if parse.urlparse(url_or_endpoint).scheme != "":
@@ -273,6 +470,17 @@ class AiohttpProvider(AsyncProvider):
 
         return url
 
-    def _setup_proxy_connector(self, proxy: _ProxyType) -> None:
-        self._connector_type, self._connector_init = _prepare_connector(proxy)
-        self._proxy = proxy
+    def _connected_sessions(self) -> List[ClientSession]:
+        session = self._sessions.get(self._proxy_key)
+        if not session:
+            raise TypeError("Cannot update headers while session is not connected")
+        elif session.closed:
+            raise TypeError("Cannot update headers while session disconnected")
+
+        return [s for s in self._sessions.values() if not s.closed]
+
+    def _setup_proxy_connector(self, proxy: Optional[_ProxyType]) -> None:
+        key = _proxy_key(proxy)
+        if key not in self._connectors:
+            self._connectors[key] = _prepare_connector(cast(_ProxyType, proxy))
+        self._proxy, self._proxy_key = proxy, key
@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from typing import Any, Optional
 
 
@@ -32,9 +33,11 @@ class APIError(DetailedError):
         content: Any,
         message: str = "",
         url: Optional[str] = None,
+        headers: Optional[Mapping[str, Any]] = None,
     ) -> None:
         super().__init__(message=message, content=content, url=url)
         self.status_code = status_code
+        self.headers = headers or {}
 
     def __str__(self) -> str:
         original_message = super().__str__()
@@ -61,6 +64,39 @@ class NetworkError(BaseError):
     pass
 
 
+class CircuitOpenError(BaseError):
+    def __init__(self, host: str, retry_after: float) -> None:
+        self.host = host
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        host = self.host or "default host"
+        return f"Circuit for {host} is open, retry after {self.retry_after:.2f}s"
+
+
+class RateLimitedError(BaseError):
+    def __init__(self, key: str, retry_after: float) -> None:
+        self.key = key
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return (
+            f"Rate limit for {self.key} exceeded, retry after {self.retry_after:.2f}s"
+        )
+
+
+class ResponseTooLargeError(BaseError):
+    def __init__(self, limit: int, url: Optional[str] = None) -> None:
+        self.limit = limit
+        self.url = url
+
+    def __str__(self) -> str:
+        message = f"Response body exceeds {self.limit} bytes"
+        if self.url:
+            message += f" ({self.url})"
+        return message
+
+
 class BadRequestError(APIError):
     pass
 
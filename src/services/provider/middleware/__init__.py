@@ -2,9 +2,19 @@ from .base import (
     BaseRequestMiddleware,
     RequestMiddlewareType,
 )
+from .breaker import RequestCircuitBreakerMiddleware
+from .cache import (
+    MemoryResponseCache,
+    RedisResponseCache,
+    RequestCacheMiddleware,
+    ResponseCacheBackend,
+)
 from .error import RequestErrorMiddleware
+from .hedge import RequestHedgingMiddleware
 from .logging import RequestLoggingMiddleware
 from .manager import RequestMiddlewareManager
+from .ratelimit import RateLimit, RequestRateLimitMiddleware
+from .retry import RequestRetryMiddleware
 
 __all__ = (
     "BaseRequestMiddleware",
@@ -12,4 +22,13 @@ __all__ = (
     "RequestMiddlewareManager",
     "RequestLoggingMiddleware",
     "RequestErrorMiddleware",
+    "RequestRetryMiddleware",
+    "RequestHedgingMiddleware",
+    "RequestCircuitBreakerMiddleware",
+    "RequestCacheMiddleware",
+    "ResponseCacheBackend",
+    "MemoryResponseCache",
+    "RedisResponseCache",
+    "RateLimit",
+    "RequestRateLimitMiddleware",
 )
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import time
+import typing as t
+import urllib.parse as parse
+from collections import defaultdict
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import src.services.provider.errors as err
+from src.services.provider.middleware.base import (
+    BaseRequestMiddleware,
+    CallNextMiddlewareType,
+)
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+DEFAULT_FAILURE_THRESHOLD: t.Final[int] = 5
+DEFAULT_RECOVERY_TIMEOUT: t.Final[float] = 30.0
+
+CircuitState = t.Literal["closed", "open", "half_open"]
+
+
+@dataclass(slots=True)
+class _Circuit:
+    failures: int = 0
+    opened_at: t.Optional[float] = None
+    probing: bool = False
+
+
+class RequestCircuitBreakerMiddleware(BaseRequestMiddleware):
+    __slots__ = (
+        "failure_threshold",
+        "recovery_timeout",
+        "base_url",
+        "_circuits",
+    )
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        base_url: t.Optional[str] = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.base_url = base_url
+        self._circuits: defaultdict[str, _Circuit] = defaultdict(_Circuit)
+
+    def states(self) -> dict[str, CircuitState]:
+        return {host: self._state(circuit) for host, circuit in self._circuits.items()}
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        host = self._host(url_or_endpoint)
+        circuit = self._circuits[host]
+        if circuit.opened_at is not None:
+            elapsed = time.monotonic() - circuit.opened_at
+            if elapsed < self.recovery_timeout or circuit.probing:
+                raise err.CircuitOpenError(
+                    host, max(0.0, self.recovery_timeout - elapsed)
+                )
+            circuit.probing = True
+
+        try:
+            response = await call_next(
+                method=method, url_or_endpoint=url_or_endpoint, **kw
+            )
+            failed = response.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        except err.APIError as e:
+            self._record(circuit, e.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR)
+            raise
+        except err.NetworkError:
+            self._record(circuit, True)
+            raise
+        except BaseException:
+            # not an upstream verdict, let the next call probe again
+            circuit.probing = False
+            raise
+
+        self._record(circuit, failed)
+        return response
+
+    def _host(self, url_or_endpoint: str) -> str:
+        url = parse.urlsplit(url_or_endpoint)
+        if not url.netloc and self.base_url:
+            url = parse.urlsplit(parse.urljoin(self.base_url, url_or_endpoint))
+
+        # without a base url, relative endpoints get a circuit each
+        return url.netloc or url.path
+
+    def _record(self, circuit: _Circuit, failed: bool) -> None:
+        if not failed:
+            circuit.failures, circuit.opened_at = 0, None
+        else:
+            circuit.failures += 1
+            if circuit.probing or circuit.failures >= self.failure_threshold:
+                circuit.opened_at = time.monotonic()
+        circuit.probing = False
+
+    def _state(self, circuit: _Circuit) -> CircuitState:
+        if circuit.opened_at is None:
+            return "closed"
+        if circuit.probing or (
+            time.monotonic() - circuit.opened_at >= self.recovery_timeout
+        ):
+            return "half_open"
+        return "open"
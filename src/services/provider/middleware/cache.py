@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from types import TracebackType
+
+import msgspec
+from multidict import CIMultiDict, CIMultiDictProxy
+
+import src.services.provider.errors as err
+from src.common.tools.cache import LRUCache
+from src.services.cache.redis import RedisCache
+from src.services.provider.middleware.base import (
+    BaseRequestMiddleware,
+    CallNextMiddlewareType,
+)
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+DEFAULT_RESPONSE_CACHE_SIZE: t.Final[int] = 1024
+DEFAULT_STALE_TTL: t.Final[float] = 3600.0
+CACHEABLE_METHODS: t.Final[frozenset[str]] = frozenset({"GET", "HEAD"})
+CACHEABLE_STATUSES: t.Final[frozenset[int]] = frozenset(
+    {HTTPStatus.OK, HTTPStatus.NON_AUTHORITATIVE_INFORMATION}
+)
+AUTH_HEADERS: t.Final[frozenset[str]] = frozenset(
+    {"authorization", "proxy-authorization", "cookie", "x-api-key"}
+)
+
+
+class CachedEntry(msgspec.Struct, array_like=True):
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    expires_at: float
+    etag: t.Optional[str] = None
+    last_modified: t.Optional[str] = None
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCacheBackend(t.Protocol):
+    # shared backends are visible to every worker, RFC 9111 section 3.5 applies
+    shared: bool
+
+    async def get(self, key: str) -> t.Optional[CachedEntry]: ...
+
+    async def set(self, key: str, entry: CachedEntry, ttl: float) -> None: ...
+
+
+class MemoryResponseCache:
+    __slots__ = ("_cache",)
+
+    shared = False
+
+    def __init__(self, maxsize: int = DEFAULT_RESPONSE_CACHE_SIZE) -> None:
+        self._cache: LRUCache[str, CachedEntry] = LRUCache(maxsize)
+
+    async def get(self, key: str) -> t.Optional[CachedEntry]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, entry: CachedEntry, ttl: float) -> None:
+        self._cache.set(key, entry, ttl=ttl)
+
+
+class RedisResponseCache:
+    __slots__ = ("_redis", "_namespace")
+
+    shared = True
+
+    _encoder = msgspec.msgpack.Encoder()
+    _decoder = msgspec.msgpack.Decoder(CachedEntry)
+
+    def __init__(self, redis: RedisCache, namespace: str = "http") -> None:
+        self._redis = redis
+        self._namespace = namespace
+
+    async def get(self, key: str) -> t.Optional[CachedEntry]:
+        raw = await self._redis.get_bytes(f"{self._namespace}:{key}")
+        if raw is None:
+            return None
+        try:
+            return self._decoder.decode(raw)
+        except msgspec.DecodeError:
+            return None
+
+    async def set(self, key: str, entry: CachedEntry, ttl: float) -> None:
+        await self._redis.set(
+            f"{self._namespace}:{key}",
+            self._encoder.encode(entry),
+            expire=max(1, int(ttl)),
+        )
+
+
+class CachedResponse(Response):
+    __slots__ = ("_entry", "_headers")
+
+    def __init__(self, entry: CachedEntry) -> None:
+        self._entry = entry
+        self._headers = CIMultiDictProxy(CIMultiDict(entry.headers))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(url={self.url!r}, status={self.status!r})"
+
+    async def __aenter__(self) -> CachedResponse:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[type[BaseException]],
+        exc_value: t.Optional[BaseException],
+        traceback: t.Optional[TracebackType],
+    ) -> None:
+        return None
+
+    async def json(self, **kwargs: t.Any) -> t.Any:
+        try:
+            return msgspec.json.decode(self._entry.body, type=kwargs.get("type", t.Any))
+        except msgspec.DecodeError as e:
+            raise err.ClientDecodeError(
+                "Cannot decode response json", e, self._entry.body
+            ) from e
+
+    async def read(self) -> bytes:
+        return self._entry.body
+
+    async def text(self, **kwargs: t.Any) -> str:
+        return self._entry.body.decode(
+            encoding=kwargs.get("encoding", "utf-8"),
+            errors=kwargs.get("errors", "strict"),
+        )
+
+    @property
+    def status(self) -> int:
+        return self._entry.status
+
+    @property
+    def url(self) -> str:
+        return self._entry.url
+
+    @property
+    def headers(self) -> t.Mapping[str, t.Any]:
+        return self._headers
+
+    @property
+    def cookies(self) -> t.Mapping[str, t.Any]:
+        return {}
+
+
+def _cache_control(headers: t.Mapping[str, t.Any]) -> dict[str, t.Optional[str]]:
+    directives: dict[str, t.Optional[str]] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    return directives
+
+
+def _freshness(
+    headers: t.Mapping[str, t.Any], now: float, shared: bool
+) -> t.Optional[float]:
+    directives = _cache_control(headers)
+    if "no-cache" in directives:
+        return 0.0
+
+    try:
+        age = float(headers.get("Age") or 0)
+        if shared and (s_maxage := directives.get("s-maxage")) is not None:
+            return float(s_maxage) - age
+        if (max_age := directives.get("max-age")) is not None:
+            return float(max_age) - age
+    except ValueError:
+        return 0.0
+
+    if expires := headers.get("Expires"):
+        try:
+            return parsedate_to_datetime(expires).timestamp() - now
+        except (TypeError, ValueError):
+            return 0.0
+
+    return None
+
+
+def _authenticated(kw: t.Mapping[str, t.Any]) -> bool:
+    headers = kw.get("headers") or {}
+    return bool(kw.get("cookies")) or any(
+        str(name).lower() in AUTH_HEADERS for name in headers
+    )
+
+
+class RequestCacheMiddleware(BaseRequestMiddleware):
+    __slots__ = ("backend", "stale_ttl", "identity", "_inflight")
+
+    def __init__(
+        self,
+        backend: t.Optional[ResponseCacheBackend] = None,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        identity: t.Optional[t.Callable[[], str]] = None,
+    ) -> None:
+        self.backend = backend or MemoryResponseCache()
+        self.stale_ttl = stale_ttl
+        # digest of the credentials the provider session adds to every request
+        self.identity = identity
+        self._inflight: dict[str, asyncio.Task[CachedEntry]] = {}
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        request_cc = _cache_control(kw.get("headers") or {})
+        if (
+            method not in CACHEABLE_METHODS
+            or kw.get("stream")
+            or "no-store" in request_cc
+        ):
+            return await call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+
+        identity = self.identity() if self.identity is not None else ""
+        authenticated = bool(identity) or _authenticated(kw)
+        key = self._key(method, url_or_endpoint, identity, kw)
+        entry = None if "no-cache" in request_cc else await self.backend.get(key)
+        if entry is not None and entry.fresh(time.time()):
+            return CachedResponse(entry)
+
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.ensure_future(
+                self._load(
+                    key, entry, authenticated, call_next, method, url_or_endpoint, kw
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return CachedResponse(await asyncio.shield(task))
+
+    async def _load(
+        self,
+        key: str,
+        entry: t.Optional[CachedEntry],
+        authenticated: bool,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        kw: dict[str, t.Any],
+    ) -> CachedEntry:
+        headers = dict(kw.get("headers") or {})
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await call_next(
+                method=method,
+                url_or_endpoint=url_or_endpoint,
+                **(kw | {"headers": headers}),
+            )
+        except err.APIError as e:
+            if entry is None or e.status_code != HTTPStatus.NOT_MODIFIED:
+                raise
+            return await self._revalidated(key, entry, authenticated, e.headers)
+
+        async with response:
+            if entry is not None and response.status == HTTPStatus.NOT_MODIFIED:
+                return await self._revalidated(
+                    key, entry, authenticated, response.headers
+                )
+
+            fresh = CachedEntry(
+                url=response.url,
+                status=response.status,
+                headers=[(str(k), str(v)) for k, v in response.headers.items()],
+                body=await response.read(),
+                expires_at=0.0,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        if fresh.status in CACHEABLE_STATUSES:
+            await self._store(key, fresh, authenticated, response.headers)
+        return fresh
+
+    async def _revalidated(
+        self,
+        key: str,
+        entry: CachedEntry,
+        authenticated: bool,
+        headers: t.Mapping[str, t.Any],
+    ) -> CachedEntry:
+        entry = msgspec.structs.replace(
+            entry,
+            etag=headers.get("ETag") or entry.etag,
+            last_modified=headers.get("Last-Modified") or entry.last_modified,
+        )
+        await self._store(key, entry, authenticated, headers)
+        return entry
+
+    async def _store(
+        self,
+        key: str,
+        entry: CachedEntry,
+        authenticated: bool,
+        headers: t.Mapping[str, t.Any],
+    ) -> None:
+        directives = _cache_control(headers)
+        if "no-store" in directives or headers.get("Vary", "").strip() == "*":
+            return
+
+        shared = self.backend.shared
+        if shared and (
+            "private" in directives
+            or (
+                authenticated
+                and not directives.keys() & {"public", "s-maxage", "must-revalidate"}
+            )
+        ):
+            return
+
+        now = time.time()
+        freshness = _freshness(headers, now, shared)
+        if freshness is None and not entry.revalidatable():
+            return
+
+        freshness = max(0.0, freshness or 0.0)
+        entry.expires_at = now + freshness
+        ttl = freshness + (self.stale_ttl if entry.revalidatable() else 0.0)
+        if ttl > 0:
+            await self.backend.set(key, entry, ttl)
+
+    @staticmethod
+    def _key(
+        method: str, url_or_endpoint: str, identity: str, kw: t.Mapping[str, t.Any]
+    ) -> str:
+        request = msgspec.json.encode(
+            [
+                method,
+                url_or_endpoint,
+                identity,
+                kw.get("params"),
+                sorted((kw.get("headers") or {}).items()),
+                sorted((kw.get("cookies") or {}).items()),
+            ],
+            enc_hook=str,
+        )
+        return hashlib.blake2b(request, digest_size=16).hexdigest()
@@ -28,6 +28,7 @@ async def _check_response(response: Response) -> Response:
             content=content,
             message="Too many requests",
             url=url,
+            headers=response.headers,
         )
     if status_code == HTTPStatus.NOT_FOUND:
         raise err.NotFoundError(
@@ -67,7 +68,11 @@ async def _check_response(response: Response) -> Response:
         )
 
     raise err.APIError(
-        status_code=status_code, content=content, message="Unknown Error", url=url
+        status_code=status_code,
+        content=content,
+        message="Unknown Error",
+        url=url,
+        headers=response.headers,
     )
 
 
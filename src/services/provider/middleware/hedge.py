@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import typing as t
+from collections import deque
+
+from src.services.provider.middleware.base import (
+    BaseRequestMiddleware,
+    CallNextMiddlewareType,
+)
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+DEFAULT_HEDGE_DELAY: t.Final[float] = 0.1
+DEFAULT_HEDGE_MIN_DELAY: t.Final[float] = 0.01
+DEFAULT_HEDGE_QUANTILE: t.Final[float] = 0.95
+DEFAULT_HEDGE_WINDOW: t.Final[int] = 128
+DEFAULT_MAX_HEDGES: t.Final[int] = 1
+
+
+class RequestHedgingMiddleware(BaseRequestMiddleware):
+    __slots__ = (
+        "delay",
+        "min_delay",
+        "quantile",
+        "max_hedges",
+        "_latencies",
+    )
+
+    def __init__(
+        self,
+        delay: t.Optional[float] = None,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        quantile: float = DEFAULT_HEDGE_QUANTILE,
+        window: int = DEFAULT_HEDGE_WINDOW,
+        max_hedges: int = DEFAULT_MAX_HEDGES,
+    ) -> None:
+        self.delay = delay
+        self.min_delay = min_delay
+        self.quantile = quantile
+        self.max_hedges = max_hedges
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def hedge_delay(self) -> float:
+        if self.delay is not None:
+            return self.delay
+        if len(self._latencies) < t.cast(int, self._latencies.maxlen) // 4:
+            return DEFAULT_HEDGE_DELAY
+
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.quantile))
+        return max(self.min_delay, latencies[index])
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        # streamed bodies stay bound to their connection, losers cannot be dropped
+        if method != "GET" or kw.get("stream"):
+            return await call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+
+        def launch() -> asyncio.Task[Response]:
+            return asyncio.ensure_future(
+                call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+            )
+
+        started = time.perf_counter()
+        pending = {launch()}
+        launched = 1
+        delay = self.hedge_delay()
+        error: t.Optional[BaseException] = None
+        try:
+            while pending:
+                can_hedge = launched <= self.max_hedges
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if (error := task.exception()) is None:
+                        self._latencies.append(time.perf_counter() - started)
+                        return task.result()
+
+                if can_hedge and (not done or not pending):
+                    pending.add(launch())
+                    launched += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise t.cast(BaseException, error)
@@ -8,20 +8,27 @@ from src.services.provider.middleware.base import (
 
 
 class RequestMiddlewareManager(t.Sequence[RequestMiddlewareType]):
+    __slots__ = ("_middlewares", "_chain")
+
     def __init__(self, *middlewares: RequestMiddlewareType) -> None:
         self._middlewares: t.List[RequestMiddlewareType] = list(middlewares)
+        self._chain: t.Optional[
+            t.Tuple[CallNextMiddlewareType, CallNextMiddlewareType]
+        ] = None
 
     def register(
         self,
         middleware: RequestMiddlewareType,
     ) -> RequestMiddlewareType:
         self._middlewares.append(middleware)
+        self._chain = None
         return middleware
 
     __call__ = register
 
     def unregister(self, middleware: RequestMiddlewareType) -> None:
         self._middlewares.remove(middleware)
+        self._chain = None
 
     @t.overload
     def __getitem__(self, item: int) -> RequestMiddlewareType: ...
@@ -38,8 +45,17 @@ class RequestMiddlewareManager(t.Sequence[RequestMiddlewareType]):
     def wrap_middleware(
         self, callback: CallNextMiddlewareType, **kw: t.Any
     ) -> CallNextMiddlewareType:
-        middleware = partial(callback, **kw)
+        if kw:
+            return self._compose(partial(callback, **kw))
+
+        # bound methods are recreated on every access but compare equal
+        if self._chain is None or self._chain[0] != callback:
+            self._chain = (callback, self._compose(callback))
+
+        return self._chain[1]
 
+    def _compose(self, callback: CallNextMiddlewareType) -> CallNextMiddlewareType:
+        middleware = callback
         for m in reversed(self._middlewares):
             middleware = partial(m, middleware)
 
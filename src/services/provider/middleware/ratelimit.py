@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import typing as t
+import urllib.parse as parse
+from dataclasses import dataclass, field
+
+import src.services.provider.errors as err
+from src.common.logger import log
+from src.services.cache.ratelimit import RedisRateLimiter
+from src.services.provider.middleware.base import (
+    BaseRequestMiddleware,
+    CallNextMiddlewareType,
+)
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+DEFAULT_MAX_WAIT: t.Final[float] = 5.0
+DEFAULT_LEASE: t.Final[float] = 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class RateLimit:
+    rate: float
+    capacity: t.Optional[float] = None
+    prefetch: int = 1
+
+
+@dataclass(slots=True)
+class _Lease:
+    limit: RateLimit
+    tokens: int = 0
+    expires_at: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    timer: t.Optional[asyncio.TimerHandle] = None
+
+    @property
+    def capacity(self) -> float:
+        return self.limit.capacity or max(self.limit.rate, self.limit.prefetch)
+
+
+class RequestRateLimitMiddleware(BaseRequestMiddleware):
+    __slots__ = (
+        "limiter",
+        "limits",
+        "default",
+        "max_wait",
+        "lease",
+        "base_url",
+        "_leases",
+        "_tasks",
+    )
+
+    def __init__(
+        self,
+        limiter: RedisRateLimiter,
+        limits: t.Mapping[str, RateLimit],
+        default: t.Optional[RateLimit] = None,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        lease: float = DEFAULT_LEASE,
+        base_url: t.Optional[str] = None,
+    ) -> None:
+        self.limiter = limiter
+        self.limits = limits
+        self.default = default
+        self.max_wait = max_wait
+        self.lease = lease
+        self.base_url = base_url
+        self._leases: dict[str, _Lease] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        if (key := self._resolve(url_or_endpoint)) is not None:
+            await self._acquire(key)
+
+        return await call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+
+    def _resolve(self, url_or_endpoint: str) -> t.Optional[str]:
+        url = parse.urlsplit(url_or_endpoint)
+        if not url.netloc and self.base_url:
+            url = parse.urlsplit(parse.urljoin(self.base_url, url_or_endpoint))
+
+        for key in (f"{url.netloc}{url.path}", url.netloc):
+            if key in self.limits:
+                return key
+        return "*" if self.default is not None else None
+
+    async def _acquire(self, key: str) -> None:
+        if (lease := self._leases.get(key)) is None:
+            limit = self.limits.get(key) or t.cast(RateLimit, self.default)
+            lease = self._leases[key] = _Lease(limit)
+
+        if self._take_local(lease):
+            return
+
+        limit = lease.limit
+        deadline = time.monotonic() + self.max_wait
+        async with lease.lock:
+            while not self._take_local(lease):
+                granted, retry_after = await self.limiter.take(
+                    key, limit.rate, lease.capacity, limit.prefetch
+                )
+                if granted:
+                    self._give_back(key, lease)
+                    lease.tokens = granted
+                    lease.expires_at = time.monotonic() + self.lease
+                    if granted > 1:
+                        self._schedule_give_back(key, lease)
+                    continue
+                if time.monotonic() + retry_after > deadline:
+                    raise err.RateLimitedError(key, retry_after)
+                await asyncio.sleep(retry_after)
+
+    @staticmethod
+    def _take_local(lease: _Lease) -> bool:
+        if lease.tokens <= 0 or lease.expires_at <= time.monotonic():
+            return False
+
+        lease.tokens -= 1
+        return True
+
+    def _schedule_give_back(self, key: str, lease: _Lease) -> None:
+        # prefetched tokens left at expiry go back to the shared bucket
+        lease.timer = asyncio.get_running_loop().call_later(
+            self.lease, self._give_back, key, lease
+        )
+
+    def _give_back(self, key: str, lease: _Lease) -> None:
+        if lease.timer is not None:
+            lease.timer.cancel()
+            lease.timer = None
+        if lease.tokens <= 0:
+            return
+
+        count, lease.tokens = lease.tokens, 0
+        task = asyncio.get_running_loop().create_task(
+            self._return_tokens(key, lease.capacity, count)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _return_tokens(self, key: str, capacity: float, count: int) -> None:
+        try:
+            await self.limiter.give_back(key, capacity, count)
+        except Exception as e:
+            log.warning(
+                "Error returning %s rate limit tokens for %s: %s", count, key, e
+            )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+import src.services.provider.errors as err
+from src.services.provider.middleware.base import (
+    BaseRequestMiddleware,
+    CallNextMiddlewareType,
+)
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+DEFAULT_RETRY_ATTEMPTS: t.Final[int] = 3
+DEFAULT_RETRY_BACKOFF: t.Final[float] = 0.5
+DEFAULT_RETRY_MAX_BACKOFF: t.Final[float] = 30.0
+DEFAULT_MAX_RETRY_AFTER: t.Final[float] = 60.0
+IDEMPOTENT_METHODS: t.Final[frozenset[str]] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+RETRY_STATUSES: t.Final[frozenset[int]] = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+def retry_after(headers: t.Mapping[str, t.Any]) -> t.Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestRetryMiddleware(BaseRequestMiddleware):
+    __slots__ = (
+        "attempts",
+        "backoff",
+        "max_backoff",
+        "max_retry_after",
+        "methods",
+        "statuses",
+    )
+
+    def __init__(
+        self,
+        attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        backoff: float = DEFAULT_RETRY_BACKOFF,
+        max_backoff: float = DEFAULT_RETRY_MAX_BACKOFF,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        methods: t.AbstractSet[str] = IDEMPOTENT_METHODS,
+        statuses: t.AbstractSet[int] = RETRY_STATUSES,
+    ) -> None:
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.methods = methods
+        self.statuses = statuses
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            last = attempt >= self.attempts
+            try:
+                response = await call_next(
+                    method=method, url_or_endpoint=url_or_endpoint, **kw
+                )
+            except err.APIError as e:
+                delay = self._delay(method, e.status_code, e.headers, attempt)
+                if last or delay is None:
+                    raise
+            except err.NetworkError:
+                if last or method not in self.methods:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                delay = self._delay(method, response.status, response.headers, attempt)
+                if last or delay is None:
+                    return response
+                await response.__aexit__(None, None, None)
+
+            await asyncio.sleep(delay)
+
+    def _delay(
+        self,
+        method: RequestMethodType,
+        status: int,
+        headers: t.Mapping[str, t.Any],
+        attempt: int,
+    ) -> t.Optional[float]:
+        if status not in self.statuses:
+            return None
+        # 429 means the request was rejected before processing
+        if status != HTTPStatus.TOO_MANY_REQUESTS and method not in self.methods:
+            return None
+
+        if (delay := retry_after(headers)) is None:
+            return self._backoff(attempt)
+        return delay if delay <= self.max_retry_after else None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
@@ -1,4 +1,4 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from types import TracebackType
 from typing import (
     Any,
@@ -19,6 +19,10 @@ class BytesResponse(Protocol):
     async def read(self) -> bytes: ...
 
 
+class ChunksResponse(Protocol):
+    def iter_chunks(self, chunk_size: int = ...) -> AsyncIterator[bytes]: ...
+
+
 class UrlResponse(Protocol):
     @property
     def url(self) -> str: ...
@@ -61,3 +65,7 @@ class Response(
     ContextManagerResponse,
 ):
     pass
+
+
+class StreamingResponse(Response, ChunksResponse):
+    pass
@@ -1,8 +1,14 @@
-from dataclasses import asdict
-from typing import Any, Dict, Literal
+import asyncio
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, replace
+from typing import Any, Dict, Final, Literal, Optional
 
-from argon2 import Parameters, PasswordHasher
-from argon2.exceptions import VerificationError, VerifyMismatchError
+from argon2 import Parameters, PasswordHasher, extract_parameters
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+from argon2.low_level import ARGON2_VERSION
 from argon2.profiles import (
     CHEAPEST,
     PRE_21_2,
@@ -10,7 +16,11 @@ from argon2.profiles import (
     RFC_9106_LOW_MEMORY,
 )
 
-from src.services.interfaces.hasher import AbstractHasher
+from src.common.logger import log
+from src.common.tools.cache import default_key_builder
+from src.common.tools.executor import DEFAULT_MAX_WORKERS, BoundedExecutor
+from src.services.cache.redis import RedisCache
+from src.services.interfaces.hasher import AbstractAsyncHasher, AbstractHasher
 
 ProfileType = Literal[
     "RFC_9106_LOW_MEMORY", "RFC_9106_HIGH_MEMORY", "CHEAPEST", "PRE_21_2", "DEFAULT"
@@ -22,6 +32,15 @@ PROFILES: Dict[str, Parameters] = {
     "PRE_21_2": PRE_21_2,
 }
 
+MIN_MEMORY_COST: Final[int] = 19 * 1024
+MAX_TIME_COST: Final[int] = 10
+CALIBRATION_ROUNDS: Final[int] = 3
+CALIBRATION_PASSWORD: Final[str] = "calibration-password"
+CALIBRATION_KEY: Final[str] = "argon2.calibration"
+CALIBRATION_LOCK_TTL: Final[int] = 60
+CALIBRATION_POLL_INTERVAL: Final[float] = 0.1
+CALIBRATION_TTL: Final[int] = 24 * 60 * 60
+
 
 class Argon2(AbstractHasher):
     __slots__ = ("_hasher",)
@@ -38,6 +57,132 @@ class Argon2(AbstractHasher):
         except (VerificationError, VerifyMismatchError):
             return False
 
+    def needs_rehash(self, hashed: str) -> bool:
+        try:
+            current = extract_parameters(hashed)
+        except InvalidHashError:
+            return True
+
+        # only upgrade weaker hashes, so workers never rewrite each other's
+        hasher = self._hasher
+        return (
+            current.type != hasher.type
+            or current.version < ARGON2_VERSION
+            or current.time_cost < hasher.time_cost
+            or current.memory_cost < hasher.memory_cost
+            or current.hash_len < hasher.hash_len
+        )
+
+
+class AsyncArgon2(AbstractAsyncHasher):
+    __slots__ = ("_hasher", "_executor")
+
+    def __init__(self, hasher: Argon2, executor: BoundedExecutor) -> None:
+        self._hasher = hasher
+        self._executor = executor
+
+    @property
+    def executor(self) -> BoundedExecutor:
+        return self._executor
+
+    async def hash_password(self, plain: str) -> str:
+        return await self._executor.run(self._hasher.hash_password, plain)
+
+    async def verify_password(self, hashed: str, plain: str) -> bool:
+        return await self._executor.run(self._hasher.verify_password, hashed, plain)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return self._hasher.needs_rehash(hashed)
+
+    def configure(self, parameters: Parameters) -> None:
+        self._hasher = Argon2(PasswordHasher.from_parameters(parameters))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def _measure(parameters: Parameters, rounds: int = CALIBRATION_ROUNDS) -> float:
+    hasher = PasswordHasher.from_parameters(parameters)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash(CALIBRATION_PASSWORD)
+        timings.append(time.perf_counter() - started)
+
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    target_ms: float,
+    memory_budget_kib: int,
+    concurrency: int = 1,
+    base: Parameters = RFC_9106_LOW_MEMORY,
+) -> Parameters:
+    target = target_ms / 1000
+    memory_cost = max(MIN_MEMORY_COST, memory_budget_kib // max(concurrency, 1))
+    parameters = replace(
+        base,
+        time_cost=1,
+        memory_cost=min(memory_cost, base.memory_cost),
+        parallelism=1,
+    )
+
+    while (
+        _measure(parameters) > target and parameters.memory_cost // 2 >= MIN_MEMORY_COST
+    ):
+        parameters = replace(parameters, memory_cost=parameters.memory_cost // 2)
+
+    while parameters.time_cost < MAX_TIME_COST:
+        candidate = replace(parameters, time_cost=parameters.time_cost + 1)
+        if _measure(candidate) > target:
+            break
+        parameters = candidate
+
+    log.info(
+        "Calibrated argon2: time_cost=%s memory_cost=%sKiB parallelism=%s",
+        parameters.time_cost,
+        parameters.memory_cost,
+        parameters.parallelism,
+    )
+    return parameters
+
+
+async def shared_calibrate_argon2(
+    redis: RedisCache,
+    target_ms: float,
+    memory_budget_kib: int,
+    concurrency: int = 1,
+) -> Parameters:
+    # workers on the same hardware class share one result, others calibrate
+    key = default_key_builder(
+        CALIBRATION_KEY,
+        platform.machine(),
+        str(os.cpu_count()),
+        f"{target_ms:g}",
+        str(memory_budget_kib),
+        str(concurrency),
+    )
+    lock = default_key_builder(key, "lock")
+    while (stored := await redis.get(key)) is None:
+        if not await redis.set(lock, 1, expire=CALIBRATION_LOCK_TTL, nx=True):
+            await asyncio.sleep(CALIBRATION_POLL_INTERVAL)
+            continue
+
+        try:
+            parameters = await asyncio.to_thread(
+                calibrate_argon2, target_ms, memory_budget_kib, concurrency
+            )
+            # a sample hash carries the parameters in the standard encoding
+            sample = PasswordHasher.from_parameters(parameters).hash(
+                CALIBRATION_PASSWORD
+            )
+            await redis.set(key, sample, expire=CALIBRATION_TTL)
+            return parameters
+        finally:
+            await redis.delete(lock)
+
+    return extract_parameters(stored)
+
 
 def get_argon2_hasher(profile: ProfileType = "DEFAULT", **kwargs: Any) -> Argon2:
     if profile == "DEFAULT":  # only need if something gonna change in argon2 module
@@ -47,3 +192,14 @@ def get_argon2_hasher(profile: ProfileType = "DEFAULT", **kwargs: Any) -> Argon2
         kw.pop("version", None)
 
     return Argon2(PasswordHasher(**(kw | kwargs)))
+
+
+def get_async_argon2_hasher(
+    profile: ProfileType = "DEFAULT",
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    **kwargs: Any,
+) -> AsyncArgon2:
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    executor = BoundedExecutor(max_workers, max_pending, thread_name_prefix="argon2")
+    return AsyncArgon2(get_argon2_hasher(profile, **kwargs), executor)
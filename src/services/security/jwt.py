@@ -1,25 +1,55 @@
 import base64
+import binascii
+import time
 from datetime import UTC, datetime, timedelta
 from typing import (
     Any,
     Literal,
+    NamedTuple,
     Optional,
-    cast,
 )
 
-import jwt
+import msgspec
+from jwt.algorithms import Algorithm, get_default_algorithms
 
 from src.common.exceptions import ConflictError, UnAuthorizedError
 from src.settings.core import CipherSettings
 
 TokenType = Literal["access", "refresh"]
 
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder(dict[str, Any])
+
+
+def _b64encode(value: bytes) -> bytes:
+    return base64.urlsafe_b64encode(value).rstrip(b"=")
+
+
+def _b64decode(value: bytes) -> bytes:
+    return base64.urlsafe_b64decode(value + b"=" * (-len(value) % 4))
+
+
+class _Key(NamedTuple):
+    name: str
+    algorithm: Algorithm
+    verifying: Any
+    signing: Any
+
 
 class JWT:
-    __slots__ = ("_settings",)
+    __slots__ = ("_settings", "_active", "_keys", "_header")
 
     def __init__(self, settings: CipherSettings) -> None:
         self._settings = settings
+        self._active = settings.active_key or None
+        self._keys: dict[Optional[str], _Key] = {}
+
+        header: dict[str, Any] = {"alg": settings.algorithm, "typ": "JWT"}
+        if self._active is not None:
+            if (active := settings.keys.get(self._active)) is None:
+                raise ValueError(f"Unknown active key: {self._active}")
+            header |= {"alg": active.algorithm, "kid": self._active}
+        self._header = _b64encode(_encoder.encode(header))
 
     def create(
         self,
@@ -43,30 +73,95 @@ class JWT:
             raise ConflictError("Invalid expiration delta was provided")
 
         to_encode = {
-            "exp": expire,
+            "exp": int(expire.timestamp()),
             "sub": sub,
-            "iat": now,
+            "iat": int(now.timestamp()),
             "type": typ,
         }
-        try:
-            token = jwt.encode(
-                to_encode | kw,
-                base64.b64decode(self._settings.secret_key),
-                self._settings.algorithm,
-            )
-        except jwt.PyJWTError as e:
-            raise UnAuthorizedError("Token is expired") from e
+        return expire, self._encode(to_encode | kw)
 
-        return expire, token
+    def create_pair(
+        self, sub: str, **kw: Any
+    ) -> tuple[tuple[datetime, str], tuple[datetime, str]]:
+        return self.create("access", sub, **kw), self.create("refresh", sub, **kw)
 
     def verify_token(self, token: str) -> dict[str, Any]:
         try:
-            result = jwt.decode(
-                token,
-                base64.b64decode(self._settings.public_key),
-                [self._settings.algorithm],
-            )
-        except jwt.PyJWTError as e:
+            header, payload, signature = token.encode().split(b".")
+            headers = _decoder.decode(_b64decode(header))
+            kid = headers.get("kid")
+            if kid is not None and not isinstance(kid, str):
+                raise UnAuthorizedError("Token is invalid or expired")
+
+            key = self._key(kid)
+            if headers.get("alg") != key.name:
+                raise UnAuthorizedError("Token is invalid or expired")
+            if not key.algorithm.verify(
+                header + b"." + payload, key.verifying, _b64decode(signature)
+            ):
+                raise UnAuthorizedError("Token is invalid or expired")
+
+            result = _decoder.decode(_b64decode(payload))
+        except (ValueError, binascii.Error, msgspec.DecodeError) as e:
             raise UnAuthorizedError("Token is invalid or expired") from e
 
-        return cast(dict[str, Any], result)
+        now = time.time()
+        exp, nbf = result.get("exp"), result.get("nbf")
+        if not isinstance(exp, int | float) or exp <= now:
+            raise UnAuthorizedError("Token is invalid or expired")
+        if nbf is not None and (not isinstance(nbf, int | float) or nbf > now):
+            raise UnAuthorizedError("Token is invalid or expired")
+
+        return result
+
+    def _encode(self, payload: dict[str, Any]) -> str:
+        key = self._key(self._active)
+        if key.signing is None:
+            raise UnAuthorizedError("Token cannot be signed")
+
+        signing_input = self._header + b"." + _b64encode(_encoder.encode(payload))
+        try:
+            signature = key.algorithm.sign(signing_input, key.signing)
+        except Exception as e:
+            raise UnAuthorizedError("Token cannot be signed") from e
+
+        return (signing_input + b"." + _b64encode(signature)).decode()
+
+    def _key(self, kid: Optional[str]) -> _Key:
+        if (key := self._keys.get(kid)) is None:
+            key = self._keys[kid] = self._load_key(kid)
+
+        return key
+
+    def _load_key(self, kid: Optional[str]) -> _Key:
+        if kid is None:
+            name = self._settings.algorithm
+            public_key = self._settings.public_key
+            secret_key = self._settings.secret_key
+        elif (spec := self._settings.keys.get(kid)) is not None:
+            name, public_key, secret_key = (
+                spec.algorithm,
+                spec.public_key,
+                spec.secret_key,
+            )
+        else:
+            raise UnAuthorizedError("Token is invalid or expired")
+
+        algorithms = get_default_algorithms()
+        if name not in algorithms.keys() - {"none"}:
+            raise UnAuthorizedError("Unsupported token algorithm")
+
+        algorithm = algorithms[name]
+        try:
+            return _Key(
+                name=name,
+                algorithm=algorithm,
+                verifying=algorithm.prepare_key(base64.b64decode(public_key)),
+                signing=(
+                    algorithm.prepare_key(base64.b64decode(secret_key))
+                    if secret_key
+                    else None
+                ),
+            )
+        except Exception as e:
+            raise UnAuthorizedError("Token key cannot be loaded") from e
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from typing import Final, Literal, Optional, Union
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 _PathLike = Union[os.PathLike[str], str, Path]
@@ -115,6 +116,12 @@ class ServerSettings(BaseSettings):
     log: bool = False
 
 
+class CipherKey(BaseModel):
+    algorithm: str
+    public_key: str
+    secret_key: str = ""
+
+
 class CipherSettings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file="./.env",
@@ -127,6 +134,54 @@ class CipherSettings(BaseSettings):
     public_key: str = ""
     access_token_expire_seconds: int = 0
     refresh_token_expire_seconds: int = 0
+    keys: dict[str, CipherKey] = {}
+    active_key: str = ""
+    offload: Literal["auto", "thread", "inline"] = "auto"
+    inline_threshold_us: int = 200
+    workers: int = 2
+
+
+class HasherSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file="./.env",
+        case_sensitive=False,
+        env_prefix="HASHER_",
+        extra="ignore",
+    )
+
+    profile: Literal[
+        "RFC_9106_LOW_MEMORY", "RFC_9106_HIGH_MEMORY", "CHEAPEST", "PRE_21_2", "DEFAULT"
+    ] = "DEFAULT"
+    max_workers: Optional[int] = None
+    max_pending: Optional[int] = None
+    calibrate: bool = False
+    target_ms: float = 250.0
+    memory_budget_mib: int = 256
+
+
+class HttpRateLimit(BaseModel):
+    rate: float
+    capacity: Optional[float] = None
+    prefetch: int = 1
+
+
+class HttpSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file="./.env",
+        case_sensitive=False,
+        env_prefix="HTTP_",
+        extra="ignore",
+    )
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    dns_cache_ttl: Optional[int] = 300
+    close_grace: float = 0.0
+    cache: Literal["none", "memory", "redis"] = "none"
+    cache_size: int = 1024
+    cache_stale_ttl: float = 3600.0
+    rate_limits: dict[str, HttpRateLimit] = {}
+    rate_limit_max_wait: float = 5.0
 
 
 class NatsSettings(BaseSettings):
@@ -140,6 +195,11 @@ class NatsSettings(BaseSettings):
     servers: list[str] = []
     user: str = ""
     password: str = ""
+    outbox_batch_size: int = 256
+    outbox_interval: float = 1.0
+    outbox_retry_delay: float = 1.0
+    outbox_max_attempts: int = 10
+    outbox_lease: float = 30.0
 
 
 class Settings(BaseSettings):
@@ -149,6 +209,8 @@ class Settings(BaseSettings):
     server: ServerSettings
     ciphers: CipherSettings
     nats: NatsSettings
+    hasher: HasherSettings
+    http: HttpSettings
 
 
 def load_settings(
@@ -158,6 +220,8 @@ def load_settings(
     ciphers: Optional[CipherSettings] = None,
     nats: Optional[NatsSettings] = None,
     app: Optional[AppSettings] = None,
+    hasher: Optional[HasherSettings] = None,
+    http: Optional[HttpSettings] = None,
 ) -> Settings:
     return Settings(
         db=db or DatabaseSettings(),
@@ -166,4 +230,6 @@ def load_settings(
         ciphers=ciphers or CipherSettings(),
         nats=nats or NatsSettings(),
         app=app or AppSettings(),
+        hasher=hasher or HasherSettings(),
+        http=http or HttpSettings(),
     )
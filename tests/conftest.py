@@ -6,6 +6,7 @@ from typing import (
 )
 
 import alembic.command
+import fakeredis
 import pytest
 from alembic.config import Config as AlembicConfig
 from litestar import Litestar
@@ -45,6 +46,11 @@ def redis(redis_config: RedisSettings) -> Iterator[RedisCache]:
     yield get_redis(redis_config)
 
 
+@pytest.fixture(scope="function")
+def fake_redis() -> RedisCache:
+    return RedisCache(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
 @pytest.fixture(scope="session")
 def nats_config() -> Iterator[NatsSettings]:
     nats = NatsContainer()
@@ -0,0 +1,74 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+from argon2 import PasswordHasher
+from argon2.profiles import RFC_9106_LOW_MEMORY
+
+from src.services.cache.redis import RedisCache
+from src.services.security import argon2
+from src.services.security.argon2 import Argon2, shared_calibrate_argon2
+
+pytestmark = pytest.mark.anyio
+
+TARGET = replace(RFC_9106_LOW_MEMORY, time_cost=2, memory_cost=19 * 1024)
+
+
+def hash_with(**changes: int) -> str:
+    parameters = replace(TARGET, **changes)
+    return PasswordHasher.from_parameters(parameters).hash("password")
+
+
+def test_needs_rehash_only_for_weaker_hashes() -> None:
+    hasher = Argon2(PasswordHasher.from_parameters(TARGET))
+
+    assert not hasher.needs_rehash(hash_with())
+    assert not hasher.needs_rehash(hash_with(time_cost=3))
+    assert not hasher.needs_rehash(hash_with(memory_cost=38 * 1024))
+    assert hasher.needs_rehash(hash_with(time_cost=1))
+    assert hasher.needs_rehash(hash_with(memory_cost=8 * 1024))
+    assert hasher.needs_rehash("not-a-hash")
+
+
+async def test_shared_calibration_runs_once(
+    fake_redis: RedisCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+
+    def calibrate(*_: object) -> object:
+        nonlocal calls
+        calls += 1
+        return TARGET
+
+    monkeypatch.setattr(argon2, "calibrate_argon2", calibrate)
+    results = await asyncio.gather(
+        *(shared_calibrate_argon2(fake_redis, 250, 256 * 1024, 4) for _ in range(4))
+    )
+
+    assert calls == 1
+    assert all(
+        (result.time_cost, result.memory_cost) == (TARGET.time_cost, TARGET.memory_cost)
+        for result in results
+    )
+
+
+async def test_shared_calibration_expires_and_is_per_host(
+    fake_redis: RedisCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+
+    def calibrate(*_: object) -> object:
+        nonlocal calls
+        calls += 1
+        return TARGET
+
+    monkeypatch.setattr(argon2, "calibrate_argon2", calibrate)
+    await shared_calibrate_argon2(fake_redis, 250, 256 * 1024, 4)
+    monkeypatch.setattr(argon2.os, "cpu_count", lambda: 1024)
+    await shared_calibrate_argon2(fake_redis, 250, 256 * 1024, 4)
+
+    assert calls == 2
+    keys = await fake_redis._redis.keys(f"{argon2.CALIBRATION_KEY}*")
+    assert len(keys) == 2
+    for key in keys:
+        assert 0 < await fake_redis._redis.ttl(key) <= argon2.CALIBRATION_TTL
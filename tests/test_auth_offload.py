@@ -0,0 +1,126 @@
+import base64
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+import uuid_utils.compat as uuid
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.common.exceptions import UnAuthorizedError
+from src.services.cache.redis import RedisCache
+from src.services.cache.session import RedisSessionStore
+from src.services.internal.auth import CALIBRATION_SAMPLES, AuthService
+from src.services.security.jwt import JWT
+from src.settings.core import CipherSettings
+
+pytestmark = pytest.mark.anyio
+
+SECRET = base64.b64encode(b"secret" * 8).decode()
+
+
+@pytest.fixture(scope="function")
+def executor() -> Iterator[ThreadPoolExecutor]:
+    executor = ThreadPoolExecutor(1, thread_name_prefix="jwt")
+    yield executor
+    executor.shutdown()
+
+
+def verifier(fake_redis: RedisCache, executor: ThreadPoolExecutor) -> AuthService:
+    # default settings: no signing key and no access token lifetime
+    settings = CipherSettings(algorithm="HS256", public_key=SECRET)
+    return AuthService(
+        JWT(settings), RedisSessionStore(fake_redis, max_sessions=5), executor
+    )
+
+
+def access_token(user_uuid: uuid.UUID) -> str:
+    signer = JWT(
+        CipherSettings(algorithm="HS256", public_key=SECRET, secret_key=SECRET)
+    )
+    _, token = signer.create("access", str(user_uuid), timedelta(minutes=5))
+    return token
+
+
+async def test_auto_offload_on_verify_only_deployment(
+    fake_redis: RedisCache, executor: ThreadPoolExecutor
+) -> None:
+    auth = verifier(fake_redis, executor)
+    user_uuid = uuid.uuid4()
+
+    for _ in range(CALIBRATION_SAMPLES):
+        token = access_token(uuid.uuid4())
+        assert await auth.verify_token(token, "access")
+
+    assert auth._inline["verify"] is not None
+    assert auth._inline["sign"] is None
+    assert await auth.verify_token(access_token(user_uuid), "access") == user_uuid
+
+
+async def test_auto_offload_ignores_failed_calls(
+    fake_redis: RedisCache, executor: ThreadPoolExecutor
+) -> None:
+    auth = verifier(fake_redis, executor)
+
+    with pytest.raises(UnAuthorizedError):
+        await auth.verify_token("invalid.token.value", "access")
+
+    assert auth._inline["verify"] is None
+    assert auth._samples["verify"] == []
+
+
+class RecordingJWT(JWT):
+    __slots__ = ("signed_on",)
+
+    def __init__(self, settings: CipherSettings) -> None:
+        super().__init__(settings)
+        self.signed_on: list[str] = []
+
+    def create_pair(
+        self, sub: str, **kw: Any
+    ) -> tuple[tuple[datetime, str], tuple[datetime, str]]:
+        self.signed_on.append(threading.current_thread().name)
+        return super().create_pair(sub, **kw)
+
+
+def rs256_settings() -> CipherSettings:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return CipherSettings(
+        algorithm="RS256",
+        secret_key=base64.b64encode(private).decode(),
+        public_key=base64.b64encode(public).decode(),
+        access_token_expire_seconds=300,
+        refresh_token_expire_seconds=600,
+    )
+
+
+async def test_auto_offload_keeps_rs256_signing_on_executor(
+    fake_redis: RedisCache, executor: ThreadPoolExecutor
+) -> None:
+    settings = rs256_settings()
+    jwt = RecordingJWT(settings)
+    auth = AuthService(jwt, RedisSessionStore(fake_redis, max_sessions=50), executor)
+    signer = JWT(settings)
+
+    # a verify-heavy workload must not decide how tokens get signed
+    for _ in range(CALIBRATION_SAMPLES * 4):
+        _, token = signer.create("access", str(uuid.uuid4()))
+        await auth.verify_token(token, "access")
+    assert auth._inline["sign"] is None
+
+    for _ in range(CALIBRATION_SAMPLES + 1):
+        await auth.login("fingerprint", uuid.uuid4())
+
+    assert auth._inline["sign"] is False
+    assert all(name.startswith("jwt") for name in jwt.signed_on)
@@ -0,0 +1,129 @@
+import asyncio
+import timeit
+from collections.abc import Sequence
+from typing import Any, cast
+
+import msgspec
+import pytest
+
+from nats.aio.client import Client as NatsClient
+from nats.js import JetStreamContext
+from src.api.common.broker.nats.core import NatsBroker, NatsJetStreamBroker
+from src.api.common.broker.nats.message import NatsMessage
+from src.api.common.bus.core import EventBusImpl
+from src.api.common.events.base import Event
+from src.api.common.events.nats import NatsEvent, rebuild_nats_event
+from src.api.common.interfaces.broker import Broker, PublishFailures
+from src.api.v1.events.email import SendEmail
+
+ROUNDS = 20_000
+DEPTH = 8
+EVENT_TYPES = 200
+
+
+@rebuild_nats_event(subject="test.core")
+class Core[T](NatsEvent, kw_only=True):
+    pass
+
+
+def bus() -> EventBusImpl:
+    return (
+        EventBusImpl.builder()
+        .brokers(
+            NatsBroker(cast(NatsClient, None)),
+            NatsJetStreamBroker(cast(JetStreamContext, None)),
+        )
+        .build()
+    )
+
+
+def deep_event() -> Event:
+    event_type: type[Any] = Core
+    for level in range(DEPTH):
+        event_type = type(f"Core{level}", (event_type,), {})
+    return cast(Event, event_type())
+
+
+def test_subclass_resolves_through_mro() -> None:
+    event_bus = bus()
+    event = deep_event()
+
+    assert isinstance(event_bus._resolve_broker(event), NatsBroker)
+    assert type(event) in event_bus._resolved
+    assert isinstance(
+        event_bus._resolve_broker(
+            SendEmail[str](from_="a@b.c", to="d@e.f", title="t", template="t")
+        ),
+        NatsJetStreamBroker,
+    )
+
+
+def test_unregistered_event_is_not_cached() -> None:
+    event_bus = bus()
+
+    with pytest.raises(ValueError):
+        event_bus._resolve_broker(Event())
+    assert Event not in event_bus._resolved
+
+
+def test_build_drops_resolved_brokers() -> None:
+    event_bus = bus()
+    event_bus._resolve_broker(deep_event())
+
+    event_bus.build()
+
+    assert not event_bus._resolved
+
+
+def noop_broker(event_type: type[Event]) -> Broker[Any, NatsMessage]:
+    message = NatsMessage(subject="bench")
+
+    class NoopBroker(Broker[event_type, NatsMessage]):  # type: ignore[valid-type]
+        async def publish(self, message: NatsMessage) -> None:
+            pass
+
+        async def publish_many(
+            self, messages: Sequence[NatsMessage]
+        ) -> PublishFailures:
+            return {}
+
+        def _build_message(self, event: Event) -> NatsMessage:
+            return message
+
+    NoopBroker.__name__ = f"{event_type.__name__}Broker"
+    return NoopBroker()
+
+
+def publish_time(event_types: int) -> float:
+    types = [
+        msgspec.defstruct(f"Event{index}", [], bases=(Event,), kw_only=True)
+        for index in range(event_types)
+    ]
+    event_bus = (
+        EventBusImpl.builder()
+        .brokers(*(noop_broker(event_type) for event_type in types))
+        .build()
+    )
+    event = types[-1]()
+    loop = asyncio.new_event_loop()
+    try:
+        return min(
+            timeit.repeat(
+                lambda: loop.run_until_complete(event_bus.publish(event)),
+                number=ROUNDS,
+                repeat=3,
+            )
+        )
+    finally:
+        loop.close()
+
+
+@pytest.mark.benchmark
+def test_publish_overhead_is_independent_of_event_types(
+    record_property: Any,
+) -> None:
+    single, many = publish_time(1), publish_time(EVENT_TYPES)
+
+    record_property("publish_1_event_type_ms", single * 1e3)
+    record_property(f"publish_{EVENT_TYPES}_event_types_ms", many * 1e3)
+    assert many < single * 1.5
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from src.common.tools.ratelimit import TokenBucket
+from src.services.external.batch import BatchError
+from src.services.external.client import Client
+from src.services.external.request import Request
+from src.services.provider.aiohttp import AiohttpProvider
+from src.services.provider.base import AsyncProvider
+
+pytestmark = pytest.mark.anyio
+
+
+class Tracker:
+    def __init__(self) -> None:
+        self.running: Counter[str] = Counter()
+        self.peak: Counter[str] = Counter()
+        self.cancelled = 0
+
+    def enter(self, host: str) -> None:
+        for key in (host, "*"):
+            self.running[key] += 1
+            self.peak[key] = max(self.peak[key], self.running[key])
+
+    def leave(self, host: str) -> None:
+        for key in (host, "*"):
+            self.running[key] -= 1
+
+
+class Sleep(Request[int]):
+    def __init__(
+        self, tracker: Tracker, value: int, delay: float, host: str = ""
+    ) -> None:
+        self.tracker = tracker
+        self.value = value
+        self.delay = delay
+        self._host = host
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    async def handle(self, provider: AsyncProvider, **kwargs: Any) -> int:
+        self.tracker.enter(self.host)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.tracker.cancelled += 1
+            raise
+        finally:
+            self.tracker.leave(self.host)
+
+        if self.value < 0:
+            raise ValueError(self.value)
+        return self.value
+
+
+@pytest.fixture(scope="function")
+async def client() -> AsyncIterator[Client]:
+    async with Client(
+        provider=AiohttpProvider("https://api.example.com/"), proxy=None
+    ) as client:
+        yield client
+
+
+async def test_map_keeps_request_order(client: Client) -> None:
+    tracker = Tracker()
+    requests = [Sleep(tracker, value, 0.01 * (5 - value)) for value in range(5)]
+
+    assert await client.map(requests) == [0, 1, 2, 3, 4]
+
+
+async def test_concurrency_is_capped(client: Client) -> None:
+    tracker = Tracker()
+
+    await client.map(
+        [Sleep(tracker, value, 0.005) for value in range(20)], concurrency=3
+    )
+
+    assert tracker.peak["*"] == 3
+
+
+async def test_per_host_cap_is_read_from_each_request(client: Client) -> None:
+    tracker = Tracker()
+    requests = [
+        Sleep(tracker, value, 0.005, host="a" if value % 2 else "b")
+        for value in range(10)
+    ]
+
+    await client.map(requests, concurrency=4, per_host=1)
+
+    assert (tracker.peak["a"], tracker.peak["b"], tracker.peak["*"]) == (1, 1, 2)
+
+
+async def test_rate_spaces_requests(client: Client) -> None:
+    tracker = Tracker()
+
+    started = time.monotonic()
+    await client.map(
+        [Sleep(tracker, value, 0) for value in range(5)],
+        rate=TokenBucket(50, capacity=1),
+    )
+
+    # one token up front, the other four refill at 20ms each
+    assert time.monotonic() - started >= 0.075
+
+
+async def test_partial_failure_raises_batch_error(client: Client) -> None:
+    tracker = Tracker()
+    requests = [Sleep(tracker, value, 0) for value in (1, -2, 3, -4)]
+
+    with pytest.raises(BatchError) as e:
+        await client.map(requests)
+
+    assert [outcome.index for outcome in e.value.failed] == [1, 3]
+    assert [outcome.result for outcome in e.value.succeeded] == [1, 3]
+
+
+async def test_early_close_cancels_and_awaits_pending(client: Client) -> None:
+    tracker = Tracker()
+    requests = [Sleep(tracker, 0, 0)] + [
+        Sleep(tracker, value, 10) for value in range(1, 5)
+    ]
+
+    outcomes = client.send_many(requests, concurrency=5)
+    assert (await anext(outcomes)).index == 0
+    await outcomes.aclose()
+
+    assert tracker.cancelled == 4
+    assert tracker.running["*"] == 0
+
+
+@pytest.mark.parametrize("options", [{"concurrency": 0}, {"per_host": 0}])
+async def test_rejects_non_positive_limits(
+    client: Client, options: dict[str, int]
+) -> None:
+    with pytest.raises(ValueError):
+        await client.map([Sleep(Tracker(), 0, 0)], **options)
@@ -0,0 +1,235 @@
+import base64
+import json
+import time
+from datetime import timedelta
+from typing import Any
+
+import jwt as pyjwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from src.common.exceptions import UnAuthorizedError
+from src.services.security.jwt import JWT
+from src.settings.core import CipherKey, CipherSettings
+
+type PrivateKey = ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey
+
+ALGORITHMS: dict[str, Any] = {
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def pem(key: PrivateKey) -> tuple[str, str]:
+    private = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.b64encode(private).decode(), base64.b64encode(public).decode()
+
+
+def settings(algorithm: str, key: PrivateKey) -> CipherSettings:
+    secret_key, public_key = pem(key)
+    return CipherSettings(
+        algorithm=algorithm,
+        secret_key=secret_key,
+        public_key=public_key,
+        access_token_expire_seconds=300,
+        refresh_token_expire_seconds=600,
+    )
+
+
+def claims(**changes: Any) -> dict[str, Any]:
+    now = int(time.time())
+    return {"sub": "user", "type": "access", "iat": now, "exp": now + 60} | changes
+
+
+@pytest.fixture(scope="module", params=sorted(ALGORITHMS))
+def algorithm(request: pytest.FixtureRequest) -> str:
+    return str(request.param)
+
+
+@pytest.fixture(scope="module")
+def key(algorithm: str) -> PrivateKey:
+    return ALGORITHMS[algorithm]()  # type: ignore[no-any-return]
+
+
+@pytest.fixture(scope="module")
+def codec(algorithm: str, key: PrivateKey) -> JWT:
+    return JWT(settings(algorithm, key))
+
+
+def test_decodes_tokens_issued_by_pyjwt(
+    codec: JWT, algorithm: str, key: PrivateKey
+) -> None:
+    token = pyjwt.encode(claims(extra=[1, 2]), key, algorithm=algorithm)
+
+    assert codec.verify_token(token)["extra"] == [1, 2]
+
+
+def test_issues_tokens_pyjwt_accepts(
+    codec: JWT, algorithm: str, key: PrivateKey
+) -> None:
+    _, token = codec.create("refresh", "user", timedelta(minutes=1))
+
+    payload = pyjwt.decode(token, key.public_key(), algorithms=[algorithm])
+    assert (payload["sub"], payload["type"]) == ("user", "refresh")
+
+
+def test_rejects_bad_signature(codec: JWT, algorithm: str) -> None:
+    other = ALGORITHMS[algorithm]()
+    token = pyjwt.encode(claims(), other, algorithm=algorithm)
+
+    with pytest.raises(UnAuthorizedError):
+        codec.verify_token(token)
+
+
+def test_rejects_tampered_payload(codec: JWT) -> None:
+    _, token = codec.create("access", "user", timedelta(minutes=1))
+    header, _, signature = token.split(".")
+    payload = base64.urlsafe_b64encode(b'{"sub":"admin"}').rstrip(b"=").decode()
+
+    with pytest.raises(UnAuthorizedError):
+        codec.verify_token(f"{header}.{payload}.{signature}")
+
+
+def test_rejects_expired_and_not_yet_valid(
+    codec: JWT, algorithm: str, key: PrivateKey
+) -> None:
+    now = int(time.time())
+    for payload in (
+        claims(exp=now - 1),
+        claims(nbf=now + 60),
+        {"sub": "user", "type": "access"},
+    ):
+        with pytest.raises(UnAuthorizedError):
+            codec.verify_token(pyjwt.encode(payload, key, algorithm=algorithm))
+
+
+def test_rejects_wrong_alg(codec: JWT, algorithm: str) -> None:
+    hs256 = pyjwt.encode(claims(), "secret" * 8, algorithm="HS256")
+    unsigned = pyjwt.encode(claims(), None, algorithm="none")
+
+    for token in (hs256, unsigned):
+        with pytest.raises(UnAuthorizedError):
+            codec.verify_token(token)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "one.two",
+        "one.two.three.four",
+        "!!!.???.***",
+        "e30.e30.",
+        "bm90IGpzb24.e30.c2ln",
+    ],
+)
+def test_rejects_malformed_segments(codec: JWT, token: str) -> None:
+    with pytest.raises(UnAuthorizedError):
+        codec.verify_token(token)
+
+
+def keyring(active: str, **keys: PrivateKey) -> CipherSettings:
+    ring: dict[str, CipherKey] = {}
+    for kid, key in keys.items():
+        secret_key, public_key = pem(key)
+        ring[kid] = CipherKey(
+            algorithm="EdDSA", public_key=public_key, secret_key=secret_key
+        )
+    return CipherSettings(keys=ring, active_key=active, access_token_expire_seconds=60)
+
+
+def forge(header: dict[str, Any], key: PrivateKey, signer: str) -> str:
+    # PyJWT refuses to emit headers like these, build them by hand
+    def segment(value: dict[str, Any]) -> bytes:
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=")
+
+    signing_input = segment(header) + b"." + segment(claims())
+    signature = pyjwt.get_algorithm_by_name(signer).sign(signing_input, key)
+    return (
+        signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")
+    ).decode()
+
+
+def kid_of(token: str) -> Any:
+    return pyjwt.get_unverified_header(token).get("kid")
+
+
+def test_signs_with_active_kid_and_verifies_by_kid() -> None:
+    old = ed25519.Ed25519PrivateKey.generate()
+    new = ed25519.Ed25519PrivateKey.generate()
+    before = JWT(keyring("old", old=old))
+    after = JWT(keyring("new", old=old, new=new))
+
+    _, issued_before = before.create("access", "user")
+    _, issued_after = after.create("access", "user")
+
+    assert kid_of(issued_before) == "old"
+    assert kid_of(issued_after) == "new"
+    assert after.verify_token(issued_before)["sub"] == "user"
+    assert after.verify_token(issued_after)["sub"] == "user"
+    with pytest.raises(UnAuthorizedError):
+        before.verify_token(issued_after)
+
+
+def test_legacy_tokens_without_kid_survive_rotation() -> None:
+    legacy_key = ed25519.Ed25519PrivateKey.generate()
+    legacy = settings("EdDSA", legacy_key)
+    _, token = JWT(legacy).create("access", "user", timedelta(minutes=1))
+    secret_key, public_key = pem(ed25519.Ed25519PrivateKey.generate())
+    rotated = JWT(
+        legacy.model_copy(
+            update={
+                "keys": {
+                    "new": CipherKey(
+                        algorithm="EdDSA", public_key=public_key, secret_key=secret_key
+                    )
+                },
+                "active_key": "new",
+            }
+        )
+    )
+
+    assert kid_of(token) is None
+    assert rotated.verify_token(token)["sub"] == "user"
+
+
+def test_unknown_or_invalid_kid_is_unauthorized() -> None:
+    key = ed25519.Ed25519PrivateKey.generate()
+    codec = JWT(keyring("current", current=key))
+
+    for kid in ("retired", 1):
+        token = forge({"alg": "EdDSA", "kid": kid}, key, "EdDSA")
+        with pytest.raises(UnAuthorizedError):
+            codec.verify_token(token)
+
+
+def test_kid_algorithm_must_match_header() -> None:
+    key = ec.generate_private_key(ec.SECP256R1())
+    secret_key, public_key = pem(key)
+    codec = JWT(
+        CipherSettings(
+            keys={
+                "ec": CipherKey(
+                    algorithm="ES256", public_key=public_key, secret_key=secret_key
+                )
+            },
+            active_key="ec",
+        )
+    )
+
+    token = forge({"alg": "ES384", "kid": "ec"}, key, "ES256")
+    with pytest.raises(UnAuthorizedError):
+        codec.verify_token(token)
+
+
+def test_unknown_active_key_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        JWT(CipherSettings(active_key="missing"))
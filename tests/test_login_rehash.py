@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+import uuid_utils.compat as uuid
+
+from src.api.v1.handlers.auth import login
+from src.api.v1.handlers.auth.login import LoginHandler, LoginQuery
+
+pytestmark = pytest.mark.anyio
+
+
+class Hasher:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def verify_password(self, hashed: str, password: str) -> bool:
+        return True
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return True
+
+    async def hash_password(self, password: str) -> str:
+        await self.release.wait()
+        return "rehashed"
+
+
+class Users:
+    def __init__(self, user: Any) -> None:
+        self.user = user
+        self.updates: list[dict[str, Any]] = []
+
+    async def select(self, **kw: Any) -> Any:
+        return SimpleNamespace(result=lambda: self.user)
+
+    async def update(self, user_uuid: uuid.UUID, **kw: Any) -> None:
+        self.updates.append(kw)
+
+
+class Database:
+    def __init__(self, users: Users) -> None:
+        self.user = users
+        self.manager = SimpleNamespace(session=self)
+
+    async def __aenter__(self) -> "Database":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+async def test_rehash_runs_after_login_returns() -> None:
+    user = SimpleNamespace(uuid=uuid.uuid4(), active=True, password="old")
+    users, hasher = Users(user), Hasher()
+
+    async def issue(fingerprint: str, user_uuid: uuid.UUID) -> str:
+        return "tokens"
+
+    handler = LoginHandler(
+        internal_gateway=cast(Any, SimpleNamespace(auth=SimpleNamespace(login=issue))),
+        database=cast(Any, Database(users)),
+        hasher=cast(Any, hasher),
+    )
+
+    result = await handler(
+        LoginQuery(login="user@example.com", password="password", fingerprint="f")
+    )
+
+    assert cast(Any, result) == "tokens"
+    assert users.updates == []
+
+    hasher.release.set()
+    await asyncio.gather(*login._rehash_tasks)
+    assert users.updates == [{"password": "rehashed"}]
@@ -0,0 +1,21 @@
+import pytest
+
+from src.database.repositories.user import _login_search
+from src.database.types import LoginMatch
+
+
+@pytest.mark.parametrize("login", ["ab", "abc", "John@Example.com"])
+def test_auto_keeps_substring_matching(login: str) -> None:
+    assert _login_search(login, "auto") == ("contains", f"%{login}%")
+
+
+@pytest.mark.parametrize(
+    ("match", "expected"),
+    [
+        ("prefix", ("prefix", "a/_b%")),
+        ("contains", ("contains", "%A/_b%")),
+        ("exact", ("exact", "A_b")),
+    ],
+)
+def test_explicit_modes(match: LoginMatch, expected: tuple[str, str]) -> None:
+    assert _login_search("A_b", match) == expected
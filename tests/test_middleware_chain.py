@@ -0,0 +1,82 @@
+import timeit
+import typing as t
+
+import pytest
+
+from src.services.provider.middleware import (
+    BaseRequestMiddleware,
+    RequestMiddlewareManager,
+)
+from src.services.provider.middleware.base import CallNextMiddlewareType
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+pytestmark = pytest.mark.anyio
+
+MIDDLEWARES = 8
+ROUNDS = 20_000
+
+
+class Passthrough(BaseRequestMiddleware):
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        return await call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+
+
+class Endpoint:
+    async def make_request(
+        self, method: RequestMethodType, url_or_endpoint: str = "", **kw: t.Any
+    ) -> Response:
+        return t.cast(Response, (method, url_or_endpoint))
+
+
+def manager() -> RequestMiddlewareManager:
+    return RequestMiddlewareManager(*(Passthrough() for _ in range(MIDDLEWARES)))
+
+
+def test_chain_is_reused_until_changed() -> None:
+    chain, endpoint = manager(), Endpoint()
+
+    composed = chain.wrap_middleware(endpoint.make_request)
+    assert chain.wrap_middleware(endpoint.make_request) is composed
+
+    middleware = chain.register(Passthrough())
+    assert chain.wrap_middleware(endpoint.make_request) is not composed
+
+    composed = chain.wrap_middleware(endpoint.make_request)
+    chain.unregister(middleware)
+    assert chain.wrap_middleware(endpoint.make_request) is not composed
+
+
+async def test_chain_runs_every_middleware() -> None:
+    chain, endpoint = manager(), Endpoint()
+
+    composed = chain.wrap_middleware(endpoint.make_request)
+    assert await composed(method="GET", url_or_endpoint="/") == ("GET", "/")
+
+
+@pytest.mark.benchmark
+def test_cached_chain_benchmark(record_property: t.Any) -> None:
+    chain, endpoint = manager(), Endpoint()
+
+    cached = min(
+        timeit.repeat(
+            lambda: chain.wrap_middleware(endpoint.make_request),
+            number=ROUNDS,
+            repeat=3,
+        )
+    )
+    composed = min(
+        timeit.repeat(
+            lambda: chain._compose(endpoint.make_request), number=ROUNDS, repeat=3
+        )
+    )
+
+    record_property("wrap_middleware_cached_ms", cached * 1e3)
+    record_property("wrap_middleware_composed_ms", composed * 1e3)
+    assert cached < composed
@@ -0,0 +1,173 @@
+import asyncio
+from typing import Any, Optional, cast
+
+import pytest
+
+from nats.aio.client import Client as NatsClient
+from nats.js import JetStreamContext
+from nats.js.api import PubAck
+from src.api.common.broker.nats.core import NatsBroker, NatsJetStreamBroker
+from src.api.common.broker.nats.message import NatsJetStreamMessage, NatsMessage
+from src.api.common.bus.core import EventBusImpl
+from src.api.common.events.nats import (
+    NatsEvent,
+    NatsJetStreamEvent,
+    rebuild_jetstream_event,
+    rebuild_nats_event,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@rebuild_jetstream_event(subject="test.stream", stream="TEST")
+class Streamed[T](NatsJetStreamEvent, kw_only=True):
+    value: int
+
+
+@rebuild_nats_event(subject="test.core")
+class Core[T](NatsEvent, kw_only=True):
+    value: int
+
+
+class FakeJetStream:
+    def __init__(self, rejected: frozenset[int] = frozenset()) -> None:
+        self.rejected = rejected
+        self.inflight = 0
+        self.peak = 0
+        self.published = 0
+
+    async def publish_async(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        stream: Optional[str] = None,
+        headers: Optional[dict[str, Any]] = None,
+    ) -> asyncio.Future[PubAck]:
+        index = self.published
+        self.published += 1
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+
+        future: asyncio.Future[PubAck] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda _: self._acked())
+        asyncio.get_running_loop().call_later(0.001, self._ack, future, index)
+        return future
+
+    def _acked(self) -> None:
+        self.inflight -= 1
+
+    def _ack(self, future: asyncio.Future[PubAck], index: int) -> None:
+        if future.done():
+            return
+        if index in self.rejected:
+            future.set_exception(ConnectionError(f"rejected {index}"))
+        else:
+            future.set_result(PubAck(stream="TEST", seq=index))
+
+
+class FakeNats:
+    def __init__(
+        self, rejected: frozenset[int] = frozenset(), flush_error: bool = False
+    ) -> None:
+        self.rejected = rejected
+        self.flush_error = flush_error
+        self.published: list[str] = []
+
+    async def publish(self, subject: str, payload: bytes = b"", **kw: Any) -> None:
+        if len(self.published) in self.rejected:
+            self.published.append("")
+            raise ConnectionError("publish failed")
+        self.published.append(subject)
+
+    async def flush(self) -> None:
+        if self.flush_error:
+            raise TimeoutError("flush timeout")
+
+
+def jetstream_broker(jetstream: FakeJetStream, window: int) -> NatsJetStreamBroker:
+    return NatsJetStreamBroker(cast(JetStreamContext, jetstream), window=window)
+
+
+async def test_jetstream_window_bounds_inflight_acks() -> None:
+    jetstream = FakeJetStream()
+    broker = jetstream_broker(jetstream, window=4)
+
+    failures = await broker.publish_many(
+        [NatsJetStreamMessage(subject="test", payload=b"x") for _ in range(50)]
+    )
+
+    assert failures == {}
+    assert jetstream.published == 50
+    assert jetstream.peak == 4
+
+
+async def test_jetstream_reports_failures_per_index() -> None:
+    broker = jetstream_broker(FakeJetStream(frozenset({1, 4})), window=2)
+
+    failures = await broker.publish_many(
+        [NatsJetStreamMessage(subject="test", payload=b"x") for _ in range(6)]
+    )
+
+    assert sorted(failures) == [1, 4]
+    assert all(isinstance(error, ConnectionError) for error in failures.values())
+
+
+async def test_jetstream_ack_timeout_is_a_failure() -> None:
+    class Silent(FakeJetStream):
+        def _ack(self, future: asyncio.Future[PubAck], index: int) -> None:
+            pass
+
+    broker = jetstream_broker(Silent(), window=8)
+
+    failures = await broker.publish_many(
+        [NatsJetStreamMessage(subject="test", payload=b"x", timeout=0.01)]
+    )
+
+    assert isinstance(failures[0], TimeoutError)
+
+
+async def test_event_bus_maps_failures_to_event_indexes() -> None:
+    nats = FakeNats(rejected=frozenset({1}))
+    event_bus = (
+        EventBusImpl.builder()
+        .brokers(
+            NatsBroker(cast(NatsClient, nats)),
+            jetstream_broker(FakeJetStream(frozenset({0, 2})), window=2),
+        )
+        .build()
+    )
+    # brokers see: jetstream 0, 1, 2 / core 0, 1, 2
+    events = [
+        Streamed(value=0),
+        Core(value=1),
+        Streamed(value=2),
+        Core(value=3),
+        Streamed(value=4),
+        Core(value=5),
+    ]
+
+    failures = await event_bus.publish_many(events)
+
+    assert sorted(failures) == [0, 3, 4]
+
+
+async def test_core_flush_failure_fails_every_message() -> None:
+    broker = NatsBroker(cast(NatsClient, FakeNats(flush_error=True)))
+
+    failures = await broker.publish_many(
+        [NatsMessage(subject="test", payload=b"x") for _ in range(3)]
+    )
+
+    assert sorted(failures) == [0, 1, 2]
+    assert all(isinstance(error, TimeoutError) for error in failures.values())
+
+
+async def test_core_publish_failure_keeps_its_own_error() -> None:
+    broker = NatsBroker(cast(NatsClient, FakeNats(frozenset({1}), flush_error=True)))
+
+    failures = await broker.publish_many(
+        [NatsMessage(subject="test", payload=b"x") for _ in range(2)]
+    )
+
+    assert isinstance(failures[1], ConnectionError)
+    assert isinstance(failures[0], TimeoutError)
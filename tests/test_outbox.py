@@ -0,0 +1,205 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Optional, cast
+
+import pytest
+from uuid_utils.compat import UUID, uuid4
+
+from nats.js import JetStreamContext
+from nats.js.api import PubAck
+from src.api.common.broker.nats.core import NatsBroker, NatsJetStreamBroker
+from src.api.common.bus.core import EventBusImpl
+from src.api.common.bus.outbox import OutboxRelay
+from src.api.common.events.nats import (
+    NatsEvent,
+    NatsJetStreamEvent,
+    rebuild_jetstream_event,
+    rebuild_nats_event,
+)
+from src.api.v1.events.email import SendEmail
+from src.database import DBGateway
+
+pytestmark = pytest.mark.anyio
+
+
+@rebuild_jetstream_event(subject="test.acked", stream="TEST", timeout=0.05)
+class Acked[T](NatsJetStreamEvent, kw_only=True):
+    value: str
+
+
+@rebuild_nats_event(subject="test.core")
+class Core[T](NatsEvent, kw_only=True):
+    value: str
+
+
+class FakeJetStream:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, bytes, dict[str, Any]]] = []
+        self.in_transaction: list[bool] = []
+        self.database: Optional[FakeDatabase] = None
+
+    async def publish_async(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        stream: Optional[str] = None,
+        headers: Optional[dict[str, Any]] = None,
+    ) -> asyncio.Future[PubAck]:
+        self.published.append((subject, payload, headers or {}))
+        self.in_transaction.append(self.database is not None and self.database.open)
+        future: asyncio.Future[PubAck] = asyncio.get_running_loop().create_future()
+        # "lost" never gets an ack and has to run into the ack timeout
+        if b"lost" not in payload:
+            future.set_result(PubAck(stream=stream or "", seq=len(self.published)))
+        return future
+
+
+@dataclass
+class Record:
+    broker: str
+    message: bytes
+    attempts: int = 0
+    uuid: UUID = field(default_factory=uuid4)
+
+
+class FakeOutbox:
+    def __init__(self) -> None:
+        self.records: list[Record] = []
+        self.deleted: set[UUID] = set()
+        self.retried: dict[UUID, tuple[int, str]] = {}
+        self.failed: dict[UUID, str] = {}
+
+    async def claim(self, limit: int, lease: timedelta) -> list[Record]:
+        return self.records[:limit]
+
+    async def delete(self, *uuids: UUID) -> None:
+        self.deleted.update(uuids)
+
+    async def retry(
+        self, errors: dict[UUID, tuple[int, str]], delay: timedelta
+    ) -> None:
+        self.retried.update(errors)
+
+    async def fail(self, errors: dict[UUID, str]) -> None:
+        self.failed.update(errors)
+
+
+class FakeDatabase:
+    def __init__(self, outbox: FakeOutbox) -> None:
+        self.outbox = outbox
+        self.open = False
+        self.transactions = 0
+
+    async def __aenter__(self) -> "FakeDatabase":
+        self.open = True
+        self.transactions += 1
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.open = False
+
+
+@pytest.fixture(scope="function")
+def jetstream() -> FakeJetStream:
+    return FakeJetStream()
+
+
+@pytest.fixture(scope="function")
+def outbox() -> FakeOutbox:
+    return FakeOutbox()
+
+
+@pytest.fixture(scope="function")
+def database(jetstream: FakeJetStream, outbox: FakeOutbox) -> FakeDatabase:
+    jetstream.database = FakeDatabase(outbox)
+    return jetstream.database
+
+
+@pytest.fixture(scope="function")
+def relay(jetstream: FakeJetStream, database: FakeDatabase) -> OutboxRelay:
+    event_bus = (
+        EventBusImpl.builder()
+        .brokers(
+            NatsBroker(cast(Any, None)),
+            NatsJetStreamBroker(cast(JetStreamContext, jetstream)),
+        )
+        .build()
+    )
+    return OutboxRelay(
+        lambda: cast(DBGateway, database),
+        event_bus,
+        max_attempts=3,
+        brokers=(NatsJetStreamBroker.__name__,),
+    )
+
+
+def test_outbox_rejects_events_without_acknowledgement(relay: OutboxRelay) -> None:
+    with pytest.raises(TypeError):
+        relay.encode(Core(value="x"))
+
+
+def test_send_email_goes_through_jetstream(relay: OutboxRelay) -> None:
+    broker, _ = relay.encode(
+        SendEmail[str](from_="a@b.c", to="d@e.f", title="t", template="t")
+    )
+
+    assert broker == NatsJetStreamBroker.__name__
+
+
+async def test_records_are_deleted_only_after_ack(
+    relay: OutboxRelay, outbox: FakeOutbox, jetstream: FakeJetStream
+) -> None:
+    acked = Record(*relay.encode(Acked(value="ok")))
+    lost = Record(*relay.encode(Acked(value="lost")))
+    outbox.records = [acked, lost]
+
+    assert await relay.drain_once() == 2
+
+    assert outbox.deleted == {acked.uuid}
+    assert list(outbox.retried) == [lost.uuid]
+    assert not outbox.failed
+    assert all("Nats-Msg-Id" in headers for _, _, headers in jetstream.published)
+
+
+async def test_publishing_happens_outside_transactions(
+    relay: OutboxRelay,
+    outbox: FakeOutbox,
+    jetstream: FakeJetStream,
+    database: FakeDatabase,
+) -> None:
+    outbox.records = [Record(*relay.encode(Acked(value="ok")))]
+
+    await relay.drain_once()
+
+    assert jetstream.in_transaction == [False]
+    # one to claim, one to settle
+    assert database.transactions == 2
+
+
+async def test_permanent_failures_go_to_dead_letter(
+    relay: OutboxRelay, outbox: FakeOutbox
+) -> None:
+    unknown = Record("MissingBroker", b"")
+    corrupt = Record(NatsJetStreamBroker.__name__, b"\xc1")
+    unacknowledged = Record(*relay._event_bus.encode(Core(value="x")))
+    outbox.records = [unknown, corrupt, unacknowledged]
+
+    await relay.drain_once()
+
+    assert set(outbox.failed) == {unknown.uuid, corrupt.uuid, unacknowledged.uuid}
+    assert not outbox.retried
+    assert not outbox.deleted
+
+
+async def test_exhausted_records_go_to_dead_letter(
+    relay: OutboxRelay, outbox: FakeOutbox
+) -> None:
+    retried = Record(*relay.encode(Acked(value="lost")), attempts=1)
+    exhausted = Record(*relay.encode(Acked(value="lost")), attempts=2)
+    outbox.records = [retried, exhausted]
+
+    await relay.drain_once()
+
+    assert list(outbox.retried) == [retried.uuid]
+    assert list(outbox.failed) == [exhausted.uuid]
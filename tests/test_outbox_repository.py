@@ -0,0 +1,110 @@
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+import src.database.models as models
+from src.database import DBGateway
+from src.database.repositories.outbox import MAX_RETRY_DELAY
+
+pytestmark = pytest.mark.anyio
+
+
+async def add(database_factory: Callable[[], DBGateway], *messages: bytes) -> None:
+    async with database_factory() as database:
+        await database.outbox.add(*(("Broker", message) for message in messages))
+
+
+async def rows(database_factory: Callable[[], DBGateway]) -> list[models.Outbox]:
+    database = database_factory()
+    async with database.manager.session as session:
+        return list(
+            (
+                await session.scalars(
+                    select(models.Outbox).order_by(models.Outbox.message)
+                )
+            ).all()
+        )
+
+
+async def seconds_until_available(
+    database_factory: Callable[[], DBGateway], record: models.Outbox
+) -> float:
+    database = database_factory()
+    async with database.manager.session as session:
+        delta = await session.scalar(
+            select(models.Outbox.available_at - func.now()).where(
+                models.Outbox.uuid == record.uuid
+            )
+        )
+    assert delta is not None
+    return delta.total_seconds()
+
+
+async def test_claim_leases_records(
+    database_factory: Callable[[], DBGateway],
+) -> None:
+    await add(database_factory, b"a", b"b", b"c")
+
+    async with database_factory() as database:
+        first = await database.outbox.claim(2, timedelta(minutes=1))
+    async with database_factory() as database:
+        second = await database.outbox.claim(10, timedelta(minutes=1))
+    async with database_factory() as database:
+        third = await database.outbox.claim(10, timedelta(minutes=1))
+
+    assert len(first) == 2
+    assert len(second) == 1
+    assert third == []
+    assert await seconds_until_available(database_factory, second[0]) > 50
+
+
+async def test_retry_backs_off_with_a_cap(
+    database_factory: Callable[[], DBGateway],
+) -> None:
+    await add(database_factory, b"a", b"b")
+    first, second = await rows(database_factory)
+
+    async with database_factory() as database:
+        await database.outbox.retry(
+            {first.uuid: (0, "boom"), second.uuid: (30, "boom")},
+            timedelta(seconds=10),
+        )
+
+    first, second = await rows(database_factory)
+    assert (first.attempts, first.last_error) == (1, "boom")
+    assert second.attempts == 1
+    assert 5 < await seconds_until_available(database_factory, first) <= 10
+    assert await seconds_until_available(database_factory, second) <= (
+        MAX_RETRY_DELAY.total_seconds()
+    )
+
+
+async def test_failed_records_are_never_claimed(
+    database_factory: Callable[[], DBGateway],
+) -> None:
+    await add(database_factory, b"a", b"b")
+    dead, alive = await rows(database_factory)
+
+    async with database_factory() as database:
+        await database.outbox.fail({dead.uuid: "LookupError()"})
+    async with database_factory() as database:
+        claimed = await database.outbox.claim(10)
+
+    assert [record.uuid for record in claimed] == [alive.uuid]
+    dead, _ = await rows(database_factory)
+    assert dead.failed_at is not None
+    assert (dead.attempts, dead.last_error) == (1, "LookupError()")
+
+
+async def test_delete_removes_only_given_records(
+    database_factory: Callable[[], DBGateway],
+) -> None:
+    await add(database_factory, b"a", b"b", b"c")
+    first, second, third = await rows(database_factory)
+
+    async with database_factory() as database:
+        await database.outbox.delete(first.uuid, third.uuid)
+
+    assert [record.uuid for record in await rows(database_factory)] == [second.uuid]
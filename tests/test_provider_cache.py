@@ -0,0 +1,129 @@
+from collections import Counter
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.services.provider.aiohttp import AiohttpProvider
+from src.services.provider.middleware import RequestCacheMiddleware
+from src.services.provider.middleware.cache import MemoryResponseCache, _freshness
+from src.settings.core import HttpSettings
+
+pytestmark = pytest.mark.anyio
+
+
+class SharedResponseCache(MemoryResponseCache):
+    shared = True
+
+
+@pytest.fixture(scope="function")
+def hits() -> Counter[str]:
+    return Counter()
+
+
+@pytest.fixture(scope="function")
+async def server(hits: Counter[str]) -> AsyncIterator[TestServer]:
+    async def cached(request: web.Request) -> web.Response:
+        hits[request.path] += 1
+        return web.Response(
+            text=request.headers.get("Authorization", ""),
+            headers={"Cache-Control": request.match_info["directives"]},
+        )
+
+    app = web.Application()
+    app.router.add_get("/cached/{directives}", cached)
+    async with TestServer(app) as server:
+        yield server
+
+
+@pytest.fixture(scope="function")
+async def provider(server: TestServer) -> AsyncIterator[AiohttpProvider]:
+    provider = AiohttpProvider(url=str(server.make_url("/")))
+    yield provider
+    await provider.close_session()
+
+
+def test_response_cache_is_disabled_by_default() -> None:
+    assert HttpSettings().cache == "none"
+
+
+async def test_private_responses_stay_out_of_shared_backend(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestCacheMiddleware(SharedResponseCache()))
+
+    for _ in range(2):
+        await provider("GET", "cached/private, max-age=60")
+
+    assert hits["/cached/private, max-age=60"] == 2
+
+
+async def test_private_responses_are_kept_in_local_backend(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestCacheMiddleware(MemoryResponseCache()))
+
+    for _ in range(2):
+        await provider("GET", "cached/private, max-age=60")
+
+    assert hits["/cached/private, max-age=60"] == 1
+
+
+def test_shared_backend_prefers_s_maxage() -> None:
+    headers = {"Cache-Control": "max-age=60, s-maxage=5"}
+
+    assert _freshness(headers, 0.0, shared=True) == 5.0
+    assert _freshness(headers, 0.0, shared=False) == 60.0
+
+
+async def test_authenticated_responses_need_explicit_shared_permission(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestCacheMiddleware(SharedResponseCache()))
+    headers = {"Authorization": "Bearer a"}
+
+    for _ in range(2):
+        await provider("GET", "cached/max-age=60", headers=headers)
+        await provider("GET", "cached/s-maxage=60", headers=headers)
+
+    assert hits["/cached/max-age=60"] == 2
+    assert hits["/cached/s-maxage=60"] == 1
+
+
+async def test_session_credentials_are_part_of_the_key(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(
+        RequestCacheMiddleware(
+            MemoryResponseCache(), identity=provider.session_identity
+        )
+    )
+    await provider.create_session()
+
+    provider.update_headers({"Authorization": "Bearer a"})
+    first = await provider("GET", "cached/max-age=60")
+    provider.update_headers({"Authorization": "Bearer b"})
+    second = await provider("GET", "cached/max-age=60")
+    provider.update_headers({"Authorization": "Bearer a"})
+    third = await provider("GET", "cached/max-age=60")
+
+    assert await first.text() == await third.text() == "Bearer a"
+    assert await second.text() == "Bearer b"
+    assert hits["/cached/max-age=60"] == 2
+
+
+async def test_session_identity_covers_lazy_session(server: TestServer) -> None:
+    anonymous = AiohttpProvider(url=str(server.make_url("/")))
+    signed = AiohttpProvider(
+        url=str(server.make_url("/")), headers={"X-Api-Key": "secret"}
+    )
+
+    assert anonymous.session_identity() == ""
+    assert signed.session_identity() != ""
+
+    await signed.create_session()
+    try:
+        assert signed.session_identity() != ""
+    finally:
+        await signed.close_session()
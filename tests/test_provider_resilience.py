@@ -0,0 +1,230 @@
+import asyncio
+import time
+import typing as t
+from collections import Counter
+from collections.abc import AsyncIterator
+
+import pytest
+from aiohttp import TCPConnector, web
+from aiohttp.test_utils import TestServer
+
+import src.services.provider.errors as err
+from src.services.provider.aiohttp import (
+    DIRECT_POOL,
+    AiohttpProvider,
+    _connector_stats,
+)
+from src.services.provider.middleware import (
+    BaseRequestMiddleware,
+    RequestCircuitBreakerMiddleware,
+    RequestHedgingMiddleware,
+    RequestRetryMiddleware,
+)
+from src.services.provider.middleware.base import CallNextMiddlewareType
+from src.services.provider.response import Response
+from src.services.provider.types import RequestMethodType
+
+pytestmark = pytest.mark.anyio
+
+
+class Recorder(BaseRequestMiddleware):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(
+        self,
+        call_next: CallNextMiddlewareType,
+        method: RequestMethodType,
+        url_or_endpoint: str,
+        **kw: t.Any,
+    ) -> Response:
+        self.calls += 1
+        try:
+            return await call_next(method=method, url_or_endpoint=url_or_endpoint, **kw)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+@pytest.fixture(scope="function")
+def hits() -> Counter[str]:
+    return Counter()
+
+
+@pytest.fixture(scope="function")
+async def server(hits: Counter[str]) -> AsyncIterator[TestServer]:
+    async def flaky(request: web.Request) -> web.Response:
+        hits[request.path] += 1
+        if hits[request.path] <= int(request.match_info["failures"]):
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return web.Response(text="ok")
+
+    async def fail(request: web.Request) -> web.Response:
+        hits[request.path] += 1
+        return web.Response(status=500)
+
+    async def ok(request: web.Request) -> web.Response:
+        hits[request.path] += 1
+        return web.Response(text="ok")
+
+    async def slow(request: web.Request) -> web.Response:
+        hits[request.path] += 1
+        if hits[request.path] == 1:
+            await asyncio.sleep(1)
+        return web.Response(text=str(hits[request.path]))
+
+    app = web.Application()
+    app.router.add_route("*", "/flaky/{failures}", flaky)
+    app.router.add_get("/fail", fail)
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/slow", slow)
+    async with TestServer(app) as server:
+        yield server
+
+
+@pytest.fixture(scope="function")
+async def provider(server: TestServer) -> AsyncIterator[AiohttpProvider]:
+    provider = AiohttpProvider(url=str(server.make_url("/")))
+    yield provider
+    await provider.close_session()
+
+
+async def test_retry_recovers_within_budget(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestRetryMiddleware(attempts=3, backoff=0))
+
+    response = await provider("GET", "flaky/2")
+
+    assert response.status == 200
+    assert hits["/flaky/2"] == 3
+
+
+async def test_retry_stops_at_budget(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestRetryMiddleware(attempts=3, backoff=0))
+
+    with pytest.raises(err.APIError) as e:
+        await provider("GET", "flaky/5")
+
+    assert e.value.status_code == 503
+    assert hits["/flaky/5"] == 3
+
+
+async def test_retry_skips_non_idempotent_methods(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    provider.manager.register(RequestRetryMiddleware(attempts=3, backoff=0))
+
+    with pytest.raises(err.APIError):
+        await provider("POST", "flaky/1")
+
+    assert hits["/flaky/1"] == 1
+
+
+async def test_hedge_cancels_the_slower_request(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    recorder = Recorder()
+    provider.manager.register(RequestHedgingMiddleware(delay=0.05))
+    provider.manager.register(recorder)
+
+    started = time.perf_counter()
+    response = await provider("GET", "slow")
+    await asyncio.sleep(0.05)
+
+    assert await response.text() == "2"
+    assert time.perf_counter() - started < 0.5
+    assert recorder.calls == 2
+    assert recorder.cancelled == 1
+
+
+async def test_hedge_skips_non_get_requests(
+    provider: AiohttpProvider, hits: Counter[str]
+) -> None:
+    recorder = Recorder()
+    provider.manager.register(RequestHedgingMiddleware(delay=0.01))
+    provider.manager.register(recorder)
+
+    with pytest.raises(err.APIError):
+        await provider("POST", "flaky/1")
+
+    assert recorder.calls == 1
+
+
+async def test_breaker_opens_and_half_opens(
+    provider: AiohttpProvider, server: TestServer, hits: Counter[str]
+) -> None:
+    breaker = RequestCircuitBreakerMiddleware(
+        failure_threshold=2, recovery_timeout=0.1, base_url=provider.url
+    )
+    provider.manager.register(breaker)
+    host = f"{server.host}:{server.port}"
+
+    for _ in range(2):
+        with pytest.raises(err.APIError):
+            await provider("GET", "fail")
+    assert breaker.states() == {host: "open"}
+
+    with pytest.raises(err.CircuitOpenError):
+        await provider("GET", "ok")
+    assert hits["/ok"] == 0
+
+    await asyncio.sleep(0.15)
+    assert breaker.states() == {host: "half_open"}
+
+    with pytest.raises(err.APIError):
+        await provider("GET", "fail")
+    assert breaker.states() == {host: "open"}
+
+    await asyncio.sleep(0.15)
+    assert (await provider("GET", "ok")).status == 200
+    assert breaker.states() == {host: "closed"}
+
+
+async def test_breaker_resolves_endpoints_against_base_url(
+    provider: AiohttpProvider, server: TestServer
+) -> None:
+    breaker = RequestCircuitBreakerMiddleware(
+        failure_threshold=1, base_url=provider.url
+    )
+    provider.manager.register(breaker)
+
+    await provider("GET", "ok")
+    await provider("GET", str(server.make_url("/ok")))
+
+    assert list(breaker.states()) == [f"{server.host}:{server.port}"]
+
+
+async def test_breaker_keeps_relative_endpoints_apart_without_base_url(
+    provider: AiohttpProvider,
+) -> None:
+    breaker = RequestCircuitBreakerMiddleware(failure_threshold=1)
+    provider.manager.register(breaker)
+
+    with pytest.raises(err.APIError):
+        await provider("GET", "fail")
+
+    assert (await provider("GET", "ok")).status == 200
+    assert breaker.states() == {"fail": "open", "ok": "closed"}
+
+
+async def test_pool_stats_report_idle_connections(provider: AiohttpProvider) -> None:
+    assert provider.pool_stats() == {}
+
+    await provider("GET", "ok")
+
+    stats = provider.pool_stats()[DIRECT_POOL]
+    assert (stats.acquired, stats.idle, stats.waiting) == (0, 1, 0)
+
+
+def test_pool_stats_survive_missing_connector_internals() -> None:
+    class Connector:
+        limit = 7
+        limit_per_host = 0
+
+    stats = _connector_stats(t.cast(TCPConnector, Connector()))
+
+    assert (stats.acquired, stats.idle, stats.waiting, stats.limit) == (0, 0, 0, 7)
@@ -0,0 +1,129 @@
+import asyncio
+import typing as t
+
+import pytest
+
+import src.services.provider.errors as err
+from src.common.tools.cache import default_key_builder
+from src.services.cache.ratelimit import RedisRateLimiter
+from src.services.cache.redis import RedisCache
+from src.services.provider.middleware.ratelimit import (
+    RateLimit,
+    RequestRateLimitMiddleware,
+)
+from src.services.provider.response import Response
+
+pytestmark = pytest.mark.anyio
+
+BASE_URL = "https://api.example.com/v1/"
+
+
+async def call_next(**kw: t.Any) -> Response:
+    return t.cast(Response, kw["url_or_endpoint"])
+
+
+async def tokens(redis: RedisCache, key: str) -> float:
+    return float(
+        await redis._redis.hget(default_key_builder("ratelimit", key), "tokens")
+    )
+
+
+@pytest.fixture(scope="function")
+def limiter(fake_redis: RedisCache) -> RedisRateLimiter:
+    return RedisRateLimiter(fake_redis)
+
+
+async def test_take_grants_up_to_capacity(limiter: RedisRateLimiter) -> None:
+    assert await limiter.take("key", rate=10, capacity=3, count=2) == (2, 0.0)
+    assert await limiter.take("key", rate=10, capacity=3, count=2) == (1, 0.0)
+
+    granted, retry_after = await limiter.take("key", rate=10, capacity=3, count=2)
+    assert granted == 0
+    assert 0 < retry_after <= 0.1
+
+
+async def test_take_refills_over_time(limiter: RedisRateLimiter) -> None:
+    assert (await limiter.take("key", rate=100, capacity=1)).granted == 1
+    assert (await limiter.take("key", rate=100, capacity=1)).granted == 0
+
+    await asyncio.sleep(0.02)
+
+    assert (await limiter.take("key", rate=100, capacity=1)).granted == 1
+
+
+async def test_give_back_is_capped_at_capacity(
+    limiter: RedisRateLimiter, fake_redis: RedisCache
+) -> None:
+    await limiter.take("key", rate=0.001, capacity=4, count=3)
+    await limiter.give_back("key", capacity=4, count=10)
+
+    assert await tokens(fake_redis, "key") == 4
+
+
+async def test_waits_up_to_max_wait(limiter: RedisRateLimiter) -> None:
+    middleware = RequestRateLimitMiddleware(
+        limiter, {}, default=RateLimit(rate=1, capacity=1), max_wait=0.01
+    )
+
+    await middleware(call_next, "GET", "https://host/a")
+    with pytest.raises(err.RateLimitedError) as e:
+        await middleware(call_next, "GET", "https://host/a")
+
+    assert e.value.key == "*"
+    assert 0 < e.value.retry_after <= 1
+
+
+async def test_sleeps_until_tokens_refill(limiter: RedisRateLimiter) -> None:
+    middleware = RequestRateLimitMiddleware(
+        limiter, {}, default=RateLimit(rate=50, capacity=1), max_wait=1
+    )
+
+    for _ in range(3):
+        await middleware(call_next, "GET", "https://host/a")
+
+
+def test_resolves_relative_endpoints_against_base_url(
+    limiter: RedisRateLimiter,
+) -> None:
+    limit = RateLimit(rate=1)
+    middleware = RequestRateLimitMiddleware(
+        limiter,
+        {"api.example.com/v1/search": limit, "api.example.com": limit},
+        base_url=BASE_URL,
+    )
+
+    assert middleware._resolve("search") == "api.example.com/v1/search"
+    assert middleware._resolve("users") == "api.example.com"
+    assert middleware._resolve("https://api.example.com/v1/search") == (
+        "api.example.com/v1/search"
+    )
+    assert middleware._resolve("https://other.example.com/") is None
+
+
+def test_falls_back_to_default_limit(limiter: RedisRateLimiter) -> None:
+    middleware = RequestRateLimitMiddleware(
+        limiter, {"api.example.com": RateLimit(rate=1)}, default=RateLimit(rate=1)
+    )
+
+    assert middleware._resolve("https://other.example.com/") == "*"
+    # without a base url relative endpoints cannot match a host limit
+    assert middleware._resolve("search") == "*"
+
+
+async def test_unused_prefetched_tokens_are_returned(
+    limiter: RedisRateLimiter, fake_redis: RedisCache
+) -> None:
+    middleware = RequestRateLimitMiddleware(
+        limiter,
+        {},
+        default=RateLimit(rate=0.001, capacity=5, prefetch=5),
+        lease=0.02,
+    )
+
+    await middleware(call_next, "GET", "https://host/a")
+    assert await tokens(fake_redis, "*") == 0
+
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*middleware._tasks)
+
+    assert await tokens(fake_redis, "*") == pytest.approx(4, abs=0.01)
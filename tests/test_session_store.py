@@ -0,0 +1,113 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import uuid_utils.compat as uuid
+
+from src.services.cache.redis import RedisCache
+from src.services.cache.session import RedisSessionStore
+
+pytestmark = pytest.mark.anyio
+
+MAX_SESSIONS = 2
+
+
+@pytest.fixture(scope="function")
+def store(fake_redis: RedisCache) -> RedisSessionStore:
+    return RedisSessionStore(fake_redis, max_sessions=MAX_SESSIONS)
+
+
+def expire_in(seconds: int = 60) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=seconds)
+
+
+async def sessions(store: RedisSessionStore, user_uuid: uuid.UUID) -> dict[str, str]:
+    sessions_key, _ = store._keys(user_uuid)
+    return await store._redis._redis.hgetall(sessions_key)
+
+
+def order_key(store: RedisSessionStore, user_uuid: uuid.UUID) -> str:
+    _, key = store._keys(user_uuid)
+    return key
+
+
+async def test_issue_caps_sessions(
+    store: RedisSessionStore, fake_redis: RedisCache
+) -> None:
+    user_uuid = uuid.uuid4()
+    for index in range(MAX_SESSIONS + 1):
+        await store.issue(user_uuid, f"fp-{index}", f"token-{index}", expire_in())
+        time.sleep(0.002)
+
+    assert await sessions(store, user_uuid) == {
+        "fp-1": "token-1",
+        "fp-2": "token-2",
+    }
+    assert await fake_redis._redis.zcard(order_key(store, user_uuid)) == MAX_SESSIONS
+
+
+async def test_issue_replaces_same_fingerprint(
+    store: RedisSessionStore,
+) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "old", expire_in())
+    await store.issue(user_uuid, "fp", "new", expire_in())
+
+    assert await sessions(store, user_uuid) == {"fp": "new"}
+
+
+async def test_rotate(store: RedisSessionStore) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "token", expire_in())
+    await store.issue(user_uuid, "other", "other-token", expire_in())
+
+    assert await store.rotate(user_uuid, "fp", "token", "rotated", expire_in())
+    assert await sessions(store, user_uuid) == {
+        "fp": "rotated",
+        "other": "other-token",
+    }
+
+
+async def test_rotate_replay_wipes_sessions(
+    store: RedisSessionStore, fake_redis: RedisCache
+) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "token", expire_in())
+    await store.issue(user_uuid, "other", "other-token", expire_in())
+    assert await store.rotate(user_uuid, "fp", "token", "rotated", expire_in())
+
+    assert not await store.rotate(user_uuid, "fp", "token", "replayed", expire_in())
+    assert await sessions(store, user_uuid) == {}
+    assert not await fake_redis._redis.exists(order_key(store, user_uuid))
+
+
+async def test_revoke(store: RedisSessionStore, fake_redis: RedisCache) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "token", expire_in())
+    await store.issue(user_uuid, "other", "other-token", expire_in())
+
+    assert await store.revoke(user_uuid, "token")
+    assert not await store.revoke(user_uuid, "token")
+    assert await sessions(store, user_uuid) == {"other": "other-token"}
+    assert await fake_redis._redis.zrange(order_key(store, user_uuid), 0, -1) == [
+        "other"
+    ]
+
+
+async def test_revoke_all(store: RedisSessionStore) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "token", expire_in())
+
+    await store.revoke_all(user_uuid)
+    assert await sessions(store, user_uuid) == {}
+
+
+async def test_sessions_expire_with_latest_token(
+    store: RedisSessionStore, fake_redis: RedisCache
+) -> None:
+    user_uuid = uuid.uuid4()
+    await store.issue(user_uuid, "fp", "token", expire_in(60))
+    await store.rotate(user_uuid, "fp", "token", "rotated", expire_in(600))
+
+    for key in store._keys(user_uuid):
+        assert 590 <= await fake_redis._redis.ttl(key) <= 600
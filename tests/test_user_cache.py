@@ -0,0 +1,117 @@
+from collections.abc import Callable
+
+import pytest
+import uuid_utils.compat as uuid
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.api.v1 import dtos
+from src.database import DBGateway, create_database_factory
+from src.database.connection import create_sa_session_factory
+from src.database.manager import TransactionManager
+from src.services.cache.redis import RedisCache
+from src.services.cache.tiered import TieredCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="function")
+async def user_cache(redis: RedisCache, drop_cache: None) -> TieredCache[dtos.User]:
+    return TieredCache[dtos.User](
+        redis,
+        namespace="user",
+        encoder=dtos.User.as_bytes,
+        decoder=dtos.User.from_bytes,
+    )
+
+
+@pytest.fixture(scope="function")
+def cached_database_factory(
+    engine: AsyncEngine, user_cache: TieredCache[dtos.User]
+) -> Callable[[], DBGateway]:
+    return create_database_factory(
+        TransactionManager, create_sa_session_factory(engine), user_cache=user_cache
+    )
+
+
+async def authenticate(
+    database_factory: Callable[[], DBGateway],
+    user_cache: TieredCache[dtos.User],
+    user_uuid: uuid.UUID,
+) -> dtos.User:
+    # mirrors AuthenticationMiddleware._authenticate_user
+    user = await user_cache.get(user_uuid)
+    if user is None:
+        database = database_factory()
+        async with database.manager.session:
+            model = (await database.user.select("role", user_uuid=user_uuid)).result()
+
+        user = dtos.User.from_mapping(model.as_dict())
+        await user_cache.set(user_uuid, user)
+
+    return user
+
+
+async def create_user(
+    database_factory: Callable[[], DBGateway],
+) -> tuple[dtos.User, uuid.UUID]:
+    async with database_factory() as database:
+        role = (await database.role.select(name="User")).result()
+        admin = (await database.role.select(name="Admin")).result()
+        user = (
+            await database.user.create(
+                login="cache@example.com", password="password", role_uuid=role.uuid
+            )
+        ).result()
+
+    return dtos.User.from_mapping(user.as_dict()), admin.uuid
+
+
+async def test_update_invalidates_after_commit(
+    cached_database_factory: Callable[[], DBGateway],
+    user_cache: TieredCache[dtos.User],
+) -> None:
+    user, admin_uuid = await create_user(cached_database_factory)
+    await authenticate(cached_database_factory, user_cache, user.uuid)
+
+    async with cached_database_factory() as database:
+        await database.user.update(user.uuid, role_uuid=admin_uuid)
+
+        # a concurrent miss before the commit still reads the old row
+        await user_cache.invalidate(user.uuid)
+        stale = await authenticate(cached_database_factory, user_cache, user.uuid)
+        assert stale.role_uuid == user.role_uuid
+
+    fresh = await authenticate(cached_database_factory, user_cache, user.uuid)
+    assert fresh.role_uuid == admin_uuid
+
+
+async def test_rolled_back_update_keeps_cache(
+    cached_database_factory: Callable[[], DBGateway],
+    user_cache: TieredCache[dtos.User],
+) -> None:
+    user, admin_uuid = await create_user(cached_database_factory)
+    cached = await authenticate(cached_database_factory, user_cache, user.uuid)
+
+    with pytest.raises(RuntimeError):
+        async with cached_database_factory() as database:
+            await database.user.update(user.uuid, role_uuid=admin_uuid)
+            raise RuntimeError
+
+    async with cached_database_factory() as database:
+        await database.user.select(user_uuid=user.uuid)
+
+    assert await user_cache.get(user.uuid) == cached
+
+
+async def test_delete_invalidates_after_commit(
+    cached_database_factory: Callable[[], DBGateway],
+    user_cache: TieredCache[dtos.User],
+) -> None:
+    user, _ = await create_user(cached_database_factory)
+    await authenticate(cached_database_factory, user_cache, user.uuid)
+
+    async with cached_database_factory() as database:
+        await database.user.delete(user_uuid=user.uuid)
+        assert await user_cache.get(user.uuid) is not None
+
+    assert await user_cache.get(user.uuid) is None